@@ -1,11 +1,22 @@
-from backend.task_breakdown import break_down_task
-from backend.summarization import summarize_content
-from backend.question_generation import generate_quiz
-from backend.chat_assistant import ask_question
-
-__all__ = [
-    'break_down_task',
-    'summarize_content',
-    'generate_quiz',
-    'ask_question'
-]
\ No newline at end of file
+import importlib
+
+# Backend modules are imported on first attribute access so that importing
+# `backend` does not pull in every feature's dependencies up front.
+_EXPORTS = {
+    'break_down_task': 'backend.task_breakdown',
+    'preload': 'backend.task_breakdown',
+    'summarize_content': 'backend.summarization',
+    'generate_quiz': 'backend.question_generation',
+    'iter_quiz': 'backend.question_generation',
+    'ask_question': 'backend.chat_assistant',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        value = getattr(importlib.import_module(_EXPORTS[name]), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module 'backend' has no attribute '{name}'")
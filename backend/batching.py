@@ -0,0 +1,210 @@
+import os
+import time
+import queue
+import logging
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Milliseconds the dispatcher keeps a batch open for prompts from other callers
+MAX_WAIT_MS = float(os.environ.get("TASKTAMER_BATCH_WAIT_MS", "10"))
+# Most prompts sent through the model in one forward pass
+MAX_BATCH_SIZE = int(os.environ.get("TASKTAMER_BATCH_SIZE", "16"))
+
+_CLOSE = object()
+
+
+def wait_all(futures: List[Future], timeout: Optional[float] = None) -> List[Any]:
+    """
+    Results of several futures in order, with one timeout shared by all of them.
+
+    Raises:
+        The first failed future's exception, or TimeoutError
+    """
+    deadline = None if timeout is None else time.monotonic() + timeout
+    results = []
+    for future in futures:
+        remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+        results.append(future.result(timeout=remaining))
+    return results
+
+
+class _Request:
+    def __init__(self, prompt: str, generate_kwargs: Dict[str, Any], max_batch_size: int):
+        self.prompt = prompt
+        self.generate_kwargs = generate_kwargs
+        # Generation parameters must match for prompts to share a forward pass
+        self.group = tuple(sorted(generate_kwargs.items()))
+        self.max_batch_size = max_batch_size
+        self.future: Future = Future()
+
+
+class BatchCoalescer:
+    """
+    Request coalescer in front of a shared text-generation pipeline.
+
+    Prompts submitted by concurrent callers (e.g. several Streamlit sessions
+    breaking down tasks at once) are collected for up to `max_wait_ms`, grouped
+    by generation parameters and run as padded batches; each caller gets a
+    Future for its own prompt. On CPU a batch of N short prompts costs far less
+    than N sequential calls, so aggregate throughput rises with concurrency.
+    """
+
+    def __init__(self, load: Callable[[], Any], max_wait_ms: float = MAX_WAIT_MS,
+                 max_batch_size: int = MAX_BATCH_SIZE):
+        """
+        Args:
+            load: Returns the pipeline to run batches on; called in the dispatcher thread
+            max_wait_ms: How long a batch stays open after its first prompt arrives
+            max_batch_size: Upper bound on prompts per forward pass
+        """
+        self.load = load
+        self.max_wait = max(0.0, max_wait_ms) / 1000
+        self.max_batch_size = max(1, max_batch_size)
+        self._queue: "queue.Queue[Any]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._batches = 0
+        self._prompts = 0
+
+    def _ensure_started(self) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            with self._lock:
+                if self._thread is None or not self._thread.is_alive():
+                    self._thread = threading.Thread(target=self._run, name="generation-batcher", daemon=True)
+                    self._thread.start()
+
+    def submit(self, prompt: str, max_batch_size: Optional[int] = None, **generate_kwargs) -> Future:
+        """
+        Queue one prompt.
+
+        Args:
+            prompt: Prompt to complete
+            max_batch_size: Optional tighter cap on the batch this prompt joins
+            **generate_kwargs: Passed to the pipeline (e.g. max_new_tokens)
+
+        Returns:
+            Future resolving to the generated text
+        """
+        limit = min(self.max_batch_size, max_batch_size or self.max_batch_size)
+        request = _Request(prompt, generate_kwargs, max(1, limit))
+        self._ensure_started()
+        self._queue.put(request)
+        return request.future
+
+    def generate(self, prompts: List[str], timeout: Optional[float] = None,
+                 max_batch_size: Optional[int] = None, **generate_kwargs) -> List[str]:
+        """
+        Submit several prompts and wait for all of them.
+
+        Raises:
+            The pipeline's exception if generation failed, or TimeoutError
+        """
+        futures = [self.submit(prompt, max_batch_size=max_batch_size, **generate_kwargs) for prompt in prompts]
+        return wait_all(futures, timeout)
+
+    def _run(self) -> None:
+        while True:
+            first = self._queue.get()
+            if first is _CLOSE:
+                return
+
+            pending = [first]
+            closing = False
+            deadline = time.monotonic() + self.max_wait
+            while len(pending) < self.max_batch_size:
+                try:
+                    # Drain whatever is already queued without waiting, then wait out the window
+                    remaining = deadline - time.monotonic()
+                    item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _CLOSE:
+                    closing = True
+                    break
+                pending.append(item)
+
+            self._dispatch(pending)
+            if closing:
+                return
+
+    def _dispatch(self, pending: List[_Request]) -> None:
+        # Cancelled requests are dropped before they cost any compute
+        pending = [request for request in pending if request.future.set_running_or_notify_cancel()]
+        if not pending:
+            return
+
+        try:
+            generator = self.load()
+        except Exception as e:
+            logger.error(f"Error loading model for batched generation: {str(e)}")
+            for request in pending:
+                request.future.set_exception(e)
+            return
+
+        groups: Dict[Tuple, List[_Request]] = {}
+        for request in pending:
+            groups.setdefault(request.group, []).append(request)
+
+        for requests in groups.values():
+            for batch in self._split(requests):
+                self._run_batch(generator, batch)
+
+    def _split(self, requests: List[_Request]) -> List[List[_Request]]:
+        """Cut a group into batches that respect every member's max_batch_size."""
+        batches: List[List[_Request]] = []
+        batch: List[_Request] = []
+        limit = self.max_batch_size
+        for request in requests:
+            if batch and len(batch) >= min(limit, request.max_batch_size):
+                batches.append(batch)
+                batch = []
+                limit = self.max_batch_size
+            batch.append(request)
+            limit = min(limit, request.max_batch_size)
+        if batch:
+            batches.append(batch)
+        return batches
+
+    def _run_batch(self, generator: Any, batch: List[_Request]) -> None:
+        error: BaseException = RuntimeError("Batched generation returned no result")
+        try:
+            outputs = generator(
+                [request.prompt for request in batch],
+                num_return_sequences=1,
+                batch_size=len(batch),
+                **batch[0].generate_kwargs
+            )
+            if len(outputs) != len(batch):
+                raise RuntimeError(f"Generator returned {len(outputs)} outputs for {len(batch)} prompts")
+
+            with self._lock:
+                self._batches += 1
+                self._prompts += len(batch)
+            for request, output in zip(batch, outputs):
+                request.future.set_result(output[0]['generated_text'])
+        except Exception as e:
+            logger.error(f"Error running batched generation: {str(e)}")
+            error = e
+        finally:
+            # Whatever went wrong, no caller is left waiting and the dispatcher keeps running
+            for request in batch:
+                if not request.future.done():
+                    request.future.set_exception(error)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "batches": self._batches,
+                "prompts": self._prompts,
+                "average_batch_size": self._prompts / self._batches if self._batches else 0.0,
+                "queued": self._queue.qsize(),
+            }
+
+    def close(self) -> None:
+        """Stop the dispatcher after it has served everything already queued."""
+        if self._thread is not None and self._thread.is_alive():
+            self._queue.put(_CLOSE)
+            self._thread.join()
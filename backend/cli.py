@@ -0,0 +1,224 @@
+"""
+Run TaskTamer features from the command line, one record or a whole batch file at a time.
+
+    python tasktamer.py breakdown "Write a research paper on AI ethics"
+    python tasktamer.py summarize -i readings.csv -o summaries.jsonl -j 8
+    python tasktamer.py quiz -i notes.jsonl --num-questions 5
+    cat questions.txt | python tasktamer.py ask
+
+Input records come from positional values, or from --input (JSONL, CSV with a
+header row, or plain text with one record per line; "-" or no input reads
+stdin). Records are processed in parallel and each result is written as one
+JSONL line as soon as it finishes; use --ordered to keep input order.
+"""
+import os
+import sys
+import csv
+import json
+import time
+import logging
+import argparse
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+from backend import jobs
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WORKERS = min(8, os.cpu_count() or 1)
+
+
+def _is_url(value: str) -> bool:
+    return value.startswith(("http://", "https://"))
+
+
+def _breakdown(record: Dict[str, Any], args: argparse.Namespace) -> Any:
+    task = record.get("task")
+    if not task:
+        raise ValueError("record needs a 'task' field")
+    if args.detailed:
+        return jobs.run("break_task", task, record.get("detail_level") or args.detail_level)
+    return jobs.run("break_down_task", task)
+
+
+def _summarize(record: Dict[str, Any], args: argparse.Namespace) -> Any:
+    if not record.get("content") and not record.get("url"):
+        raise ValueError("record needs a 'content' or 'url' field")
+    return jobs.run("summarize_content", content=record.get("content"), url=record.get("url"),
+                    num_sentences=int(record.get("num_sentences") or args.num_sentences))
+
+
+def _quiz(record: Dict[str, Any], args: argparse.Namespace) -> Any:
+    if not record.get("content") and not record.get("url"):
+        raise ValueError("record needs a 'content' or 'url' field")
+    return jobs.run("generate_quiz", content=record.get("content"), url=record.get("url"),
+                    num_questions=int(record.get("num_questions") or args.num_questions))
+
+
+def _ask(record: Dict[str, Any], args: argparse.Namespace) -> Any:
+    from backend.chat_assistant import answer_question
+
+    question = record.get("question")
+    if not question:
+        raise ValueError("record needs a 'question' field")
+    answer, confidence = answer_question(question)
+    return {"answer": answer, "confidence": round(confidence, 3)}
+
+
+def _text_record(command: str, line: str) -> Dict[str, Any]:
+    """Map a bare text value (argument or input line) to the command's main field."""
+    if command == "breakdown":
+        return {"task": line}
+    if command == "ask":
+        return {"question": line}
+    return {"url": line} if _is_url(line) else {"content": line}
+
+
+# command -> (handler, help text)
+COMMANDS: Dict[str, Tuple[Callable[[Dict[str, Any], argparse.Namespace], Any], str]] = {
+    "breakdown": (_breakdown, "Break tasks into steps (field: task, optional detail_level)"),
+    "summarize": (_summarize, "Summarize text or web pages (fields: content or url, optional num_sentences)"),
+    "quiz": (_quiz, "Generate quiz questions (fields: content or url, optional num_questions)"),
+    "ask": (_ask, "Ask Otto questions (field: question)"),
+}
+
+
+def _input_format(path: Optional[str], requested: Optional[str]) -> str:
+    if requested:
+        return requested
+    if path and path != "-":
+        extension = os.path.splitext(path)[1].lower()
+        if extension in (".jsonl", ".ndjson"):
+            return "jsonl"
+        if extension == ".csv":
+            return "csv"
+    return "text"
+
+
+def read_records(command: str, stream: TextIO, fmt: str) -> Iterator[Dict[str, Any]]:
+    """Yield input records lazily so large batch files are never loaded at once."""
+    if fmt == "csv":
+        for row in csv.DictReader(stream):
+            yield {key: value for key, value in row.items() if key}
+        return
+    for line in stream:
+        line = line.strip()
+        if not line:
+            continue
+        if fmt == "jsonl":
+            record = json.loads(line)
+            yield record if isinstance(record, dict) else _text_record(command, str(record))
+        else:
+            yield _text_record(command, line)
+
+
+def _run_one(handler: Callable, index: int, record: Dict[str, Any], args: argparse.Namespace) -> Dict[str, Any]:
+    start = time.perf_counter()
+    output: Dict[str, Any] = {"index": index, "input": record}
+    try:
+        output["result"] = handler(record, args)
+    except Exception as e:
+        output["error"] = f"{type(e).__name__}: {e}"
+    output["ms"] = round((time.perf_counter() - start) * 1000, 1)
+    return output
+
+
+def process(handler: Callable, records: Iterable[Dict[str, Any]], args: argparse.Namespace,
+            workers: int, ordered: bool = False) -> Iterator[Dict[str, Any]]:
+    """
+    Run handler over records on a thread pool, yielding outputs as they finish.
+
+    At most 2 * workers records are in flight, so memory stays bounded for long inputs.
+    With ordered=True outputs are yielded in input order instead; outputs held back
+    behind a slow record count as in flight, so one straggler cannot grow the buffer.
+    """
+    max_in_flight = max(1, workers) * 2
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        pending: Dict[Future, int] = {}
+        finished: Dict[int, Dict[str, Any]] = {}
+        next_index = 0
+
+        def drain(block_until: int) -> Iterator[Dict[str, Any]]:
+            nonlocal next_index
+            while len(pending) + len(finished) > block_until:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    index = pending.pop(future)
+                    if not ordered:
+                        yield future.result()
+                    else:
+                        finished[index] = future.result()
+                while next_index in finished:
+                    yield finished.pop(next_index)
+                    next_index += 1
+
+        for index, record in enumerate(records):
+            pending[executor.submit(_run_one, handler, index, record, args)] = index
+            yield from drain(max_in_flight - 1)
+        yield from drain(0)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="tasktamer", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    for name, (_, help_text) in COMMANDS.items():
+        sub = subparsers.add_parser(name, help=help_text, description=help_text)
+        sub.add_argument("values", nargs="*", help="Records given directly instead of --input")
+        sub.add_argument("-i", "--input", help="JSONL, CSV or text file; '-' for stdin (default when no values)")
+        sub.add_argument("-f", "--format", choices=("jsonl", "csv", "text"),
+                         help="Input format (default: from the file extension, else text)")
+        sub.add_argument("-o", "--output", help="Write JSONL results here instead of stdout")
+        sub.add_argument("-j", "--workers", type=int, default=DEFAULT_WORKERS,
+                         help=f"Records processed in parallel (default: {DEFAULT_WORKERS})")
+        sub.add_argument("--ordered", action="store_true", help="Write results in input order")
+        if name == "breakdown":
+            sub.add_argument("--detailed", action="store_true",
+                             help="Full breakdown with overview, times, tips and reward")
+            sub.add_argument("--detail-level", default="standard", choices=("basic", "standard", "comprehensive"))
+        if name == "summarize":
+            sub.add_argument("--num-sentences", type=int, default=5)
+        if name == "quiz":
+            sub.add_argument("--num-questions", type=int, default=3)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    logging.basicConfig(level=logging.WARNING)
+    handler = COMMANDS[args.command][0]
+
+    close: List[TextIO] = []
+    if args.values and not args.input:
+        records: Iterable[Dict[str, Any]] = (_text_record(args.command, value) for value in args.values)
+    else:
+        if args.input and args.input != "-":
+            stream = open(args.input, encoding="utf-8", newline="")
+            close.append(stream)
+        else:
+            stream = sys.stdin
+        records = read_records(args.command, stream, _input_format(args.input, args.format))
+
+    out = sys.stdout
+    if args.output:
+        out = open(args.output, "w", encoding="utf-8")
+        close.append(out)
+
+    failures = 0
+    try:
+        for output in process(handler, records, args, args.workers, args.ordered):
+            failures += "error" in output
+            out.write(json.dumps(output, ensure_ascii=False) + "\n")
+            out.flush()
+    except (ValueError, csv.Error) as e:
+        # Malformed input (bad JSON line, broken CSV) stops the run
+        logger.error(f"Error reading input: {str(e)}")
+        return 2
+    finally:
+        for stream in close:
+            stream.close()
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,236 @@
+import os
+import re
+import time
+import sqlite3
+import logging
+import threading
+from email.utils import parsedate_to_datetime
+from typing import Mapping, Optional, Dict
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+from backend.extraction import DEFAULT_EXTRACTOR
+
+logger = logging.getLogger(__name__)
+
+CACHE_DIR = os.environ.get("TASKTAMER_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "tasktamer"))
+
+# Freshness used when the server sends no Cache-Control/Expires information
+DEFAULT_TTL = 60 * 60
+# Entries are dropped this long after their last successful fetch, even if they could be revalidated
+MAX_AGE = 7 * 24 * 60 * 60
+# Total extracted text kept on disk before least recently used entries are evicted
+MAX_CACHE_BYTES = 100 * 1024 * 1024
+
+# Query parameters that only track clicks and never change page content
+TRACKING_PARAMS = re.compile(r'^(utm_\w+|fbclid|gclid|mc_cid|mc_eid)$')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS content (
+    url TEXT PRIMARY KEY,
+    text TEXT NOT NULL,
+    etag TEXT,
+    last_modified TEXT,
+    fetched_at REAL NOT NULL,
+    expires_at REAL NOT NULL,
+    accessed_at REAL NOT NULL,
+    size INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS content_accessed_at ON content (accessed_at);
+"""
+
+
+def normalize_url(url: str) -> str:
+    """Normalize a URL so equivalent spellings share one cache entry; unparseable URLs are kept as given."""
+    try:
+        parts = urlsplit(url.strip())
+        port = parts.port
+    except ValueError:
+        # Malformed port or IPv6 host; the fetch will fail, but looking it up must not
+        return url.strip()
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if port and not ((scheme == "http" and port == 80) or (scheme == "https" and port == 443)):
+        host = f"{host}:{port}"
+    path = parts.path or "/"
+    query = urlencode(sorted((k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+                             if not TRACKING_PARAMS.match(k)))
+    return urlunsplit((scheme, host, path, query, ""))
+
+
+def cache_key(url: str, extractor: str) -> str:
+    """Key of a page's entry; text from different extractors is cached separately."""
+    return f"{extractor} {normalize_url(url)}"
+
+
+def _freshness_lifetime(headers: Mapping[str, str], now: float) -> Optional[float]:
+    """
+    Seconds the response may be served without revalidation, following Cache-Control and Expires.
+    Returns None if the response must not be stored.
+    """
+    cache_control = headers.get("Cache-Control", "").lower()
+    directives = [d.strip() for d in cache_control.split(",") if d.strip()]
+
+    if "no-store" in directives:
+        return None
+    if "no-cache" in directives:
+        return 0
+
+    for directive in directives:
+        if directive.startswith("max-age="):
+            try:
+                return max(0, int(directive.split("=", 1)[1]))
+            except ValueError:
+                break
+
+    expires = headers.get("Expires")
+    if expires:
+        try:
+            return max(0.0, parsedate_to_datetime(expires).timestamp() - now)
+        except (TypeError, ValueError):
+            return 0
+
+    return DEFAULT_TTL
+
+
+class CachedContent:
+    def __init__(self, text: str, etag: Optional[str], last_modified: Optional[str], expires_at: float):
+        self.text = text
+        self.etag = etag
+        self.last_modified = last_modified
+        self.expires_at = expires_at
+
+    def is_fresh(self) -> bool:
+        return time.time() < self.expires_at
+
+    def validators(self) -> Dict[str, str]:
+        """Conditional request headers for revalidating this entry."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class ContentCache:
+    """
+    SQLite-backed cache of extracted page text, shared by every session and
+    process that points at the same cache directory.
+    """
+
+    def __init__(self, path: Optional[str] = None, max_bytes: int = MAX_CACHE_BYTES, max_age: float = MAX_AGE,
+                 extractor: str = DEFAULT_EXTRACTOR):
+        self.path = path or os.path.join(CACHE_DIR, "content.sqlite3")
+        # Entries hold extracted text, so they are only valid for the extractor that produced them
+        self.extractor = extractor
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self._local = threading.local()
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        # sqlite3 connections cannot be shared between threads, so keep one per thread
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, url: str) -> Optional[CachedContent]:
+        """Return the cached entry for a URL (fresh or stale), or None."""
+        key = cache_key(url, self.extractor)
+        now = time.time()
+        conn = self._connect()
+        row = conn.execute(
+            "SELECT text, etag, last_modified, expires_at, fetched_at FROM content WHERE url = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+
+        text, etag, last_modified, expires_at, fetched_at = row
+        if now - fetched_at > self.max_age:
+            with conn:
+                conn.execute("DELETE FROM content WHERE url = ?", (key,))
+            return None
+
+        with conn:
+            conn.execute("UPDATE content SET accessed_at = ? WHERE url = ?", (now, key))
+        return CachedContent(text, etag, last_modified, expires_at)
+
+    def put(self, url: str, text: str, headers: Mapping[str, str]) -> None:
+        """Store extracted text together with the response's validators and freshness."""
+        now = time.time()
+        lifetime = _freshness_lifetime(headers, now)
+        if lifetime is None:
+            return
+
+        key = cache_key(url, self.extractor)
+        size = len(text.encode("utf-8"))
+        conn = self._connect()
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO content (url, text, etag, last_modified, fetched_at, expires_at, accessed_at, size) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, text, headers.get("ETag"), headers.get("Last-Modified"), now, now + lifetime, now, size),
+            )
+        self._evict()
+
+    def refresh(self, url: str, headers: Mapping[str, str]) -> None:
+        """Extend an entry's freshness after a 304 Not Modified revalidation."""
+        now = time.time()
+        lifetime = _freshness_lifetime(headers, now)
+        key = cache_key(url, self.extractor)
+        conn = self._connect()
+        with conn:
+            if lifetime is None:
+                conn.execute("DELETE FROM content WHERE url = ?", (key,))
+            else:
+                conn.execute(
+                    "UPDATE content SET fetched_at = ?, expires_at = ?, accessed_at = ?, "
+                    "etag = COALESCE(?, etag), last_modified = COALESCE(?, last_modified) WHERE url = ?",
+                    (now, now + lifetime, now, headers.get("ETag"), headers.get("Last-Modified"), key),
+                )
+
+    def _evict(self) -> None:
+        conn = self._connect()
+        with conn:
+            conn.execute("DELETE FROM content WHERE fetched_at < ?", (time.time() - self.max_age,))
+            total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM content").fetchone()[0]
+            if total <= self.max_bytes:
+                return
+
+            # Drop least recently used entries until we are back under the limit
+            for url, size in conn.execute("SELECT url, size FROM content ORDER BY accessed_at").fetchall():
+                conn.execute("DELETE FROM content WHERE url = ?", (url,))
+                total -= size
+                if total <= self.max_bytes:
+                    break
+        logger.info(f"Evicted content cache entries down to {total} bytes")
+
+    def clear(self) -> None:
+        conn = self._connect()
+        with conn:
+            conn.execute("DELETE FROM content")
+
+
+_cache: Optional[ContentCache] = None
+_cache_failed = False
+_cache_lock = threading.Lock()
+
+
+def get_cache() -> Optional[ContentCache]:
+    """Return the shared content cache, or None if it cannot be opened (tried once per process)."""
+    global _cache, _cache_failed
+    if _cache is None and not _cache_failed:
+        with _cache_lock:
+            if _cache is None and not _cache_failed:
+                try:
+                    _cache = ContentCache()
+                except (OSError, sqlite3.Error) as e:
+                    logger.error(f"Content cache unavailable: {str(e)}")
+                    _cache_failed = True
+    return _cache
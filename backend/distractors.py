@@ -0,0 +1,244 @@
+"""
+Nearest-neighbour quiz distractors from a precomputed word-embedding index.
+
+The index is a directory with three files, built once from any GloVe/word2vec
+text file:
+
+    vectors.npy   float32 (V, D) unit-length rows, memory-mapped at load
+    vocab.txt     one word per line, in row order
+    pos.npy       uint8 (V,) coarse part of speech per word (see POS_TAGS)
+
+    python -m backend.distractors build glove.6B.100d.txt [--limit 50000]
+
+Distractors for a whole quiz are found with one matrix product: the correct
+words' vectors (k, D) against the vocabulary (V, D).
+"""
+import os
+import re
+import sys
+import logging
+import argparse
+import threading
+from typing import List, Optional, Sequence
+
+from backend.content_cache import CACHE_DIR
+
+logger = logging.getLogger(__name__)
+
+INDEX_DIR = os.environ.get("TASKTAMER_EMBEDDINGS_DIR", os.path.join(CACHE_DIR, "embeddings"))
+
+POS_TAGS = ("NOUN", "VERB", "ADJ", "ADV", "OTHER")
+# Candidates more similar than this are likely synonyms that would also fit the blank
+MAX_SIMILARITY = 0.85
+# Candidates less similar than this are unrelated enough to be trivially wrong
+MIN_SIMILARITY = 0.2
+# Candidates considered per word before filtering
+CANDIDATES = 40
+
+WORD = re.compile(r"^[a-z]+$")
+
+_SUFFIX_POS = (
+    ("ly", "ADV"),
+    ("ing", "VERB"), ("ed", "VERB"), ("ize", "VERB"), ("ise", "VERB"), ("ate", "VERB"),
+    ("ous", "ADJ"), ("ful", "ADJ"), ("ive", "ADJ"), ("able", "ADJ"), ("ible", "ADJ"), ("al", "ADJ"), ("ic", "ADJ"),
+    ("less", "ADJ"),
+)
+
+
+def guess_pos(word: str) -> str:
+    """Suffix-based coarse part of speech, used when no tagger is available."""
+    word = word.lower()
+    for suffix, tag in _SUFFIX_POS:
+        if len(word) > len(suffix) + 2 and word.endswith(suffix):
+            return tag
+    return "NOUN"
+
+
+def coarse_pos(penn_tag: str) -> str:
+    """Map a Penn Treebank tag (as produced by nltk) to one of POS_TAGS."""
+    if penn_tag.startswith("NN"):
+        return "NOUN"
+    if penn_tag.startswith("VB"):
+        return "VERB"
+    if penn_tag.startswith("JJ"):
+        return "ADJ"
+    if penn_tag.startswith("RB"):
+        return "ADV"
+    return "OTHER"
+
+
+def _tag_vocabulary(words: List[str]) -> List[str]:
+    try:
+        import nltk
+
+        return [coarse_pos(tag) for ((_, tag),) in nltk.pos_tag_sents([[word] for word in words])]
+    except (ImportError, LookupError) as e:
+        logger.info(f"nltk tagger unavailable ({type(e).__name__}), guessing POS from suffixes")
+        return [guess_pos(word) for word in words]
+
+
+def _match_case(word: str, template: str) -> str:
+    if template.isupper() and len(template) > 1:
+        return word.upper()
+    if template[:1].isupper():
+        return word.capitalize()
+    return word
+
+
+def _related(a: str, b: str) -> bool:
+    """Same word in another form (plural, tense, ...) would make the question ambiguous."""
+    return a in b or b in a or (len(a) > 4 and len(b) > 4 and a[:5] == b[:5])
+
+
+class DistractorIndex:
+    """Memory-mapped embedding matrix with a vocabulary and part-of-speech index."""
+
+    def __init__(self, directory: str = INDEX_DIR):
+        import numpy as np
+
+        self.vectors = np.load(os.path.join(directory, "vectors.npy"), mmap_mode="r")
+        self.pos = np.load(os.path.join(directory, "pos.npy"))
+        with open(os.path.join(directory, "vocab.txt"), encoding="utf-8") as f:
+            self.words = [line.rstrip("\n") for line in f]
+        if len(self.words) != self.vectors.shape[0] or len(self.pos) != self.vectors.shape[0]:
+            raise ValueError(f"Embedding index in {directory} is inconsistent")
+        self.rows = {word: row for row, word in enumerate(self.words)}
+
+    def distractors(self, words: Sequence[str], count: int = 3,
+                    pos: Optional[Sequence[Optional[str]]] = None) -> List[Optional[List[str]]]:
+        """
+        Distractors for each word, from one batched similarity query.
+
+        Args:
+            words: Correct answers
+            count: Distractors wanted per word
+            pos: Optional part of speech per word (one of POS_TAGS) from the sentence context;
+                 defaults to the word's tag in the index
+
+        Returns:
+            Per word, `count` distractors cased like the word, or None if the word is
+            not in the vocabulary or too few candidates qualified
+        """
+        import numpy as np
+
+        results: List[Optional[List[str]]] = [None] * len(words)
+        known = [(i, self.rows[word.lower()]) for i, word in enumerate(words) if word.lower() in self.rows]
+        # A one-word vocabulary has nothing to offer besides the answer itself
+        if not known or len(self.words) <= 1:
+            return results
+
+        query_rows = np.array([row for _, row in known])
+        tag_ids = np.array([
+            POS_TAGS.index(pos[i]) if pos and pos[i] in POS_TAGS else self.pos[row] for i, row in known
+        ])
+        # (k, D) @ (D, V): similarity of every correct word to the whole vocabulary
+        similarities = np.asarray(self.vectors[query_rows]) @ self.vectors.T
+        eligible = ((self.pos[None, :] == tag_ids[:, None])
+                    & (similarities < MAX_SIMILARITY) & (similarities > MIN_SIMILARITY))
+        similarities = np.where(eligible, similarities, -np.inf)
+
+        # Best CANDIDATES per row, then sorted; only these reach the Python-level filtering.
+        # Small vocabularies (no more than CANDIDATES words) are sorted whole.
+        vocabulary_size = similarities.shape[1]
+        if vocabulary_size > CANDIDATES:
+            candidates = np.argpartition(-similarities, CANDIDATES - 1, axis=1)[:, :CANDIDATES]
+        else:
+            candidates = np.tile(np.arange(vocabulary_size), (len(known), 1))
+        candidate_scores = np.take_along_axis(similarities, candidates, axis=1)
+        order = np.argsort(-candidate_scores, axis=1)
+        candidates = np.take_along_axis(candidates, order, axis=1)
+        candidate_scores = np.take_along_axis(candidate_scores, order, axis=1)
+
+        for (i, _), row_candidates, row_scores in zip(known, candidates, candidate_scores):
+            word = words[i].lower()
+            chosen: List[str] = []
+            for candidate, score in zip(row_candidates, row_scores):
+                if not np.isfinite(score):
+                    break
+                candidate_word = self.words[candidate]
+                if _related(word, candidate_word) or any(_related(candidate_word, c) for c in chosen):
+                    continue
+                chosen.append(candidate_word)
+                if len(chosen) == count:
+                    results[i] = [_match_case(c, words[i]) for c in chosen]
+                    break
+        return results
+
+
+_index: Optional[DistractorIndex] = None
+_index_loaded = False
+_index_lock = threading.Lock()
+
+
+def get_distractor_index() -> Optional[DistractorIndex]:
+    """The shared index, loaded on first use; None when it has not been built or numpy is missing."""
+    global _index, _index_loaded
+    if not _index_loaded:
+        with _index_lock:
+            if not _index_loaded:
+                if os.path.isfile(os.path.join(INDEX_DIR, "vectors.npy")):
+                    try:
+                        _index = DistractorIndex(INDEX_DIR)
+                        logger.info(f"Loaded distractor index with {len(_index.words)} words")
+                    except (ImportError, OSError, ValueError) as e:
+                        logger.error(f"Error loading distractor index: {str(e)}")
+                _index_loaded = True
+    return _index
+
+
+def build_index(vectors_path: str, directory: str = INDEX_DIR, limit: int = 50000) -> int:
+    """
+    Convert a GloVe/word2vec text file into an index directory.
+    Only lowercase alphabetic words are kept; the first `limit` of them (these
+    files list frequent words first) become the vocabulary.
+
+    Returns:
+        Number of words indexed
+    """
+    import numpy as np
+
+    words: List[str] = []
+    rows = []
+    with open(vectors_path, encoding="utf-8", errors="replace") as f:
+        for line in f:
+            parts = line.rstrip().split(" ")
+            # word2vec text files start with a "<count> <dim>" header
+            if len(parts) <= 2 or not WORD.match(parts[0]) or len(parts[0]) < 3:
+                continue
+            try:
+                rows.append(np.asarray(parts[1:], dtype=np.float32))
+            except ValueError:
+                continue
+            words.append(parts[0])
+            if len(words) >= limit:
+                break
+
+    vectors = np.vstack(rows)
+    vectors /= np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-8)
+    tags = np.array([POS_TAGS.index(tag) for tag in _tag_vocabulary(words)], dtype=np.uint8)
+
+    os.makedirs(directory, exist_ok=True)
+    np.save(os.path.join(directory, "vectors.npy"), vectors.astype(np.float32))
+    np.save(os.path.join(directory, "pos.npy"), tags)
+    with open(os.path.join(directory, "vocab.txt"), "w", encoding="utf-8") as f:
+        f.write("\n".join(words) + "\n")
+    return len(words)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    build = subparsers.add_parser("build", help="Build the index from a GloVe/word2vec text file")
+    build.add_argument("vectors", help="Path to the embeddings text file")
+    build.add_argument("--dir", default=INDEX_DIR, help=f"Index directory (default: {INDEX_DIR})")
+    build.add_argument("--limit", type=int, default=50000, help="Vocabulary size")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    count = build_index(args.vectors, args.dir, args.limit)
+    print(f"Indexed {count} words in {args.dir}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,267 @@
+import re
+import logging
+from html.parser import HTMLParser
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Elements whose contents are never readable text
+SKIP_TAGS = {"script", "style", "noscript", "template", "svg", "head", "header", "footer", "nav", "aside"}
+
+# Elements that delimit blocks of text
+BLOCK_TAGS = {"p", "div", "section", "article", "main", "li", "td", "blockquote", "pre",
+              "h1", "h2", "h3", "h4", "h5", "h6", "br", "tr", "dd", "dt", "figcaption"}
+
+# Class/id hints used by the main-content scorer
+POSITIVE_HINTS = re.compile(r'article|body|content|entry|main|page|post|story|text', re.I)
+NEGATIVE_HINTS = re.compile(r'comment|footer|header|menu|nav|related|share|sidebar|social|sponsor|ad-|promo|cookie', re.I)
+
+WHITESPACE = re.compile(r'\s+')
+
+
+def extract_soup(html: str) -> str:
+    """Original extractor: BeautifulSoup html.parser tree, paragraphs first."""
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, "html.parser")
+
+    for tag in soup(['script', 'style', 'header', 'footer', 'nav']):
+        tag.decompose()
+
+    paragraphs = soup.find_all("p")
+    text = "\n".join([p.get_text().strip() for p in paragraphs if p.get_text().strip()])
+
+    if not text:
+        main_content = soup.find('main') or soup.find('article') or soup.find('body')
+        if main_content:
+            text = main_content.get_text(separator="\n", strip=True)
+
+    return text
+
+
+class _StreamingExtractor(HTMLParser):
+    """
+    Single pass over the HTML token stream without building a tree.
+    Text inside SKIP_TAGS is dropped as it streams past; paragraphs are collected
+    into their enclosing block so the scorer can pick the main content.
+    """
+
+    def __init__(self, keep_fallback: bool = True):
+        super().__init__(convert_charrefs=True)
+        self.keep_fallback = keep_fallback
+        self.skip_depth = 0
+        self.paragraphs: List[Dict] = []
+        self.container_stack: List[str] = []
+        self.current: Optional[List[str]] = None
+        self.current_links = 0
+        self.in_link = False
+        self.fallback: List[str] = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag in SKIP_TAGS:
+            self.skip_depth += 1
+            return
+        if self.skip_depth:
+            return
+
+        if tag in ("div", "section", "article", "main", "td"):
+            hints = " ".join(value or "" for name, value in attrs if name in ("class", "id"))
+            self.container_stack.append(f"{tag} {hints}")
+        elif tag == "p":
+            self._close_paragraph()
+            self.current = []
+            self.current_links = 0
+        elif tag == "a":
+            self.in_link = True
+
+    def handle_endtag(self, tag):
+        if tag in SKIP_TAGS:
+            if self.skip_depth:
+                self.skip_depth -= 1
+            return
+        if self.skip_depth:
+            return
+
+        if tag == "p":
+            self._close_paragraph()
+        elif tag == "a":
+            self.in_link = False
+        elif tag in ("div", "section", "article", "main", "td"):
+            self._close_paragraph()
+            if self.container_stack:
+                self.container_stack.pop()
+
+        if tag in BLOCK_TAGS and self.keep_fallback:
+            self.fallback.append("\n")
+
+    def handle_data(self, data):
+        if self.skip_depth:
+            return
+        if self.current is not None:
+            self.current.append(data)
+            if self.in_link:
+                self.current_links += len(data)
+        if self.keep_fallback:
+            self.fallback.append(data)
+
+    def _close_paragraph(self):
+        if self.current is None:
+            return
+        text = WHITESPACE.sub(" ", "".join(self.current)).strip()
+        if text:
+            self.paragraphs.append({
+                "text": text,
+                "container": self.container_stack[-1] if self.container_stack else "body",
+                "link_density": self.current_links / max(1, len(text)),
+            })
+        self.current = None
+
+    def close(self):
+        super().close()
+        self._close_paragraph()
+
+
+def _score_paragraph(paragraph: Dict) -> float:
+    """Readability-style score: long, comma-rich, link-poor text in content-looking blocks wins."""
+    text = paragraph["text"]
+    if len(text) < 25:
+        return 0.0
+    score = 1.0 + text.count(",") + min(len(text) // 100, 3)
+    container = paragraph["container"]
+    if POSITIVE_HINTS.search(container):
+        score += 5
+    if NEGATIVE_HINTS.search(container):
+        score -= 10
+    return score * (1.0 - paragraph["link_density"])
+
+
+def select_main_content(paragraphs: List[Dict]) -> List[str]:
+    """
+    Pick the container whose paragraphs score highest and return its paragraphs,
+    plus any other high-scoring paragraphs that are clearly body text.
+    """
+    if not paragraphs:
+        return []
+
+    container_scores: Dict[str, float] = {}
+    scores = []
+    for paragraph in paragraphs:
+        score = _score_paragraph(paragraph)
+        scores.append(score)
+        container_scores[paragraph["container"]] = container_scores.get(paragraph["container"], 0.0) + score
+
+    best_container = max(container_scores, key=container_scores.get)
+    if container_scores[best_container] <= 0:
+        return [p["text"] for p in paragraphs]
+
+    # Keep document order; include strong paragraphs from sibling containers too
+    return [p["text"] for p, score in zip(paragraphs, scores)
+            if score > 0 and (p["container"] == best_container or score >= 5)]
+
+
+def extract_streaming(html: str) -> str:
+    """Fast extractor: streaming tokenizer plus main-content scoring, no tree built."""
+    parser = _StreamingExtractor()
+    parser.feed(html)
+    parser.close()
+
+    text = "\n".join(select_main_content(parser.paragraphs))
+    if not text:
+        lines = (WHITESPACE.sub(" ", line).strip() for line in "".join(parser.fallback).split("\n"))
+        text = "\n".join(line for line in lines if line)
+    return text
+
+
+def iter_paragraphs(chunks: Iterable[str]) -> Iterator[str]:
+    """
+    Incrementally extract readable paragraphs from HTML arriving in chunks.
+    Paragraphs are yielded as soon as they close, so memory stays bounded by the
+    largest paragraph; each is judged on its own score since the whole page
+    is never available for container selection.
+    """
+    parser = _StreamingExtractor(keep_fallback=False)
+    for chunk in chunks:
+        parser.feed(chunk)
+        yield from _drain_paragraphs(parser)
+    parser.close()
+    yield from _drain_paragraphs(parser)
+
+
+def _drain_paragraphs(parser: _StreamingExtractor) -> Iterator[str]:
+    paragraphs, parser.paragraphs = parser.paragraphs, []
+    for paragraph in paragraphs:
+        if _score_paragraph(paragraph) > 0:
+            yield paragraph["text"]
+
+
+def extract_lxml(html: str) -> str:
+    """lxml extractor: C parser and XPath, same main-content scoring as the streaming extractor."""
+    import lxml.html
+
+    try:
+        root = lxml.html.document_fromstring(html)
+    except Exception:
+        # lxml rejects empty documents and some encodings; the streaming extractor copes with those
+        return extract_streaming(html)
+
+    for element in root.xpath("//" + " | //".join(sorted(SKIP_TAGS))):
+        element.drop_tree()
+
+    paragraphs = []
+    for p in root.iter("p"):
+        text = WHITESPACE.sub(" ", p.text_content()).strip()
+        if not text:
+            continue
+        parent = p.getparent()
+        while parent is not None and parent.tag not in ("div", "section", "article", "main", "td", "body"):
+            parent = parent.getparent()
+        container = "body"
+        if parent is not None and parent.tag != "body":
+            container = f"{parent.tag} {parent.get('class', '')} {parent.get('id', '')}"
+        link_chars = sum(len(a.text_content()) for a in p.iter("a"))
+        paragraphs.append({"text": text, "container": container, "link_density": link_chars / max(1, len(text))})
+
+    text = "\n".join(select_main_content(paragraphs))
+    if not text:
+        main_content = next((el for el in (root.find(".//main"), root.find(".//article"), root.find(".//body"))
+                             if el is not None), None)
+        if main_content is not None:
+            lines = (WHITESPACE.sub(" ", line).strip() for line in main_content.itertext())
+            text = "\n".join(line for line in lines if line)
+    return text
+
+
+EXTRACTORS: Dict[str, Callable[[str], str]] = {
+    "soup": extract_soup,
+    "streaming": extract_streaming,
+    "lxml": extract_lxml,
+}
+
+
+def _default_extractor() -> str:
+    try:
+        import lxml.html  # noqa: F401
+        return "lxml"
+    except ImportError:
+        return "streaming"
+
+
+DEFAULT_EXTRACTOR = _default_extractor()
+
+
+def extract_text(html: str, extractor: Optional[str] = None) -> str:
+    """
+    Extract the readable main text from an HTML page.
+
+    Args:
+        html: Raw HTML
+        extractor: Name of the backend in EXTRACTORS; defaults to lxml when installed,
+            otherwise the streaming extractor
+
+    Returns:
+        Extracted text, paragraphs separated by newlines
+    """
+    name = extractor or DEFAULT_EXTRACTOR
+    if name not in EXTRACTORS:
+        raise ValueError(f"Unknown extractor '{name}'. Choose from: {', '.join(EXTRACTORS)}")
+    return EXTRACTORS[name](html)
@@ -0,0 +1,183 @@
+import codecs
+import tempfile
+import threading
+import logging
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, Mapping, Optional
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger(__name__)
+
+USER_AGENT = "Mozilla/5.0"
+
+# Seconds to wait for the TCP/TLS connection and between bytes of the response
+CONNECT_TIMEOUT = 5.0
+READ_TIMEOUT = 15.0
+
+# Responses larger than this are abandoned instead of being read into memory
+MAX_BODY_BYTES = 5 * 1024 * 1024
+# Cap for iter_text, which spools the body to a temporary file instead of memory
+MAX_STREAM_BYTES = 200 * 1024 * 1024
+
+# Retries for connection errors and transient HTTP statuses, with exponential backoff
+MAX_RETRIES = 3
+BACKOFF_FACTOR = 0.5
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+# Connection pool size and number of simultaneous requests allowed per host
+POOL_SIZE = 20
+PER_HOST_LIMIT = 4
+
+CHUNK_SIZE = 64 * 1024
+
+
+class ResponseTooLarge(requests.RequestException):
+    """Raised when a response body exceeds MAX_BODY_BYTES."""
+
+
+@dataclass
+class FetchResult:
+    url: str
+    status_code: int
+    headers: Mapping[str, str] = field(default_factory=dict)
+    text: str = ""
+
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+_host_limits: Dict[str, threading.BoundedSemaphore] = {}
+_host_limits_lock = threading.Lock()
+
+
+def get_session() -> requests.Session:
+    """Return the process-wide pooled session, creating it on first use."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                retry = Retry(
+                    total=MAX_RETRIES,
+                    connect=MAX_RETRIES,
+                    read=MAX_RETRIES,
+                    status=MAX_RETRIES,
+                    backoff_factor=BACKOFF_FACTOR,
+                    status_forcelist=RETRY_STATUSES,
+                    allowed_methods=frozenset(["GET", "HEAD"]),
+                    raise_on_status=False,
+                )
+                adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE, max_retries=retry)
+                session = requests.Session()
+                session.headers.update({"User-Agent": USER_AGENT})
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                _session = session
+    return _session
+
+
+def _host_limit(url: str) -> threading.BoundedSemaphore:
+    host = urlparse(url).netloc.lower()
+    with _host_limits_lock:
+        semaphore = _host_limits.get(host)
+        if semaphore is None:
+            semaphore = threading.BoundedSemaphore(PER_HOST_LIMIT)
+            _host_limits[host] = semaphore
+        return semaphore
+
+
+def _iter_body(response: requests.Response, max_bytes: int, chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+    content_length = response.headers.get("Content-Length")
+    if content_length and content_length.isdigit() and int(content_length) > max_bytes:
+        raise ResponseTooLarge(f"Response is {content_length} bytes (limit {max_bytes})")
+
+    size = 0
+    for chunk in response.iter_content(chunk_size=chunk_size):
+        size += len(chunk)
+        if size > max_bytes:
+            raise ResponseTooLarge(f"Response exceeded {max_bytes} bytes")
+        yield chunk
+
+
+def _read_body(response: requests.Response, max_bytes: int) -> bytes:
+    return b"".join(_iter_body(response, max_bytes))
+
+
+def _response_encoding(response: requests.Response) -> str:
+    encoding = response.encoding or "utf-8"
+    # requests falls back to ISO-8859-1 for text/* without a charset; most pages are UTF-8
+    if encoding.lower() == "iso-8859-1" and "charset" not in response.headers.get("Content-Type", "").lower():
+        encoding = "utf-8"
+    try:
+        codecs.lookup(encoding)
+    except LookupError:
+        encoding = "utf-8"
+    return encoding
+
+
+def fetch(url: str, headers: Optional[Dict[str, str]] = None, max_bytes: int = MAX_BODY_BYTES) -> FetchResult:
+    """
+    Download a URL through the shared session.
+
+    Args:
+        url: The URL to fetch
+        headers: Extra request headers (e.g. conditional request headers)
+        max_bytes: Maximum response body size
+
+    Returns:
+        FetchResult with the decoded body. 304 responses have an empty body.
+
+    Raises:
+        requests.RequestException on connection errors, timeouts, HTTP errors
+        or when the body exceeds max_bytes
+    """
+    with _host_limit(url):
+        with get_session().get(url, headers=headers, timeout=(CONNECT_TIMEOUT, READ_TIMEOUT), stream=True) as response:
+            if response.status_code == 304:
+                return FetchResult(url=response.url, status_code=304, headers=response.headers)
+
+            response.raise_for_status()
+            body = _read_body(response, max_bytes)
+            text = body.decode(_response_encoding(response), errors="replace")
+
+    logger.debug(f"Fetched {url} ({len(body)} bytes)")
+    return FetchResult(url=response.url, status_code=response.status_code, headers=response.headers, text=text)
+
+
+def iter_text(url: str, headers: Optional[Dict[str, str]] = None, max_bytes: int = MAX_STREAM_BYTES,
+              chunk_size: int = CHUNK_SIZE) -> Iterator[str]:
+    """
+    Download a URL too large for fetch() and yield its body as decoded text chunks.
+
+    The body is spooled to a temporary file at network speed, so the per-host slot
+    is released before the caller starts consuming, and memory stays bounded by
+    chunk_size however large the response.
+
+    Raises:
+        requests.RequestException on connection errors, timeouts, HTTP errors
+        or when the body exceeds max_bytes
+    """
+    with tempfile.TemporaryFile() as spool:
+        with _host_limit(url):
+            with get_session().get(url, headers=headers, timeout=(CONNECT_TIMEOUT, READ_TIMEOUT), stream=True) as response:
+                response.raise_for_status()
+                for chunk in _iter_body(response, max_bytes, chunk_size):
+                    spool.write(chunk)
+                encoding = _response_encoding(response)
+        logger.debug(f"Spooled {url} ({spool.tell()} bytes)")
+
+        spool.seek(0)
+        decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+        while True:
+            data = spool.read(chunk_size)
+            if not data:
+                break
+            text = decoder.decode(data)
+            if text:
+                yield text
+        tail = decoder.decode(b"", final=True)
+        if tail:
+            yield tail
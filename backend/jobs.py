@@ -0,0 +1,388 @@
+import os
+import time
+import uuid
+import logging
+import threading
+import multiprocessing
+from concurrent.futures import (FIRST_COMPLETED, CancelledError, Future, ProcessPoolExecutor, ThreadPoolExecutor,
+                                TimeoutError as FutureTimeoutError, wait as wait_futures)
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Number of inference worker processes; 0 runs every job inline in the caller
+WORKER_COUNT = int(os.environ.get("TASKTAMER_WORKERS", "0"))
+# Jobs allowed to be queued or running at once before submissions are rejected
+MAX_QUEUE = int(os.environ.get("TASKTAMER_MAX_QUEUE", "32"))
+# Default per-job time limit in seconds
+DEFAULT_TIMEOUT = 120.0
+# Finished jobs are forgotten this many seconds after completion
+RESULT_RETENTION = 600.0
+# Threads run_each uses in inline mode (calls such as page summaries are mostly I/O)
+INLINE_THREADS = 8
+
+
+class QueueFull(RuntimeError):
+    """Raised when the job queue is at capacity; callers should retry later."""
+
+
+class JobTimeout(RuntimeError):
+    """Raised by wait() when a job exceeded its time limit."""
+
+
+def _run_break_task(task_description: str, detail_level: Optional[str] = None) -> Dict[str, Any]:
+    from backend.task_breakdown import TaskBreakdown
+
+    return TaskBreakdown().break_task(task_description, detail_level)
+
+
+def _run_summarize_file(path: str, num_sentences: int = 5) -> str:
+    from backend.summarization import iter_file_chunks, summarize_stream
+
+    with open(path, "rb") as f:
+        return summarize_stream(iter_file_chunks(f), num_sentences=num_sentences)
+
+
+def _resolve(name: str) -> Callable:
+    # Imported inside the worker so the parent process never loads the models
+    if name == "break_down_task":
+        from backend.task_breakdown import break_down_task
+        return break_down_task
+    if name == "break_task":
+        return _run_break_task
+    if name == "summarize_content":
+        from backend.summarization import summarize_content
+        return summarize_content
+    if name == "generate_quiz":
+        from backend.question_generation import generate_quiz
+        return generate_quiz
+    if name == "summarize_file":
+        return _run_summarize_file
+    raise ValueError(f"Unknown job '{name}'")
+
+
+JOB_NAMES = ("break_down_task", "break_task", "summarize_content", "generate_quiz", "summarize_file")
+
+
+def _execute(name: str, args: tuple, kwargs: Dict[str, Any]) -> Any:
+    return _resolve(name)(*args, **kwargs)
+
+
+def _init_worker() -> None:
+    """Load the models once per worker process so jobs never pay the load cost."""
+    from backend.task_breakdown import preload
+    from backend.quiz_selection import get_tagger
+    from backend.sentence_ranking import rank_sentences
+
+    preload()
+    get_tagger()
+    # Imports scikit-learn ahead of the first summary
+    rank_sentences(["Warm up the sentence ranker.", "It imports its dependencies lazily."], "textrank")
+
+
+class _Job:
+    def __init__(self, job_id: str, name: str, args: tuple, kwargs: Dict[str, Any], timeout: float):
+        self.id = job_id
+        self.name = name
+        self.args = args
+        self.kwargs = kwargs
+        self.future: Optional[Future] = None
+        self.executor: Optional[ProcessPoolExecutor] = None
+        # Set while a queued job is moved to a new pool, so its cancelled old future is ignored
+        self.moving = False
+        self.submitted_at = time.time()
+        self.deadline = self.submitted_at + timeout
+        self.finished_at: Optional[float] = None
+        self.timed_out = False
+
+
+class JobManager:
+    """
+    Process pool of inference workers with a submit/poll/cancel API.
+
+    The pool holds loaded models in each worker, so Streamlit script threads only
+    wait on results and CPU-bound generation runs on every core instead of
+    contending for one GIL. The number of outstanding jobs is capped; beyond
+    that, submit() raises QueueFull instead of queueing without bound.
+
+    A running worker cannot be interrupted, so when a job overruns its deadline
+    the pool is recycled: queued jobs move to a fresh pool, and the old pool's
+    processes are terminated as soon as the jobs still running there on time have
+    finished. Until then the old pool's processes use memory and CPU
+    alongside the new ones.
+    """
+
+    def __init__(self, workers: int = WORKER_COUNT, max_queue: int = MAX_QUEUE):
+        self.workers = max(1, workers)
+        self.max_queue = max_queue
+        self._slots = threading.BoundedSemaphore(max_queue)
+        self._jobs: Dict[str, _Job] = {}
+        self._lock = threading.RLock()
+        self._executor = self._new_executor()
+        # Recycled pools still finishing on-time jobs, with the processes to terminate afterwards
+        self._retired: List[Tuple[ProcessPoolExecutor, list]] = []
+        self._recycles = 0
+
+    def _new_executor(self) -> ProcessPoolExecutor:
+        # spawn: forking a process that runs Streamlit/tornado threads is unsafe
+        return ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+        )
+
+    def _start(self, job: _Job) -> None:
+        job.executor = self._executor
+        job.future = self._executor.submit(_execute, job.name, job.args, job.kwargs)
+        job.future.add_done_callback(lambda future: self._finish(job, future))
+
+    def submit(self, name: str, *args, timeout: float = DEFAULT_TIMEOUT, **kwargs) -> str:
+        """
+        Queue a backend call.
+
+        Args:
+            name: One of JOB_NAMES
+            timeout: Seconds after which the job is reported as timed out
+
+        Returns:
+            Job id for poll/cancel/wait
+
+        Raises:
+            QueueFull if MAX_QUEUE jobs are already outstanding
+        """
+        if name not in JOB_NAMES:
+            raise ValueError(f"Unknown job '{name}'. Choose from: {', '.join(JOB_NAMES)}")
+        if not self._slots.acquire(blocking=False):
+            raise QueueFull(f"{self.max_queue} jobs already queued")
+
+        job = _Job(uuid.uuid4().hex, name, args, kwargs, timeout)
+        with self._lock:
+            try:
+                self._start(job)
+            except Exception:
+                self._slots.release()
+                raise
+            self._purge()
+            self._jobs[job.id] = job
+        return job.id
+
+    def _finish(self, job: _Job, future: Future) -> None:
+        # Futures left behind by a move to a new pool do not finish the job
+        if job.moving or future is not job.future:
+            return
+        job.finished_at = time.time()
+        self._slots.release()
+        with self._lock:
+            self._reap()
+
+    def _expire(self, job: _Job) -> None:
+        """Mark a job as timed out; recycle the pool if it is still running past its deadline."""
+        job.timed_out = True
+        if job.future.cancel() or job.future.done() or time.time() < job.deadline:
+            return
+        with self._lock:
+            if job.executor is self._executor:
+                self._recycle()
+
+    def _recycle(self) -> None:
+        logger.warning("A job overran its deadline; moving queued jobs to a fresh worker pool")
+        old = self._executor
+        processes = list((getattr(old, "_processes", None) or {}).values())
+        self._executor = self._new_executor()
+        self._recycles += 1
+        for job in self._jobs.values():
+            if job.executor is old and not job.future.done():
+                job.moving = True
+                try:
+                    if job.future.cancel():
+                        self._start(job)
+                finally:
+                    job.moving = False
+        old.shutdown(wait=False)
+        self._retired.append((old, processes))
+        self._reap()
+
+    def _reap(self) -> None:
+        """Terminate retired pools once none of their on-time jobs is still running."""
+        for entry in list(self._retired):
+            executor, processes = entry
+            if any(job.executor is executor and not job.future.done() and not job.timed_out
+                   for job in self._jobs.values()):
+                continue
+            for process in processes:
+                if process.is_alive():
+                    process.terminate()
+            self._retired.remove(entry)
+
+    def _purge(self) -> None:
+        cutoff = time.time() - RESULT_RETENTION
+        for job_id in [j.id for j in self._jobs.values() if j.finished_at and j.finished_at < cutoff]:
+            del self._jobs[job_id]
+
+    def _get(self, job_id: str) -> _Job:
+        with self._lock:
+            job = self._jobs.get(job_id)
+        if job is None:
+            raise KeyError(f"Unknown job id '{job_id}'")
+        return job
+
+    def poll(self, job_id: str) -> Dict[str, Any]:
+        """
+        Current state of a job.
+
+        Returns:
+            Dict with "status" (pending, running, done, failed, cancelled or timeout)
+            and "result" or "error" once finished
+        """
+        job = self._get(job_id)
+        future = job.future
+
+        if future.cancelled():
+            return {"id": job.id, "status": "cancelled"}
+        if job.timed_out or (not future.done() and time.time() > job.deadline):
+            # Any late result is discarded
+            self._expire(job)
+            return {"id": job.id, "status": "timeout", "error": "Job exceeded its time limit"}
+        if not future.done():
+            return {"id": job.id, "status": "running" if future.running() else "pending"}
+
+        error = future.exception()
+        if error is not None:
+            return {"id": job.id, "status": "failed", "error": str(error)}
+        return {"id": job.id, "status": "done", "result": future.result()}
+
+    def cancel(self, job_id: str) -> bool:
+        """Cancel a job that has not started yet. Returns False if it is already running or finished."""
+        return self._get(job_id).future.cancel()
+
+    def wait(self, job_id: str, timeout: Optional[float] = None) -> Any:
+        """
+        Block until a job finishes and return its result.
+
+        Raises:
+            JobTimeout if the job's own deadline (or `timeout`) passes first
+            The job's exception if it failed
+        """
+        job = self._get(job_id)
+        give_up = job.deadline if timeout is None else min(job.deadline, time.time() + timeout)
+        while True:
+            future = job.future
+            try:
+                return future.result(timeout=max(0.0, give_up - time.time()))
+            except CancelledError:
+                # Moved to a fresh pool while queued: wait on the new future
+                if job.future is not future:
+                    continue
+                raise
+            except FutureTimeoutError:
+                self._expire(job)
+                raise JobTimeout(f"Job {job.name} exceeded its time limit")
+
+    def run_each(self, name: str, calls: List[Dict[str, Any]], timeout: float = DEFAULT_TIMEOUT,
+                 max_in_flight: Optional[int] = None) -> Iterator[Tuple[int, Any, Optional[Exception]]]:
+        """
+        Run one job per kwargs dict and yield (index, result, error) as each finishes.
+
+        At most max_in_flight (default 2 * workers) of the calls are outstanding at
+        once, so one caller's batch cannot fill the queue for everyone else.
+        """
+        limit = max(1, max_in_flight or 2 * self.workers)
+        remaining = list(enumerate(calls))[::-1]
+        outstanding: Dict[str, int] = {}
+        while remaining or outstanding:
+            while remaining and len(outstanding) < limit:
+                index, kwargs = remaining.pop()
+                try:
+                    outstanding[self.submit(name, timeout=timeout, **kwargs)] = index
+                except QueueFull as e:
+                    yield index, None, e
+
+            if not outstanding:
+                continue
+            jobs = [self._get(job_id) for job_id in outstanding]
+            next_deadline = min(job.deadline for job in jobs)
+            wait_futures([job.future for job in jobs], timeout=max(0.0, next_deadline - time.time()),
+                         return_when=FIRST_COMPLETED)
+            for job in jobs:
+                state = self.poll(job.id)
+                if state["status"] in ("pending", "running"):
+                    continue
+                index = outstanding.pop(job.id)
+                if state["status"] == "done":
+                    yield index, state["result"], None
+                elif state["status"] == "timeout":
+                    yield index, None, JobTimeout(f"Job {name} exceeded its time limit")
+                else:
+                    yield index, None, RuntimeError(state.get("error", state["status"]))
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            jobs = list(self._jobs.values())
+        return {
+            "workers": self.workers,
+            "max_queue": self.max_queue,
+            "outstanding": sum(1 for j in jobs if not j.future.done()),
+            "recycles": self._recycles,
+            "retained": len(jobs),
+        }
+
+    def shutdown(self, wait: bool = True) -> None:
+        with self._lock:
+            for executor, processes in self._retired:
+                for process in processes:
+                    if process.is_alive():
+                        process.terminate()
+                executor.shutdown(wait=False)
+            self._retired.clear()
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+
+_manager: Optional[JobManager] = None
+_manager_lock = threading.Lock()
+
+
+def get_job_manager() -> Optional[JobManager]:
+    """Shared job manager, or None when TASKTAMER_WORKERS is 0 (inline mode)."""
+    global _manager
+    if WORKER_COUNT <= 0:
+        return None
+    if _manager is None:
+        with _manager_lock:
+            if _manager is None:
+                _manager = JobManager()
+    return _manager
+
+
+def run(name: str, *args, timeout: float = DEFAULT_TIMEOUT, **kwargs) -> Any:
+    """
+    Run a backend call through the worker pool and wait for it, or inline when
+    no pool is configured. Raises QueueFull under backpressure.
+    """
+    manager = get_job_manager()
+    if manager is None:
+        return _execute(name, args, kwargs)
+    return manager.wait(manager.submit(name, *args, timeout=timeout, **kwargs))
+
+
+def run_each(name: str, calls: List[Dict[str, Any]],
+             timeout: float = DEFAULT_TIMEOUT) -> Iterator[Tuple[int, Any, Optional[Exception]]]:
+    """
+    Run one backend call per kwargs dict and yield (index, result, error) in
+    completion order: through the worker pool, or on INLINE_THREADS threads in
+    this process when no pool is configured.
+    """
+    manager = get_job_manager()
+    if manager is not None:
+        yield from manager.run_each(name, calls, timeout=timeout)
+        return
+    if not calls:
+        return
+
+    with ThreadPoolExecutor(max_workers=min(INLINE_THREADS, len(calls))) as executor:
+        futures = {executor.submit(_execute, name, (), kwargs): index for index, kwargs in enumerate(calls)}
+        pending = set(futures)
+        while pending:
+            done, pending = wait_futures(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                error = future.exception()
+                yield futures[future], None if error else future.result(), error
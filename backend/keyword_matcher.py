@@ -0,0 +1,118 @@
+from collections import deque
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple, Union
+
+# Keywords per category, either as a list (weight 1.0 each) or a {keyword: weight} mapping
+KeywordTable = Mapping[str, Union[Iterable[str], Mapping[str, float]]]
+
+
+class KeywordMatcher:
+    """
+    Aho-Corasick automaton over every keyword of every category.
+    Matching walks the lowercased text once, so the cost is O(len(text) + matches)
+    no matter how many categories or keywords the table holds. Keywords match as
+    substrings, like the `keyword in text` checks they replace.
+    """
+
+    def __init__(self, table: KeywordTable):
+        # Category order is kept for deterministic tie-breaking
+        self.categories: List[str] = list(table)
+        self._order = {category: index for index, category in enumerate(self.categories)}
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        # For each state: (keyword, [(category, weight), ...]) pairs ending there
+        self._output: List[List[Tuple[str, List[Tuple[str, float]]]]] = [[]]
+
+        keyword_targets: Dict[str, List[Tuple[str, float]]] = {}
+        for category, keywords in table.items():
+            weighted = keywords.items() if isinstance(keywords, Mapping) else ((kw, 1.0) for kw in keywords)
+            for keyword, weight in weighted:
+                keyword = keyword.lower()
+                if keyword:
+                    keyword_targets.setdefault(keyword, []).append((category, weight))
+
+        for keyword, targets in keyword_targets.items():
+            self._add(keyword, targets)
+        self._build_failure_links()
+
+    def _add(self, keyword: str, targets: List[Tuple[str, float]]) -> None:
+        state = 0
+        for char in keyword:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+            state = next_state
+        self._output[state].append((keyword, targets))
+
+    def _build_failure_links(self) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[next_state] = target if target != next_state else 0
+                # Inherit matches that end at the failure state (suffix keywords)
+                self._output[next_state] = self._output[next_state] + self._output[self._fail[next_state]]
+
+    def find(self, text: str) -> List[Tuple[str, int]]:
+        """All (keyword, end_index) occurrences in the text, in order of their end position."""
+        matches = []
+        state = 0
+        goto = self._goto
+        fail = self._fail
+        output = self._output
+        for index, char in enumerate(text.lower()):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for keyword, _ in output[state]:
+                matches.append((keyword, index))
+        return matches
+
+    def scores(self, text: str, unique: bool = True) -> Dict[str, float]:
+        """
+        Weighted score per category for the text.
+
+        Args:
+            text: Text to scan
+            unique: Count each keyword once even if it occurs repeatedly
+        """
+        totals: Dict[str, float] = {}
+        seen = set()
+        state = 0
+        goto = self._goto
+        fail = self._fail
+        output = self._output
+        for char in text.lower():
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for keyword, targets in output[state]:
+                if unique:
+                    if keyword in seen:
+                        continue
+                    seen.add(keyword)
+                for category, weight in targets:
+                    totals[category] = totals.get(category, 0.0) + weight
+        return totals
+
+    def best(self, text: str) -> Optional[str]:
+        """Highest-scoring category, ties going to the category listed first; None if nothing matched."""
+        totals = self.scores(text)
+        if not totals:
+            return None
+        return max(totals, key=lambda category: (totals[category], -self._order[category]))
+
+    def first(self, text: str) -> Optional[str]:
+        """First category in table order with any keyword in the text, like an if/elif chain; None if nothing matched."""
+        totals = self.scores(text)
+        if not totals:
+            return None
+        return min(totals, key=self._order.__getitem__)
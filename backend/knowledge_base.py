@@ -0,0 +1,231 @@
+import re
+import math
+import threading
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Tuple
+
+from backend.keyword_matcher import KeywordMatcher
+
+# BM25 parameters (same defaults as rank_bm25.BM25Okapi)
+K1 = 1.5
+B = 0.75
+
+# Below this BM25 score the question is considered unanswered
+MIN_SCORE = 0.5
+# BM25 points added per matched routing keyword. Keywords match whole words (plural
+# 's' ignored) and may be phrases; a trailing "*" marks a stem that matches word prefixes
+KEYWORD_BOOST = 1.0
+# Score at which confidence reaches ~63%; confidence = 1 - exp(-score / scale)
+CONFIDENCE_SCALE = 4.0
+
+TOKEN = re.compile(r"[a-z0-9]+")
+
+STOP_WORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "can", "could", "do", "does", "for", "from",
+    "i", "in", "is", "it", "its", "me", "my", "of", "on", "or", "please", "so", "that", "the",
+    "this", "to", "was", "what", "when", "where", "which", "who", "why", "will", "with", "would",
+    "you", "your",
+}
+
+FAQ_ENTRIES = [
+    {
+        "id": "task_breakdown",
+        "keywords": ["task", "break", "breakdown", "divide", "steps", "split", "overwhelming"],
+        "questions": "How do I use the Task Breakdown feature? How can I break a big task into steps?",
+        "answer": (
+            "The Task Breakdown feature helps you divide complex tasks into manageable steps. "
+            "Just enter your task in the text area and click 'Break Down Task'. "
+            "TaskTamer will analyze your task and provide a step-by-step breakdown. "
+            "You can download the breakdown for later reference."
+        ),
+    },
+    {
+        "id": "summarization",
+        "keywords": ["summary", "summariz*", "summaris*", "extract", "article", "webpage", "reading list"],
+        "questions": "How do I summarize an article? Can TaskTamer summarize a web page?",
+        "answer": (
+            "The Summarization feature helps you extract key information from text or web content. "
+            "You can either paste text directly or provide a URL. "
+            "TaskTamer will analyze the content and generate a concise summary. "
+            "This is great for quickly understanding articles, research papers, or any long-form content."
+        ),
+    },
+    {
+        "id": "quiz",
+        "keywords": ["quiz", "question", "test", "multiple choice", "exam", "revision"],
+        "questions": "How does the Quiz Generator work? What's the best way to use the Quiz feature?",
+        "answer": (
+            "The Quiz Generator creates multiple-choice questions based on your provided content. "
+            "Simply paste your text or enter a URL, and TaskTamer will generate quiz questions. "
+            "You can take the quiz directly in the app to test your knowledge, "
+            "and download the questions for later study."
+        ),
+    },
+    {
+        "id": "about",
+        "keywords": ["about", "purpose", "what is", "developed", "creator", "who made", "author"],
+        "questions": "What is TaskTamer? Who created TaskTamer?",
+        "answer": (
+            "TaskTamer is a productivity tool developed by Alessandra Batalha as part of her final year project "
+            "at Dublin Business School. It's designed to help students and professionals manage "
+            "their learning and work tasks more efficiently, particularly those with ADHD. "
+            "The application combines task breakdown, content summarization, and quiz generation "
+            "features to improve productivity and learning."
+        ),
+    },
+    {
+        "id": "how_to_use",
+        "keywords": ["how to", "use", "work", "help", "instruction", "getting started"],
+        "questions": "How do I use TaskTamer? How does this work?",
+        "answer": (
+            "To use TaskTamer, select a feature from the sidebar navigation. Each feature has its own page "
+            "with clear instructions. For example, to break down a task, go to Task Breakdown, enter your task, "
+            "and click the button. For summarization, you can paste text or enter a URL. "
+            "The Quiz Generator works similarly, allowing you to create questions from your content. "
+            "Feel free to ask about specific features if you need more details!"
+        ),
+    },
+    {
+        "id": "technology",
+        "keywords": ["technology", "built", "made", "stack", "code", "python", "streamlit", "architecture"],
+        "questions": "What technology is TaskTamer built with?",
+        "answer": (
+            "TaskTamer is built using Python with Streamlit for the web interface. "
+            "It uses BeautifulSoup for web scraping, requests for HTTP interactions, "
+            "and various text processing techniques. The application has a modular architecture "
+            "with separate components for task breakdown, summarization, quiz generation, "
+            "and the chat assistant. This design makes it easy to maintain and extend."
+        ),
+    },
+    {
+        "id": "focus_tips",
+        "keywords": ["focus*", "concentrat*", "distract*", "pomodoro", "tips"],
+        "questions": "Can you give me tips for staying focused?",
+        "answer": (
+            "Try the Pomodoro technique: 25 minutes of focused work followed by a 5-minute break. "
+            "Turn off notifications, keep a dedicated workspace, and use a visual timer to make time concrete. "
+            "Breaking your work into small steps with Task Breakdown also makes it easier to stay on track."
+        ),
+    },
+    {
+        "id": "adhd",
+        "keywords": ["adhd", "attention", "neurodivergent", "executive function"],
+        "questions": "How can TaskTamer help with ADHD?",
+        "answer": (
+            "TaskTamer was designed with ADHD in mind. Task Breakdown turns overwhelming projects into small, "
+            "concrete steps with ADHD-friendly tips and rewards. Summarization reduces information overload, "
+            "and the Quiz Generator reinforces learning through active recall."
+        ),
+    },
+    {
+        "id": "procrastination",
+        "keywords": ["procrastinat*", "motivat*", "stuck", "putting off", "get started"],
+        "questions": "How do I stop procrastinating?",
+        "answer": (
+            "Start with the smallest possible step - even two minutes of work breaks the inertia. "
+            "Use Task Breakdown to find that first step, set a timer, and plan a small reward for finishing. "
+            "Body doubling, working alongside someone else, can also help you get started."
+        ),
+    },
+]
+
+
+def _singular(token: str) -> str:
+    if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+        return token[:-1]
+    return token
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens without stop words, with plural 's' stripped."""
+    return [_singular(token) for token in TOKEN.findall(text.lower()) if token not in STOP_WORDS]
+
+
+def _word_text(text: str) -> str:
+    """Space-separated singular word tokens, stop words kept, padded with a space on each side."""
+    return " " + " ".join(_singular(token) for token in TOKEN.findall(text.lower())) + " "
+
+
+def _keyword_pattern(keyword: str) -> str:
+    """Keyword as matched against _word_text: a whole-word phrase, or a word prefix for "stem*"."""
+    pattern = _word_text(keyword)
+    return pattern[:-1] if keyword.endswith("*") else pattern
+
+
+class KnowledgeBase:
+    """
+    FAQ entries indexed once into an inverted index and ranked with BM25 (Okapi).
+    A query only touches the postings of its own terms, so lookup cost depends on
+    how many entries share the query's words rather than on the total entry count.
+    """
+
+    def __init__(self, entries: List[Dict[str, Any]]):
+        self.entries = entries
+        self.postings: Dict[str, List[Tuple[int, int]]] = defaultdict(list)
+        self.idf: Dict[str, float] = {}
+        self.doc_norms: List[float] = []
+
+        lengths = []
+        for doc_id, entry in enumerate(entries):
+            keywords = " ".join(entry.get("keywords", []))
+            tokens = tokenize(" ".join([keywords, entry.get("questions", ""), entry["answer"]]))
+            lengths.append(len(tokens))
+            counts: Dict[str, int] = defaultdict(int)
+            for token in tokens:
+                counts[token] += 1
+            for token, count in counts.items():
+                self.postings[token].append((doc_id, count))
+
+        doc_count = len(entries)
+        average_length = sum(lengths) / doc_count if doc_count else 0.0
+        # Length normalisation is constant per document, so precompute it
+        self.doc_norms = [K1 * (1 - B + B * length / average_length) if average_length else K1 for length in lengths]
+        for token, postings in self.postings.items():
+            df = len(postings)
+            self.idf[token] = math.log((doc_count - df + 0.5) / (df + 0.5) + 1)
+
+        # Routing keywords can be phrases ("multiple choice") or stems ("procrastinat*") that
+        # single BM25 terms miss, so they are matched in one pass over the query's words and
+        # added as a boost. Space-padding keeps "use" from matching inside "because"
+        self.matcher = KeywordMatcher({doc_id: [_keyword_pattern(keyword) for keyword in entry.get("keywords", [])]
+                                       for doc_id, entry in enumerate(entries)})
+
+    def search(self, query: str, limit: int = 3) -> List[Tuple[Dict[str, Any], float]]:
+        """Return up to `limit` (entry, score) pairs, best first."""
+        scores: Dict[int, float] = defaultdict(float)
+        for doc_id, keyword_score in self.matcher.scores(_word_text(query)).items():
+            scores[doc_id] += KEYWORD_BOOST * keyword_score
+        for token in set(tokenize(query)):
+            idf = self.idf.get(token)
+            if idf is None:
+                continue
+            for doc_id, tf in self.postings[token]:
+                scores[doc_id] += idf * tf * (K1 + 1) / (tf + self.doc_norms[doc_id])
+
+        best = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:limit]
+        return [(self.entries[doc_id], score) for doc_id, score in best]
+
+    def answer(self, query: str) -> Tuple[Optional[Dict[str, Any]], float]:
+        """
+        Best matching entry and a confidence in [0, 1].
+        Returns (None, 0.0) when nothing scores above MIN_SCORE.
+        """
+        results = self.search(query, limit=1)
+        if not results or results[0][1] < MIN_SCORE:
+            return None, 0.0
+        entry, score = results[0]
+        return entry, 1 - math.exp(-score / CONFIDENCE_SCALE)
+
+
+_knowledge_base: Optional[KnowledgeBase] = None
+_knowledge_base_lock = threading.Lock()
+
+
+def get_knowledge_base() -> KnowledgeBase:
+    """Return the shared FAQ index, building it on first use."""
+    global _knowledge_base
+    if _knowledge_base is None:
+        with _knowledge_base_lock:
+            if _knowledge_base is None:
+                _knowledge_base = KnowledgeBase(FAQ_ENTRIES)
+    return _knowledge_base
@@ -0,0 +1,286 @@
+import os
+import copy
+import json
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from functools import wraps
+from typing import Any, Callable, Dict, Optional, Tuple, Union
+
+from backend.content_cache import CACHE_DIR
+
+logger = logging.getLogger(__name__)
+
+# Entries kept in the in-process tier before least recently used ones are dropped
+MEMORY_MAX_ENTRIES = 512
+# Seconds a memoized result stays valid (both tiers)
+DEFAULT_TTL = 24 * 60 * 60
+# Set TASKTAMER_MEMO_DISK=1 to share results across processes through SQLite
+DISK_ENABLED = os.environ.get("TASKTAMER_MEMO_DISK", "0") == "1"
+# Rows kept in the SQLite tier; those closest to expiry are dropped first
+DISK_MAX_ENTRIES = 10_000
+# The SQLite tier is pruned once every this many writes (per process)
+DISK_PRUNE_EVERY = 100
+
+_MISSING = object()
+
+
+def _normalize(value: Any) -> Any:
+    """Normalize inputs so trivially different submissions share a key."""
+    if isinstance(value, str):
+        return value.replace("\r\n", "\n").strip()
+    if isinstance(value, (list, tuple)):
+        return [_normalize(v) for v in value]
+    if isinstance(value, dict):
+        return {str(k): _normalize(v) for k, v in sorted(value.items())}
+    return value
+
+
+def make_key(namespace: str, version: str, args: Tuple, kwargs: Dict[str, Any]) -> str:
+    payload = json.dumps(
+        {"ns": namespace, "v": version, "args": _normalize(list(args)), "kwargs": _normalize(kwargs)},
+        sort_keys=True,
+        default=repr,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class _MemoryTier:
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        # key -> (expires_at, namespace, value)
+        self._entries: "OrderedDict[str, Tuple[float, str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return _MISSING
+            expires_at, _, value = entry
+            if time.time() >= expires_at:
+                del self._entries[key]
+                return _MISSING
+            self._entries.move_to_end(key)
+        # Callers get their own copy so mutating a result cannot corrupt the cache
+        return copy.deepcopy(value)
+
+    def put(self, key: str, namespace: str, value: Any, ttl: float) -> None:
+        with self._lock:
+            self._entries[key] = (time.time() + ttl, namespace, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self, namespace: Optional[str] = None) -> None:
+        with self._lock:
+            if namespace is None:
+                self._entries.clear()
+                return
+            for key in [key for key, entry in self._entries.items() if entry[1] == namespace]:
+                del self._entries[key]
+
+
+class _DiskTier:
+    """SQLite tier shared by every process using the same cache directory."""
+
+    def __init__(self, path: str, max_entries: int = DISK_MAX_ENTRIES, prune_every: int = DISK_PRUNE_EVERY):
+        self.path = path
+        self.max_entries = max_entries
+        self.prune_every = max(1, prune_every)
+        self._writes = 0
+        self._writes_lock = threading.Lock()
+        self._local = threading.local()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS memo (key TEXT PRIMARY KEY, namespace TEXT NOT NULL, "
+                "value TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS memo_namespace ON memo (namespace)")
+            conn.execute("CREATE INDEX IF NOT EXISTS memo_expires_at ON memo (expires_at)")
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str) -> Any:
+        conn = self._connect()
+        row = conn.execute("SELECT value, expires_at FROM memo WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return _MISSING
+        if time.time() >= row[1]:
+            with conn:
+                conn.execute("DELETE FROM memo WHERE key = ? AND expires_at = ?", (key, row[1]))
+            return _MISSING
+        return json.loads(row[0])
+
+    def put(self, key: str, namespace: str, value: Any, ttl: float) -> None:
+        conn = self._connect()
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO memo (key, namespace, value, expires_at) VALUES (?, ?, ?, ?)",
+                (key, namespace, json.dumps(value), time.time() + ttl),
+            )
+        with self._writes_lock:
+            self._writes += 1
+            due = self._writes % self.prune_every == 0
+        if due:
+            self.prune()
+
+    def prune(self) -> None:
+        """Delete expired rows, then the rows closest to expiry beyond max_entries."""
+        conn = self._connect()
+        with conn:
+            conn.execute("DELETE FROM memo WHERE expires_at <= ?", (time.time(),))
+            conn.execute(
+                "DELETE FROM memo WHERE key IN (SELECT key FROM memo ORDER BY expires_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+
+    def clear(self, namespace: Optional[str] = None) -> None:
+        conn = self._connect()
+        with conn:
+            if namespace is None:
+                conn.execute("DELETE FROM memo")
+            else:
+                conn.execute("DELETE FROM memo WHERE namespace = ?", (namespace,))
+
+
+class Memoizer:
+    """
+    Two-tier result cache: an in-process LRU in front of an optional SQLite tier.
+    Keys hash (namespace, version, normalized arguments), so bumping a version
+    (e.g. when the model changes) makes all older results unreachable.
+    """
+
+    def __init__(self, max_entries: int = MEMORY_MAX_ENTRIES, disk: bool = DISK_ENABLED, disk_path: Optional[str] = None):
+        self.memory = _MemoryTier(max_entries)
+        self.disk: Optional[_DiskTier] = None
+        if disk:
+            try:
+                self.disk = _DiskTier(disk_path or os.path.join(CACHE_DIR, "memo.sqlite3"))
+            except (OSError, sqlite3.Error) as e:
+                logger.error(f"Memoization disk tier unavailable: {str(e)}")
+        self._counters: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def _count(self, namespace: str, event: str) -> None:
+        with self._lock:
+            counters = self._counters.setdefault(namespace, {"hits": 0, "disk_hits": 0, "misses": 0})
+            counters[event] += 1
+
+    def get(self, namespace: str, key: str) -> Any:
+        value = self.memory.get(key)
+        if value is not _MISSING:
+            self._count(namespace, "hits")
+            return value
+
+        if self.disk is not None:
+            try:
+                value = self.disk.get(key)
+            except sqlite3.Error as e:
+                logger.error(f"Memoization disk read failed: {str(e)}")
+                value = _MISSING
+            if value is not _MISSING:
+                self._count(namespace, "disk_hits")
+                self.memory.put(key, namespace, copy.deepcopy(value), DEFAULT_TTL)
+                return value
+
+        self._count(namespace, "misses")
+        return _MISSING
+
+    def put(self, namespace: str, key: str, value: Any, ttl: float) -> None:
+        self.memory.put(key, namespace, value, ttl)
+        if self.disk is not None:
+            try:
+                self.disk.put(key, namespace, value, ttl)
+            except (sqlite3.Error, TypeError, ValueError) as e:
+                logger.error(f"Memoization disk write failed: {str(e)}")
+
+    def invalidate(self, namespace: Optional[str] = None) -> None:
+        """Drop memoized results, for one namespace or all of them."""
+        self.memory.clear(namespace)
+        if self.disk is not None:
+            self.disk.clear(namespace)
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        with self._lock:
+            return {namespace: dict(counters) for namespace, counters in self._counters.items()}
+
+
+memoizer = Memoizer()
+
+
+def memoize(namespace: str, version: Union[str, Callable[[], str]] = "1", ttl: float = DEFAULT_TTL,
+            should_cache: Optional[Callable[[Any], bool]] = None,
+            key: Optional[Callable[..., Any]] = None) -> Callable:
+    """
+    Decorator that memoizes a function's JSON-serializable result.
+
+    Callers can pass refresh=True (consumed here, never forwarded) to skip the
+    lookup and replace the memoized result, e.g. for a "regenerate" action on a
+    function whose output is sampled. The wrapper also exposes lookup(*args,
+    **kwargs) and store(value, *args, **kwargs), so a variant that produces the
+    same result another way (e.g. streamed) can share the memo.
+
+    Args:
+        namespace: Name used in keys, statistics and invalidation
+        version: Version string, or a callable returning one (e.g. the loaded model's identity).
+                 A callable is evaluated again after the call, so the result is stored under
+                 the version that actually produced it
+        ttl: Seconds a result stays valid
+        should_cache: Optional predicate; results it rejects (e.g. errors) are not stored
+        key: Optional function of the call's arguments returning what the key is built from
+             instead of the arguments themselves (e.g. a content hash)
+    """
+    def decorator(func: Callable) -> Callable:
+        def make(current_version: str, args: Tuple, kwargs: Dict[str, Any]) -> str:
+            if key is not None:
+                return make_key(namespace, current_version, (key(*args, **kwargs),), {})
+            return make_key(namespace, current_version, args, kwargs)
+
+        @wraps(func)
+        def wrapper(*args, refresh: bool = False, **kwargs):
+            current_version = version() if callable(version) else version
+            if not refresh:
+                value = memoizer.get(namespace, make(current_version, args, kwargs))
+                if value is not _MISSING:
+                    return value
+
+            value = func(*args, **kwargs)
+            store(value, *args, **kwargs)
+            return value
+
+        def lookup(*args, **kwargs) -> Any:
+            """The memoized result for these arguments, or None."""
+            current_version = version() if callable(version) else version
+            value = memoizer.get(namespace, make(current_version, args, kwargs))
+            return None if value is _MISSING else value
+
+        def store(value: Any, *args, **kwargs) -> None:
+            """Memoize a result computed outside the wrapper (subject to should_cache)."""
+            if should_cache is None or should_cache(value):
+                stored_version = version() if callable(version) else version
+                memoizer.put(namespace, make(stored_version, args, kwargs), copy.deepcopy(value), ttl)
+
+        wrapper.uncached = func
+        wrapper.lookup = lookup
+        wrapper.store = store
+        return wrapper
+    return decorator
+
+
+def invalidate(namespace: Optional[str] = None) -> None:
+    memoizer.invalidate(namespace)
+
+
+def stats() -> Dict[str, Dict[str, int]]:
+    return memoizer.stats()
@@ -0,0 +1,248 @@
+import os
+import json
+import time
+import logging
+import threading
+import contextvars
+from contextlib import contextmanager
+from functools import wraps
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds (seconds) of the stage duration histogram buckets
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+# Set to a file path to append every finished trace there as one JSON line
+LOG_PATH = os.environ.get("TASKTAMER_METRICS_LOG")
+
+STAGE_SECONDS = "tasktamer_stage_seconds"
+STAGE_ERRORS = "tasktamer_stage_errors_total"
+REQUESTS = "tasktamer_requests_total"
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _labels(labels: Dict[str, Any]) -> LabelKey:
+    return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+
+def _format_labels(key: LabelKey, extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(key) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    escaped = (value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, value in pairs)
+    return "{" + ",".join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + "}"
+
+
+class _Histogram:
+    def __init__(self):
+        self.buckets = [0] * len(BUCKETS)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.count += 1
+        self.sum += value
+        for index, bound in enumerate(BUCKETS):
+            if value <= bound:
+                self.buckets[index] += 1
+                break
+
+
+class Metrics:
+    """Process-wide counters and histograms, exportable in Prometheus text format."""
+
+    def __init__(self):
+        self._counters: Dict[str, Dict[LabelKey, float]] = {}
+        self._histograms: Dict[str, Dict[LabelKey, _Histogram]] = {}
+        self._lock = threading.Lock()
+
+    def increment(self, name: str, value: float = 1.0, **labels) -> None:
+        key = _labels(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0.0) + value
+
+    def observe(self, name: str, value: float, **labels) -> None:
+        key = _labels(labels)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = _Histogram()
+            histogram.observe(value)
+
+    def prometheus(self) -> str:
+        """All metrics in the Prometheus text exposition format."""
+        lines: List[str] = []
+        with self._lock:
+            for name, series in sorted(self._counters.items()):
+                lines.append(f"# TYPE {name} counter")
+                for key, value in sorted(series.items()):
+                    lines.append(f"{name}{_format_labels(key)} {value:g}")
+            for name, series in sorted(self._histograms.items()):
+                lines.append(f"# TYPE {name} histogram")
+                for key, histogram in sorted(series.items()):
+                    cumulative = 0
+                    for bound, count in zip(BUCKETS, histogram.buckets):
+                        cumulative += count
+                        lines.append(f"{name}_bucket{_format_labels(key, ('le', f'{bound:g}'))} {cumulative}")
+                    lines.append(f"{name}_bucket{_format_labels(key, ('le', '+Inf'))} {histogram.count}")
+                    lines.append(f"{name}_sum{_format_labels(key)} {histogram.sum:.6f}")
+                    lines.append(f"{name}_count{_format_labels(key)} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Counters and histogram count/sum per series, as plain JSON-serializable data."""
+        with self._lock:
+            return {
+                "counters": {
+                    name: [{"labels": dict(key), "value": value} for key, value in series.items()]
+                    for name, series in self._counters.items()
+                },
+                "histograms": {
+                    name: [{"labels": dict(key), "count": h.count, "sum": round(h.sum, 6)} for key, h in series.items()]
+                    for name, series in self._histograms.items()
+                },
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+
+class Trace:
+    """Timing breakdown of one request: every span opened while it was active, in start order."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.started_at = time.time()
+        self._start = time.perf_counter()
+        self.duration_ms: Optional[float] = None
+        self.spans: List[Dict[str, Any]] = []
+        self._depth = 0
+        self._lock = threading.Lock()
+
+    def _open(self, name: str, start: float) -> Dict[str, Any]:
+        with self._lock:
+            entry = {"name": name, "depth": self._depth, "start_ms": round((start - self._start) * 1000, 3)}
+            self.spans.append(entry)
+            self._depth += 1
+        return entry
+
+    def _close(self, entry: Dict[str, Any], duration: float, error: bool) -> None:
+        with self._lock:
+            entry["duration_ms"] = round(duration * 1000, 3)
+            if error:
+                entry["error"] = True
+            self._depth -= 1
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "name": self.name,
+                "started_at": self.started_at,
+                "duration_ms": self.duration_ms,
+                "spans": [dict(entry) for entry in self.spans],
+            }
+
+
+metrics = Metrics()
+
+_current_trace: "contextvars.ContextVar[Optional[Trace]]" = contextvars.ContextVar("tasktamer_trace", default=None)
+_last_trace: Optional[Trace] = None
+
+
+@contextmanager
+def span(name: str, **labels) -> Iterator[None]:
+    """
+    Time a stage: records it in the stage histogram and, inside a trace, in that trace's breakdown.
+
+    Args:
+        name: Stage name, e.g. "summarize.rank"
+        **labels: Extra histogram labels; keep their cardinality low
+    """
+    trace_obj = _current_trace.get()
+    start = time.perf_counter()
+    entry = trace_obj._open(name, start) if trace_obj is not None else None
+    error = False
+    try:
+        yield
+    except BaseException:
+        error = True
+        raise
+    finally:
+        duration = time.perf_counter() - start
+        metrics.observe(STAGE_SECONDS, duration, stage=name, **labels)
+        if error:
+            metrics.increment(STAGE_ERRORS, stage=name)
+        if entry is not None:
+            trace_obj._close(entry, duration, error)
+
+
+@contextmanager
+def trace(name: str) -> Iterator[Trace]:
+    """
+    Collect the spans of one request. Nested calls join the trace already active.
+    Finished traces become last_trace() and are appended to TASKTAMER_METRICS_LOG if set.
+    """
+    global _last_trace
+    active = _current_trace.get()
+    if active is not None:
+        with span(name):
+            yield active
+        return
+
+    trace_obj = Trace(name)
+    token = _current_trace.set(trace_obj)
+    try:
+        with span(name):
+            yield trace_obj
+    finally:
+        _current_trace.reset(token)
+        trace_obj.duration_ms = round((time.perf_counter() - trace_obj._start) * 1000, 3)
+        _last_trace = trace_obj
+        metrics.increment(REQUESTS, operation=name)
+        if LOG_PATH:
+            _write_log(trace_obj)
+
+
+def traced(name: str) -> Callable:
+    """Decorator running each call of a function inside trace(name)."""
+    def decorator(func: Callable) -> Callable:
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with trace(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def _write_log(trace_obj: Trace) -> None:
+    try:
+        with open(LOG_PATH, "a", encoding="utf-8") as f:
+            f.write(json.dumps(trace_obj.to_dict()) + "\n")
+    except OSError as e:
+        logger.error(f"Error writing metrics log: {str(e)}")
+
+
+def last_trace() -> Optional[Dict[str, Any]]:
+    """The most recently finished trace in this process, if any."""
+    return _last_trace.to_dict() if _last_trace is not None else None
+
+
+def increment(name: str, value: float = 1.0, **labels) -> None:
+    metrics.increment(name, value, **labels)
+
+
+def observe(name: str, value: float, **labels) -> None:
+    metrics.observe(name, value, **labels)
+
+
+def prometheus() -> str:
+    return metrics.prometheus()
+
+
+def snapshot() -> Dict[str, Any]:
+    return metrics.snapshot()
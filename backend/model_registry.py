@@ -0,0 +1,326 @@
+import os
+import threading
+import time
+import logging
+import importlib.util
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from backend import metrics
+from backend.content_cache import CACHE_DIR
+
+logger = logging.getLogger(__name__)
+
+# Registry key: (task, model name, device, dtype, backend)
+ModelKey = Tuple[str, str, Optional[str], Optional[str], str]
+
+# Inference backends for CPU hosts:
+#   pytorch - the transformers pipeline as-is (fp32)
+#   int8    - PyTorch with linear layers dynamically quantized to int8
+#   onnx    - ONNX Runtime graph with KV-cache, exported once (needs optimum[onnxruntime])
+BACKENDS = ("pytorch", "int8", "onnx")
+INFERENCE_BACKEND = os.environ.get("TASKTAMER_INFERENCE_BACKEND", "pytorch")
+# Exported ONNX graphs are kept here so the export only happens once per model
+ONNX_DIR = os.environ.get("TASKTAMER_ONNX_DIR", os.path.join(CACHE_DIR, "onnx"))
+
+# Local model snapshots written by `python -m backend.provision`; models found here
+# are loaded from disk instead of being resolved through the Hugging Face hub
+MODEL_DIR = os.environ.get("TASKTAMER_MODEL_DIR", os.path.join(CACHE_DIR, "models"))
+# Strict offline mode: never contact the hub, and fail fast on unprovisioned models
+OFFLINE = os.environ.get("TASKTAMER_OFFLINE", "0") == "1"
+
+if OFFLINE:
+    # Read by huggingface_hub/transformers at import time, so set before either is imported
+    os.environ.setdefault("HF_HUB_OFFLINE", "1")
+    os.environ.setdefault("TRANSFORMERS_OFFLINE", "1")
+
+
+class ModelNotProvisioned(RuntimeError):
+    """Raised in offline mode when a model has no local snapshot."""
+
+
+def model_path(model: str, model_dir: Optional[str] = None) -> str:
+    """Directory a model's provisioned snapshot lives in."""
+    return os.path.join(model_dir or MODEL_DIR, model.replace("/", "--"))
+
+
+def resolve_model(model: str) -> str:
+    """
+    Local path to load a model from, or the hub name when no snapshot exists.
+
+    Raises:
+        ModelNotProvisioned in offline mode when the model has not been provisioned
+    """
+    if os.path.isdir(model):
+        return model
+    path = model_path(model)
+    if os.path.isfile(os.path.join(path, "config.json")):
+        return path
+    if OFFLINE:
+        raise ModelNotProvisioned(
+            f"Model '{model}' is not provisioned in {MODEL_DIR}; run: python -m backend.provision {model}"
+        )
+    return model
+
+
+@lru_cache(maxsize=None)
+def transformers_available() -> bool:
+    """
+    Check whether transformers is installed without importing it.
+    The import itself (and torch with it) is deferred until a model is actually loaded.
+    """
+    available = importlib.util.find_spec("transformers") is not None
+    if available:
+        logger.info("Advanced models are available")
+    else:
+        logger.info("Advanced models not available, using base functionality")
+    return available
+
+
+class ModelRegistry:
+    """
+    Process-wide cache of loaded transformers pipelines.
+    Each (task, model, device, dtype) combination is loaded once and shared
+    by every caller in the process.
+    """
+
+    def __init__(self):
+        self._models: Dict[ModelKey, Any] = {}
+        self._key_locks: Dict[ModelKey, threading.Lock] = {}
+        self._lock = threading.Lock()
+        self._stats: Dict[ModelKey, Dict[str, float]] = {}
+        self._listeners: List[Callable[[str, ModelKey], None]] = []
+
+    def add_listener(self, callback: Callable[[str, ModelKey], None]) -> None:
+        """
+        Register callback(event, key), called when a model is loaded again after
+        its first load ("reload") or dropped ("evict"), e.g. to invalidate results it produced.
+        """
+        with self._lock:
+            self._listeners.append(callback)
+
+    def _notify(self, event: str, key: ModelKey) -> None:
+        with self._lock:
+            listeners = list(self._listeners)
+        for callback in listeners:
+            try:
+                callback(event, key)
+            except Exception as e:
+                logger.error(f"Error in model registry listener: {str(e)}")
+
+    def _key(self, task: str, model: str, device: Optional[str], dtype: Optional[str],
+             backend: Optional[str]) -> ModelKey:
+        return (task, model, device, dtype, backend or INFERENCE_BACKEND)
+
+    def _load(self, task: str, model: str, device: Optional[str], dtype: Optional[str], backend: str) -> Tuple[Any, str]:
+        """Load a pipeline on the requested backend, falling back to plain PyTorch if that fails."""
+        model = resolve_model(model)
+        if backend not in BACKENDS:
+            logger.error(f"Unknown inference backend '{backend}', using pytorch. Choose from: {', '.join(BACKENDS)}")
+        elif backend == "int8":
+            try:
+                return _load_int8(task, model), backend
+            except Exception as e:
+                logger.error(f"Error loading int8 model '{model}', using pytorch: {str(e)}")
+        elif backend == "onnx":
+            try:
+                return _load_onnx(task, model), backend
+            except Exception as e:
+                logger.error(f"Error loading ONNX model '{model}', using pytorch: {str(e)}")
+
+        from transformers import pipeline
+
+        kwargs: Dict[str, Any] = {"model": model}
+        if device is not None:
+            kwargs["device"] = device
+        if dtype is not None:
+            kwargs["torch_dtype"] = dtype
+        return pipeline(task, **kwargs), "pytorch"
+
+    def get(self, task: str, model: str, device: Optional[str] = None, dtype: Optional[str] = None,
+            backend: Optional[str] = None) -> Any:
+        """
+        Return the shared pipeline for the given configuration, loading it on first use.
+
+        Args:
+            task: Pipeline task name, e.g. "text-generation"
+            model: Model name or local path
+            device: Optional device spec passed to the pipeline ("cpu", "cuda:0", ...)
+            dtype: Optional torch dtype name ("float32", "float16", ...)
+            backend: One of BACKENDS; defaults to TASKTAMER_INFERENCE_BACKEND
+
+        Returns:
+            The loaded pipeline
+        """
+        key = self._key(task, model, device, dtype, backend)
+
+        model_obj = self._models.get(key)
+        if model_obj is not None:
+            with self._lock:
+                self._stats[key]["hits"] += 1
+            return model_obj
+
+        # Per-key lock so concurrent first callers load the model only once,
+        # without blocking lookups of other models in the meantime.
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        with key_lock:
+            model_obj = self._models.get(key)
+            if model_obj is not None:
+                with self._lock:
+                    self._stats[key]["hits"] += 1
+                return model_obj
+
+            start = time.perf_counter()
+            with metrics.span("model_load"):
+                model_obj, loaded_backend = self._load(task, model, device, dtype, key[4])
+            load_seconds = time.perf_counter() - start
+            logger.info(f"Loaded {task} model '{model}' ({loaded_backend}) in {load_seconds:.2f}s")
+
+            with self._lock:
+                self._models[key] = model_obj
+                loads = self._stats.get(key, {}).get("loads", 0) + 1
+                self._stats[key] = {"hits": 0, "loads": loads,
+                                    "load_seconds": load_seconds, "loaded_backend": loaded_backend}
+            if loads > 1:
+                self._notify("reload", key)
+            return model_obj
+
+    def loaded_backend(self, task: str, model: str, device: Optional[str] = None, dtype: Optional[str] = None,
+                       backend: Optional[str] = None) -> Optional[str]:
+        """Backend the model actually loaded on (after any fallback), or None if it is not loaded."""
+        key = self._key(task, model, device, dtype, backend)
+        with self._lock:
+            if key not in self._models:
+                return None
+            return self._stats[key]["loaded_backend"]
+
+    def warm(self, specs: List[Dict[str, Any]]) -> None:
+        """
+        Preload a list of models, e.g. at server boot.
+
+        Args:
+            specs: List of dicts with "task" and "model" keys and optional "device"/"dtype"/"backend"
+        """
+        for spec in specs:
+            try:
+                self.get(spec["task"], spec["model"], spec.get("device"), spec.get("dtype"), spec.get("backend"))
+            except Exception as e:
+                logger.error(f"Error warming model {spec.get('model')}: {str(e)}")
+
+    def evict(self, task: Optional[str] = None, model: Optional[str] = None) -> int:
+        """
+        Drop loaded models so their memory can be reclaimed.
+        With no arguments every model is evicted.
+
+        Returns:
+            Number of models evicted
+        """
+        with self._lock:
+            keys = [key for key in self._models
+                    if (task is None or key[0] == task) and (model is None or key[1] == model)]
+            for key in keys:
+                del self._models[key]
+        if keys:
+            logger.info(f"Evicted {len(keys)} model(s) from registry")
+        for key in keys:
+            self._notify("evict", key)
+        return len(keys)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return load and hit statistics for each known model."""
+        with self._lock:
+            return {
+                "loaded": len(self._models),
+                "models": [
+                    {
+                        "task": key[0],
+                        "model": key[1],
+                        "device": key[2],
+                        "dtype": key[3],
+                        "backend": key[4],
+                        "loaded": key in self._models,
+                        **values,
+                    }
+                    for key, values in self._stats.items()
+                ],
+            }
+
+
+def _quantize_int8(model: Any) -> Any:
+    """
+    Dynamically quantize a model's linear layers to int8.
+    GPT-2 implements its projections as transformers' Conv1D (a transposed linear
+    layer) which quantize_dynamic does not recognise, so those are first swapped
+    for equivalent nn.Linear modules.
+    """
+    import torch
+    from transformers.pytorch_utils import Conv1D
+
+    for parent in list(model.modules()):
+        for name, child in list(parent.named_children()):
+            if isinstance(child, Conv1D):
+                in_features, out_features = child.weight.shape
+                linear = torch.nn.Linear(in_features, out_features)
+                linear.weight = torch.nn.Parameter(child.weight.detach().t().contiguous())
+                linear.bias = torch.nn.Parameter(child.bias.detach().clone())
+                setattr(parent, name, linear)
+
+    return torch.quantization.quantize_dynamic(model.eval(), {torch.nn.Linear}, dtype=torch.qint8)
+
+
+def _load_int8(task: str, model: str) -> Any:
+    from transformers import pipeline
+
+    generator = pipeline(task, model=model, device="cpu")
+    generator.model = _quantize_int8(generator.model)
+    return generator
+
+
+def _load_onnx(task: str, model: str) -> Any:
+    from optimum.onnxruntime import ORTModelForCausalLM
+    from transformers import AutoTokenizer, pipeline
+
+    export_dir = os.path.join(ONNX_DIR, os.path.basename(os.path.normpath(model)) if os.path.isdir(model)
+                              else model.replace("/", "--"))
+    if os.path.isdir(export_dir):
+        ort_model = ORTModelForCausalLM.from_pretrained(export_dir, use_cache=True)
+        tokenizer = AutoTokenizer.from_pretrained(export_dir)
+    else:
+        logger.info(f"Exporting '{model}' to ONNX in {export_dir}")
+        ort_model = ORTModelForCausalLM.from_pretrained(model, export=True, use_cache=True)
+        tokenizer = AutoTokenizer.from_pretrained(model)
+        ort_model.save_pretrained(export_dir)
+        tokenizer.save_pretrained(export_dir)
+    return pipeline(task, model=ort_model, tokenizer=tokenizer)
+
+
+# Shared registry for the whole process
+registry = ModelRegistry()
+
+
+def get_pipeline(task: str, model: str, device: Optional[str] = None, dtype: Optional[str] = None,
+                 backend: Optional[str] = None) -> Any:
+    return registry.get(task, model, device, dtype, backend)
+
+
+def loaded_backend(task: str, model: str, device: Optional[str] = None, dtype: Optional[str] = None,
+                   backend: Optional[str] = None) -> Optional[str]:
+    return registry.loaded_backend(task, model, device, dtype, backend)
+
+
+def add_listener(callback: Callable[[str, ModelKey], None]) -> None:
+    registry.add_listener(callback)
+
+
+def warm(specs: List[Dict[str, Any]]) -> None:
+    registry.warm(specs)
+
+
+def evict(task: Optional[str] = None, model: Optional[str] = None) -> int:
+    return registry.evict(task, model)
+
+
+def stats() -> Dict[str, Any]:
+    return registry.stats()
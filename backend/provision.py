@@ -0,0 +1,153 @@
+"""
+Provision model snapshots for offline nodes and check how fast they load.
+
+    python -m backend.provision                  # download every model the app uses
+    python -m backend.provision gpt2 --revision <commit>
+    python -m backend.provision --check          # load each model from disk and report timings
+
+Snapshots go to TASKTAMER_MODEL_DIR (default ~/.cache/tasktamer/models); run the
+app with TASKTAMER_OFFLINE=1 to load only from there and never contact the hub.
+"""
+import os
+import sys
+import json
+import time
+import logging
+import argparse
+from typing import Any, Dict, List, Optional
+
+from backend.memoize import invalidate
+from backend.model_registry import MODEL_DIR, ModelRegistry, model_path
+
+logger = logging.getLogger(__name__)
+
+# Recorded next to each snapshot: source repository, pinned commit and file list
+MANIFEST_NAME = "tasktamer_manifest.json"
+
+# Configuration, tokenizer and generation settings; weights are chosen per repository
+CONFIG_PATTERNS = ["config.json", "generation_config.json", "tokenizer*", "vocab.*", "merges.txt",
+                   "special_tokens_map.json", "*.model"]
+
+
+def required_models() -> List[Dict[str, str]]:
+    """Models the application loads, as (task, model) specs."""
+    from backend.task_breakdown import GENERATION_TASK, GENERATION_MODEL
+
+    return [{"task": GENERATION_TASK, "model": GENERATION_MODEL}]
+
+
+def _weight_patterns(files: List[str]) -> List[str]:
+    # Prefer safetensors; only fall back to pickled PyTorch weights when a repo has none
+    if any(name.endswith(".safetensors") and "/" not in name for name in files):
+        return ["*.safetensors", "*.safetensors.index.json"]
+    return ["pytorch_model*.bin", "pytorch_model.bin.index.json"]
+
+
+def provision(model: str, revision: Optional[str] = None, model_dir: str = MODEL_DIR) -> Dict[str, Any]:
+    """
+    Download a model's weights and tokenizer into a local directory, pinned to one commit.
+
+    Args:
+        model: Hub repository id, e.g. "gpt2"
+        revision: Branch, tag or commit; resolved to a commit hash before downloading
+        model_dir: Root directory for snapshots
+
+    Returns:
+        The manifest written next to the snapshot
+    """
+    from huggingface_hub import HfApi, snapshot_download
+
+    info = HfApi().model_info(model, revision=revision)
+    files = [sibling.rfilename for sibling in info.siblings or []]
+    target = model_path(model, model_dir)
+
+    start = time.perf_counter()
+    snapshot_download(
+        repo_id=model,
+        revision=info.sha,
+        local_dir=target,
+        allow_patterns=CONFIG_PATTERNS + _weight_patterns(files),
+    )
+
+    downloaded = sorted(
+        os.path.relpath(os.path.join(root, name), target)
+        for root, _, names in os.walk(target)
+        for name in names
+        if not root.startswith(os.path.join(target, ".cache"))
+    )
+    manifest = {
+        "model": model,
+        "revision": info.sha,
+        "files": downloaded,
+        "provisioned_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "download_seconds": round(time.perf_counter() - start, 2),
+    }
+    with open(os.path.join(target, MANIFEST_NAME), "w") as f:
+        json.dump(manifest, f, indent=2)
+    # Results memoized on disk by other processes came from the previous snapshot
+    invalidate()
+    logger.info(f"Provisioned '{model}' at {info.sha} in {target}")
+    return manifest
+
+
+def check(specs: Optional[List[Dict[str, str]]] = None, model_dir: str = MODEL_DIR) -> List[Dict[str, Any]]:
+    """
+    Load each model from its local snapshot and report whether it is provisioned and how long it took.
+    Uses a private registry so the check does not keep models in memory.
+    """
+    results = []
+    for spec in specs or required_models():
+        path = model_path(spec["model"], model_dir)
+        manifest_file = os.path.join(path, MANIFEST_NAME)
+        result: Dict[str, Any] = {"model": spec["model"], "path": path, "provisioned": os.path.isfile(manifest_file)}
+        if not result["provisioned"]:
+            result["error"] = f"not provisioned; run: python -m backend.provision {spec['model']}"
+            results.append(result)
+            continue
+        with open(manifest_file) as f:
+            result["revision"] = json.load(f).get("revision")
+
+        registry = ModelRegistry()
+        try:
+            registry.get(spec["task"], path)
+            model_stats = registry.stats()["models"][0]
+            result["load_seconds"] = round(model_stats["load_seconds"], 2)
+            result["backend"] = model_stats["loaded_backend"]
+        except Exception as e:
+            result["error"] = str(e)
+        results.append(result)
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("models", nargs="*", help="Hub model ids (default: every model the app uses)")
+    parser.add_argument("--revision", help="Branch, tag or commit to pin (default: main)")
+    parser.add_argument("--dir", default=MODEL_DIR, help=f"Snapshot directory (default: {MODEL_DIR})")
+    parser.add_argument("--check", action="store_true", help="Load provisioned models and report load times")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    specs = required_models()
+    if args.models:
+        task = specs[0]["task"]
+        specs = [{"task": task, "model": model} for model in args.models]
+
+    if args.check:
+        results = check(specs, args.dir)
+        print(json.dumps(results, indent=2))
+        return 0 if all(r["provisioned"] and "error" not in r for r in results) else 1
+
+    for spec in specs:
+        try:
+            manifest = provision(spec["model"], args.revision, args.dir)
+            print(f"{spec['model']}: {manifest['revision']} ({len(manifest['files'])} files) -> "
+                  f"{model_path(spec['model'], args.dir)}")
+        except Exception as e:
+            logger.error(f"Error provisioning '{spec['model']}': {str(e)}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
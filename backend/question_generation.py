@@ -1,36 +1,149 @@
-import re
 import random
-from typing import List, Dict, Any
+from typing import Iterator, List, Dict, Any, Optional, Tuple
 from backend.summarization import process_url
+from backend.document import Document, analyze, content_hash
+from backend.quiz_selection import MIN_WORDS, best_blank, rank_blanks, spread_blanks, tag_sentences, term_salience
+from backend import metrics
+from backend.memoize import memoize
+from backend.distractors import get_distractor_index
 
-def generate_quiz(content: str = None, url: str = None, num_questions: int = 3) -> List[Dict[str, Any]]:
+# Bump when quiz generation changes so memoized quizzes are recomputed
+QUIZ_VERSION = "5"
+# Largest quiz the UI and API offer (exam prep from long documents)
+MAX_QUESTIONS = 200
+# Questions whose distractors iter_quiz looks up together
+DISTRACTOR_BATCH = 32
+
+def _quiz_version() -> str:
+    """Quizzes built with and without the embedding index differ, so both are part of the key."""
+    return f"{QUIZ_VERSION}:{'embeddings' if get_distractor_index() else 'static'}"
+
+@metrics.traced("generate_quiz")
+def generate_quiz(content: str = None, url: str = None, num_questions: int = 3,
+                  refresh: bool = False) -> List[Dict[str, Any]]:
+    """
+    Fill-in-the-blank questions from text or a web page.
+    
+    Questions are spread across the document's sections (large quizzes, up to
+    MAX_QUESTIONS, cover all of it), no sentence or answer is used twice, and
+    they are returned in reading order.
+    
+    Pages are resolved through the content cache before the memo is consulted,
+    and quizzes are memoized on the text itself, so an edited page gets new questions.
+    
+    Args:
+        content: Text to build questions from
+        url: URL to fetch instead of content
+        num_questions: Maximum number of questions
+        refresh: Build a new quiz (new option order and distractors) instead of
+                 returning the memoized one
+    """
     if url:
         content = process_url(url)
         
     if not content or num_questions <= 0:
         return []
     
-    # Split content into sentences
-    sentences = re.split(r'(?<=[.!?])\s+', content)
-    sentences = [s for s in sentences if len(s.split()) >= 6]  # Filter short sentences
+    return _quiz_for_text(content, num_questions, refresh=refresh)
+
+def _quiz_key(content: str, num_questions: int) -> list:
+    return [content_hash(content), num_questions]
+
+@memoize("generate_quiz", version=_quiz_version, key=_quiz_key, should_cache=bool)
+def _quiz_for_text(content: str, num_questions: int) -> List[Dict[str, Any]]:
+    # Sentence and word offsets, shared with summarize_content for the same text
+    with metrics.span("quiz.split"):
+        document = analyze(content)
     
-    if len(sentences) < num_questions:
-        return []
+    # Pick every blank first so all distractors come from one batched lookup;
+    # spread_blanks picks in rounds across sections, so restore reading order
+    with metrics.span("quiz.blanks"):
+        blanks = sorted(_iter_blanks(document, num_questions), key=lambda blank: (blank[0], blank[2]))
+    
+    return _questions(blanks)
+
+def iter_quiz(content: str = None, url: str = None, num_questions: int = 50,
+              batch_size: int = DISTRACTOR_BATCH) -> Iterator[Dict[str, Any]]:
+    """
+    Generate a large quiz (e.g. 50-200 questions for exam prep) lazily.
+    
+    Uses the same selection as generate_quiz, but yields questions in the order
+    they are picked (the best question of every section first, then the next
+    round) instead of reading order, since sorting would need all of them.
+    Distractors are looked up batch_size questions at a time, so the first
+    questions arrive before the rest have been built. Not memoized.
+    
+    Args:
+        content: Text to build questions from
+        url: URL to fetch instead of content
+        num_questions: Maximum number of questions
+        batch_size: Questions whose distractors are looked up together
+        
+    Yields:
+        Questions as generate_quiz returns them; fewer than num_questions when the
+        text has too few usable sentences
+    """
+    if url:
+        content = process_url(url)
+    
+    if not content or num_questions <= 0:
+        return
+    
+    batch = []
+    for blank in _iter_blanks(analyze(content), num_questions):
+        batch.append(blank)
+        if len(batch) >= max(1, batch_size):
+            yield from _questions(batch)
+            batch = []
+    if batch:
+        yield from _questions(batch)
+
+def _iter_blanks(document: Document, num_questions: int) -> Iterator[Tuple[int, List[str], int, str, Optional[str]]]:
+    """
+    Blanks for up to num_questions questions, each sentence and answer used once.
+    
+    Yields:
+        (sentence index, words, word index, word, part of speech); the part of
+        speech is None when blanks have to be chosen at random
+    """
+    ranked = rank_blanks(document)
+    if ranked is not None:
+        for blank in spread_blanks(document, ranked, num_questions):
+            yield blank.sentence, document.words(blank.sentence), blank.word_index, blank.word, blank.pos
+        return
     
-    # Choose random sentences for questions
-    selected_sentences = random.sample(sentences, min(num_questions * 2, len(sentences)))
+    # No salience scores without scikit-learn: random sentences and words
+    sentences = [i for i, count in enumerate(document.word_counts()) if count >= MIN_WORDS]
+    answers = set()
+    used_sentences = set()
+    produced = 0
+    for i in random.sample(sentences, len(sentences)):
+        blank = _choose_blank(document.words(i))
+        sentence = document.sentence(i).strip()
+        if not blank or blank[2].lower() in answers or sentence in used_sentences:
+            continue
+        answers.add(blank[2].lower())
+        used_sentences.add(sentence)
+        yield (i,) + blank + (None,)
+        produced += 1
+        if produced == num_questions:
+            return
+
+def _questions(blanks: List[Tuple[int, List[str], int, str, Optional[str]]]) -> List[Dict[str, Any]]:
+    with metrics.span("quiz.distractors"):
+        options = generate_incorrect_options_batch([correct_word for _, _, _, correct_word, _ in blanks],
+                                                   [pos for _, _, _, _, pos in blanks])
     
     quiz = []
-    for i, sentence in enumerate(selected_sentences[:num_questions]):
-        question_data = create_question_from_sentence(sentence, i)
-        if question_data:
-            quiz.append(question_data)
+    with metrics.span("quiz.questions"):
+        for (_, words, word_index, correct_word, _), incorrect_options in zip(blanks, options):
+            quiz.append(_build_question(words, word_index, correct_word, incorrect_options))
     
     return quiz
 
-def create_question_from_sentence(sentence: str, index: int) -> Dict[str, Any]:
-    words = sentence.split()
-    if len(words) < 6:
+def _choose_blank(words: List[str]) -> Optional[Tuple[List[str], int, str]]:
+    """Pick a random word of a sentence to blank out; returns (words, index, word) or None."""
+    if len(words) < MIN_WORDS:
         return None
     
     # Identify potential keywords to blank out
@@ -44,10 +157,29 @@ def create_question_from_sentence(sentence: str, index: int) -> Dict[str, Any]:
     
     # Select a random word to blank out
     word_index, correct_word = random.choice(nouns_and_verbs)
+    return words, word_index, correct_word
+
+def create_question_from_sentence(sentence: str, index: int) -> Dict[str, Any]:
+    words = sentence.split()
+    if len(words) < MIN_WORDS:
+        return None
     
-    # Create incorrect options
-    incorrect_options = generate_incorrect_options(correct_word)
+    salience = term_salience([sentence])
+    if salience is None:
+        blank = _choose_blank(words)
+        if not blank:
+            return None
+        _, word_index, correct_word = blank
+        pos = None
+    else:
+        best = best_blank(words, tag_sentences([words])[0], salience)
+        if not best:
+            return None
+        word_index, correct_word, pos = best.word_index, best.word, best.pos
     
+    return _build_question(words, word_index, correct_word, generate_incorrect_options(correct_word, pos))
+
+def _build_question(words: List[str], word_index: int, correct_word: str, incorrect_options: List[str]) -> Dict[str, Any]:
     # Create the question
     question_text = " ".join(words[:word_index] + ["_____"] + words[word_index+1:])
     
@@ -61,7 +193,24 @@ def create_question_from_sentence(sentence: str, index: int) -> Dict[str, Any]:
         "answer": correct_word
     }
 
-def generate_incorrect_options(correct_word: str) -> List[str]:
+def generate_incorrect_options(correct_word: str, pos: Optional[str] = None) -> List[str]:
+    return generate_incorrect_options_batch([correct_word], [pos])[0]
+
+def generate_incorrect_options_batch(correct_words: List[str], pos: Optional[List[Optional[str]]] = None) -> List[List[str]]:
+    """
+    Incorrect options for several answers at once.
+    
+    Nearest neighbours with the same part of speech (as tagged in the sentence
+    when `pos` is given, else the word's usual one) come from the embedding
+    index in one batched query; words it does not know (or every word, when no
+    index has been built) get the static lists.
+    """
+    index = get_distractor_index()
+    neighbours = (index.distractors(correct_words, pos=pos) if index and correct_words
+                  else [None] * len(correct_words))
+    return [options or _static_incorrect_options(word) for word, options in zip(correct_words, neighbours)]
+
+def _static_incorrect_options(correct_word: str) -> List[str]:
     # Generate incorrect options that are different from the correct word
     if len(correct_word) <= 3:
         base_options = ["Small", "Large", "Quick", "Slow", "Good", "Nice", "Bad", "Old", "New"]
@@ -0,0 +1,212 @@
+"""
+Choosing which sentences become quiz questions and which word each one blanks out.
+
+Candidate blanks are scored once per Document and the ranking is cached on it:
+
+    score = salience(word) * POS_WEIGHTS[part of speech]
+
+Salience is TF-IDF with the document's sentences as the collection, so terms the
+text keeps returning to outrank both filler and one-off words. Parts of speech
+come from nltk's tagger, run once over every candidate sentence in a single
+batched call so each word is tagged in its context. Without the tagger data,
+parts of speech are guessed from suffixes; without scikit-learn, there is no
+ranking and callers fall back to random choice.
+"""
+import logging
+import threading
+from typing import Callable, Dict, Iterator, List, NamedTuple, Optional, Sequence, Set, Tuple
+
+from backend.distractors import coarse_pos, guess_pos
+from backend.document import Document
+
+logger = logging.getLogger(__name__)
+
+# Sentences shorter than this make poor questions
+MIN_WORDS = 6
+# Shorter words are rarely worth asking about
+MIN_WORD_CHARS = 4
+# Blanks kept per sentence, so a sentence whose best answer is used elsewhere can still be asked
+BLANKS_PER_SENTENCE = 3
+POS_WEIGHTS = {"NOUN": 1.0, "VERB": 0.7, "ADJ": 0.6, "ADV": 0.2, "OTHER": 0.1}
+# Same word shapes as blank candidates (alphabetic, MIN_WORD_CHARS or longer)
+TERM_PATTERN = r"(?u)\b[^\W\d_]{4,}\b"
+
+
+class Blank(NamedTuple):
+    sentence: int
+    word_index: int
+    word: str
+    pos: str
+    score: float
+
+
+Tagger = Callable[[List[List[str]]], List[List[Tuple[str, str]]]]
+
+_tagger: Optional[Tagger] = None
+_tagger_loaded = False
+_tagger_lock = threading.Lock()
+
+
+def get_tagger() -> Optional[Tagger]:
+    """nltk's batched POS tagger, loaded on first use; None when nltk or its tagger data is missing."""
+    global _tagger, _tagger_loaded
+    if not _tagger_loaded:
+        with _tagger_lock:
+            if not _tagger_loaded:
+                try:
+                    import nltk
+
+                    # Loads the model now, and raises LookupError if its data was never downloaded
+                    nltk.pos_tag(["warm", "up"])
+                    _tagger = nltk.pos_tag_sents
+                except (ImportError, LookupError) as e:
+                    logger.info(f"nltk tagger unavailable ({type(e).__name__}), guessing POS from suffixes")
+                _tagger_loaded = True
+    return _tagger
+
+
+def tag_sentences(word_lists: List[List[str]]) -> List[List[str]]:
+    """Coarse part of speech (see distractors.POS_TAGS) of every word, from one tagger call."""
+    tagger = get_tagger()
+    if tagger is not None and word_lists:
+        try:
+            return [[coarse_pos(tag) for _, tag in tagged] for tagged in tagger(word_lists)]
+        except LookupError as e:
+            logger.error(f"Error tagging sentences: {type(e).__name__}")
+
+    # Guesses ignore context, so each distinct word is guessed once
+    guesses: Dict[str, str] = {}
+    return [[guesses.get(word) or guesses.setdefault(word, guess_pos(word)) for word in words]
+            for words in word_lists]
+
+
+def term_salience(sentences: Sequence[str]) -> Optional[Dict[str, float]]:
+    """
+    TF-IDF weight of each lowercase term, treating sentences as the documents.
+
+    Returns:
+        term -> salience (English stop words excluded), or None without scikit-learn
+    """
+    try:
+        import numpy as np
+        from sklearn.feature_extraction.text import CountVectorizer
+    except ImportError:
+        return None
+
+    vectorizer = CountVectorizer(stop_words="english", token_pattern=TERM_PATTERN)
+    try:
+        counts = vectorizer.fit_transform(sentences)
+    except ValueError:
+        # Nothing but stop words and short tokens
+        return {}
+    frequency = np.asarray(counts.sum(axis=0)).ravel()
+    spread = np.asarray((counts > 0).sum(axis=0)).ravel()
+    idf = np.log((1 + counts.shape[0]) / (1 + spread)) + 1
+    return dict(zip(vectorizer.get_feature_names_out().tolist(), (np.log1p(frequency) * idf).tolist()))
+
+
+def _candidates(words: List[str]) -> List[int]:
+    """Blankable positions: alphabetic words of MIN_WORD_CHARS+, not first or last in the sentence."""
+    return [i for i in range(1, len(words) - 1) if len(words[i]) >= MIN_WORD_CHARS and words[i].isalpha()]
+
+
+def _scored_blanks(words: List[str], tags: List[str], salience: Dict[str, float], sentence: int,
+                   candidates: List[int], limit: int) -> List[Blank]:
+    # Ties go to the earlier word
+    scored = sorted(((-salience.get(words[i].lower(), 0.0) * POS_WEIGHTS.get(tags[i], 0.0), i) for i in candidates))
+    return [Blank(sentence, i, words[i], tags[i], -score) for score, i in scored[:limit] if score < 0]
+
+
+def best_blank(words: List[str], tags: List[str], salience: Dict[str, float], sentence: int = 0) -> Optional[Blank]:
+    """Highest-scoring candidate of one sentence, or None if no candidate is salient."""
+    blanks = _scored_blanks(words, tags, salience, sentence, _candidates(words), 1)
+    return blanks[0] if blanks else None
+
+
+def _rank(document: Document) -> Optional[List[Blank]]:
+    salience = term_salience(document.sentences())
+    if salience is None:
+        return None
+
+    # Only sentences with a salient candidate are worth tagging
+    eligible: List[Tuple[int, List[int]]] = []
+    word_lists: List[List[str]] = []
+    for index, count in enumerate(document.word_counts()):
+        if count < MIN_WORDS:
+            continue
+        words = document.words(index)
+        candidates = [i for i in _candidates(words) if words[i].lower() in salience]
+        if candidates:
+            eligible.append((index, candidates))
+            word_lists.append(words)
+
+    blanks: List[Blank] = []
+    for (index, candidates), words, tags in zip(eligible, word_lists, tag_sentences(word_lists)):
+        blanks.extend(_scored_blanks(words, tags, salience, index, candidates, BLANKS_PER_SENTENCE))
+    return blanks
+
+
+def rank_blanks(document: Document) -> Optional[List[Blank]]:
+    """
+    The best BLANKS_PER_SENTENCE blanks of every usable sentence, with their scores, in document order.
+
+    Computed on the first call for a document and cached on it.
+
+    Returns:
+        Scored blanks, or None when scikit-learn is unavailable
+    """
+    return document.derived("quiz_blanks", _rank)
+
+
+def spread_blanks(document: Document, blanks: List[Blank], count: int) -> Iterator[Blank]:
+    """
+    Yield up to `count` blanks spread evenly over the document.
+
+    The document is cut into `count` sections of consecutive sentences. Each round
+    takes the best remaining blank of every section, in document order, until
+    enough blanks are found. Each sentence (including repeats of the same text),
+    each answer (ignoring case) and each question text is used once; a sentence
+    whose best answer is taken can still be asked with one of its other blanks.
+    Each blank is visited at most once, so after the per-section sorts the cost
+    is linear in the number of blanks.
+    """
+    if count <= 0 or not blanks:
+        return
+    sections = min(count, len(blanks))
+    buckets: List[List[Blank]] = [[] for _ in range(sections)]
+    for blank in blanks:
+        buckets[blank.sentence * sections // len(document)].append(blank)
+    for bucket in buckets:
+        bucket.sort(key=lambda blank: -blank.score)
+
+    answers: Set[str] = set()
+    sentences: Set[str] = set()
+    # Text around the blank: sentences that differ only in the blanked word would read identically
+    questions: Set[Tuple[str, str]] = set()
+    positions = [0] * sections
+    active = [section for section in range(sections) if buckets[section]]
+    produced = 0
+    while active:
+        for section in active:
+            bucket = buckets[section]
+            while positions[section] < len(bucket):
+                blank = bucket[positions[section]]
+                positions[section] += 1
+                answer = blank.word.lower()
+                sentence = document.sentence(blank.sentence).strip()
+                if answer in answers or sentence in sentences:
+                    continue
+                start, end = document.span(blank.sentence)
+                word_start, word_end = document.token_spans(blank.sentence)[blank.word_index]
+                question = (document.text[start:word_start].strip(), document.text[word_end:end].strip())
+                if question in questions:
+                    continue
+                answers.add(answer)
+                sentences.add(sentence)
+                questions.add(question)
+                yield blank
+                produced += 1
+                if produced == count:
+                    return
+                break
+        active = [section for section in active if positions[section] < len(buckets[section])]
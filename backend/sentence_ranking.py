@@ -0,0 +1,109 @@
+import logging
+from typing import List, Optional
+
+logger = logging.getLogger(__name__)
+
+# PageRank damping factor and convergence settings for TextRank
+DAMPING = 0.85
+MAX_ITERATIONS = 50
+TOLERANCE = 1e-6
+
+METHODS = ("textrank", "tfidf")
+
+
+def _tfidf_matrix(sentences: List[str]):
+    # scikit-learn is imported here so only summarization calls pay for it
+    from sklearn.feature_extraction.text import TfidfVectorizer
+
+    vectorizer = TfidfVectorizer(stop_words="english", sublinear_tf=True, norm="l2")
+    return vectorizer.fit_transform(sentences)
+
+
+def tfidf_centrality(matrix):
+    """
+    Cosine similarity of each sentence to the document centroid.
+    Since rows are L2-normalised this equals the sentence's mean similarity to
+    every other sentence, computed in O(nnz) instead of building the n x n matrix.
+    """
+    import numpy as np
+
+    centroid = np.asarray(matrix.mean(axis=0)).ravel()
+    return np.asarray(matrix @ centroid).ravel()
+
+
+def textrank(matrix, damping: float = DAMPING):
+    """
+    PageRank over the cosine similarity graph S = X X^T without materialising S.
+    Each power iteration computes S v as X (X^T v), so the cost per iteration is
+    O(nnz) and memory stays linear in document size.
+    """
+    import numpy as np
+
+    n = matrix.shape[0]
+    transposed = matrix.T.tocsr()
+    self_similarity = np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel()
+
+    def similarity_times(vector):
+        # S v with the diagonal (self-similarity) removed
+        return matrix @ (transposed @ vector) - self_similarity * vector
+
+    degree = similarity_times(np.ones(n))
+    # Sentences with no shared terms keep only the teleport probability
+    inverse_degree = np.divide(1.0, degree, out=np.zeros(n), where=degree > 1e-12)
+
+    scores = np.full(n, 1.0 / n)
+    for _ in range(MAX_ITERATIONS):
+        updated = (1 - damping) / n + damping * similarity_times(scores * inverse_degree)
+        if np.abs(updated - scores).sum() < TOLERANCE:
+            scores = updated
+            break
+        scores = updated
+    return scores
+
+
+def rank_sentences(sentences: List[str], method: str = "textrank") -> Optional[List[float]]:
+    """
+    Score sentences by how central they are to the document.
+
+    Args:
+        sentences: Sentences to score
+        method: "textrank" (graph centrality) or "tfidf" (similarity to the centroid)
+
+    Returns:
+        One score per sentence, or None if scoring is unavailable (scikit-learn
+        missing) or the text has no scorable terms
+    """
+    if method not in METHODS:
+        raise ValueError(f"Unknown ranking method '{method}'. Choose from: {', '.join(METHODS)}")
+
+    try:
+        matrix = _tfidf_matrix(sentences)
+    except ImportError:
+        logger.info("scikit-learn not available, falling back to positional summaries")
+        return None
+    except ValueError:
+        # Raised by the vectorizer when every sentence is empty or only stop words
+        return None
+
+    if method == "tfidf":
+        scores = tfidf_centrality(matrix)
+    else:
+        scores = textrank(matrix)
+    return scores.tolist()
+
+
+def top_sentences(sentences: List[str], scores: List[float], count: int) -> List[str]:
+    """Return the highest-scoring sentences in their original order, without duplicates."""
+    if count <= 0:
+        return []
+    chosen = set()
+    seen = set()
+    for index in sorted(range(len(sentences)), key=lambda i: scores[i], reverse=True):
+        sentence = sentences[index].strip()
+        if not sentence or sentence in seen:
+            continue
+        chosen.add(index)
+        seen.add(sentence)
+        if len(chosen) >= count:
+            break
+    return [sentences[i] for i in sorted(chosen)]
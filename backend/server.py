@@ -0,0 +1,278 @@
+"""
+JSON API for TaskTamer, for integrations that cannot drive the Streamlit UI.
+
+    python -m backend.server [--port 8000]
+
+Endpoints (POST, JSON body):
+    /api/break_down_task   {"task"}
+    /api/break_task        {"task", "detail_level"?}
+    /api/summarize         {"content" | "url", "num_sentences"?, "method"?}
+    /api/quiz              {"content" | "url", "num_questions"?}
+    /api/ask               {"question"}
+and GET /health and /metrics (Prometheus text).
+
+Models are loaded once at startup and shared by every request, as are the
+memoization and content caches. Backend calls run on a bounded thread pool;
+requests beyond TASKTAMER_API_MAX_PENDING waiting calls get 503 with Retry-After.
+"""
+import os
+import sys
+import json
+import asyncio
+import contextvars
+import logging
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+import tornado.web
+from tornado.ioloop import IOLoop
+
+from backend import jobs, metrics
+
+logger = logging.getLogger(__name__)
+
+PORT = int(os.environ.get("TASKTAMER_API_PORT", "8000"))
+# Backend calls running at once; further requests wait for a slot
+CONCURRENCY = int(os.environ.get("TASKTAMER_API_CONCURRENCY", str(os.cpu_count() or 4)))
+# Requests allowed to wait for a slot before new ones are turned away
+MAX_PENDING = int(os.environ.get("TASKTAMER_API_MAX_PENDING", "64"))
+MAX_BODY_BYTES = 5 * 1024 * 1024
+
+MAX_TASK_CHARS = 1000
+MAX_QUESTION_CHARS = 1000
+MAX_CONTENT_CHARS = 2_000_000
+DETAIL_LEVELS = ("basic", "standard", "comprehensive")
+RANKING_METHODS = ("textrank", "tfidf")
+
+
+class ValidationError(ValueError):
+    """Invalid request body; reported to the client as 400."""
+
+
+def _string(body: Dict[str, Any], field: str, max_chars: int, required: bool = True) -> Optional[str]:
+    value = body.get(field)
+    if value is None or (isinstance(value, str) and not value.strip()):
+        if required:
+            raise ValidationError(f"'{field}' is required")
+        return None
+    if not isinstance(value, str):
+        raise ValidationError(f"'{field}' must be a string")
+    if len(value) > max_chars:
+        raise ValidationError(f"'{field}' is longer than {max_chars} characters")
+    return value
+
+
+def _integer(body: Dict[str, Any], field: str, default: int, low: int, high: int) -> int:
+    value = body.get(field, default)
+    if isinstance(value, bool) or not isinstance(value, int) or not low <= value <= high:
+        raise ValidationError(f"'{field}' must be an integer between {low} and {high}")
+    return value
+
+
+def _choice(body: Dict[str, Any], field: str, default: str, choices: tuple) -> str:
+    value = body.get(field) or default
+    if value not in choices:
+        raise ValidationError(f"'{field}' must be one of: {', '.join(choices)}")
+    return value
+
+
+def _source(body: Dict[str, Any]) -> Dict[str, Optional[str]]:
+    """Exactly one of content or url."""
+    content = _string(body, "content", MAX_CONTENT_CHARS, required=False)
+    url = _string(body, "url", 2048, required=False)
+    if bool(content) == bool(url):
+        raise ValidationError("provide exactly one of 'content' or 'url'")
+    if url and not url.startswith(("http://", "https://")):
+        raise ValidationError("'url' must start with http:// or https://")
+    return {"content": content, "url": url}
+
+
+def _break_down_task(body: Dict[str, Any]) -> Callable[[], Any]:
+    task = _string(body, "task", MAX_TASK_CHARS)
+    return lambda: {"steps": jobs.run("break_down_task", task)}
+
+
+def _break_task(body: Dict[str, Any]) -> Callable[[], Any]:
+    task = _string(body, "task", MAX_TASK_CHARS)
+    level = _choice(body, "detail_level", "standard", DETAIL_LEVELS)
+    return lambda: jobs.run("break_task", task, level)
+
+
+def _summarize(body: Dict[str, Any]) -> Callable[[], Any]:
+    source = _source(body)
+    num_sentences = _integer(body, "num_sentences", 5, 1, 50)
+    method = _choice(body, "method", "textrank", RANKING_METHODS)
+    return lambda: {"summary": jobs.run("summarize_content", num_sentences=num_sentences, method=method, **source)}
+
+
+def _quiz(body: Dict[str, Any]) -> Callable[[], Any]:
+    source = _source(body)
+    from backend.question_generation import MAX_QUESTIONS
+
+    num_questions = _integer(body, "num_questions", 3, 1, MAX_QUESTIONS)
+    return lambda: {"questions": jobs.run("generate_quiz", num_questions=num_questions, **source)}
+
+
+def _ask(body: Dict[str, Any]) -> Callable[[], Any]:
+    from backend.chat_assistant import answer_question
+
+    question = _string(body, "question", MAX_QUESTION_CHARS)
+
+    def run() -> Dict[str, Any]:
+        answer, confidence = answer_question(question)
+        return {"answer": answer, "confidence": round(confidence, 3)}
+    return run
+
+
+# endpoint name -> validator returning the backend call to run
+ENDPOINTS: Dict[str, Callable[[Dict[str, Any]], Callable[[], Any]]] = {
+    "break_down_task": _break_down_task,
+    "break_task": _break_task,
+    "summarize": _summarize,
+    "quiz": _quiz,
+    "ask": _ask,
+}
+
+
+class Limiter:
+    """Caps running backend calls at `concurrency` and waiting ones at `max_pending`."""
+
+    def __init__(self, concurrency: int, max_pending: int):
+        self.executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="api")
+        self.slots = asyncio.Semaphore(concurrency)
+        self.max_pending = max_pending
+        self.pending = 0
+
+    async def run(self, func: Callable[[], Any]) -> Any:
+        if self.pending >= self.max_pending:
+            raise jobs.QueueFull(f"{self.pending} requests already waiting")
+        self.pending += 1
+        try:
+            await self.slots.acquire()
+        finally:
+            self.pending -= 1
+        try:
+            # Copy the context so backend spans join the request's trace in the worker thread
+            context = contextvars.copy_context()
+            return await IOLoop.current().run_in_executor(self.executor, context.run, func)
+        finally:
+            self.slots.release()
+
+
+class JSONHandler(tornado.web.RequestHandler):
+    def set_default_headers(self) -> None:
+        self.set_header("Content-Type", "application/json; charset=utf-8")
+
+    def write_json(self, status: int, payload: Dict[str, Any]) -> None:
+        self.set_status(status)
+        self.finish(json.dumps(payload, ensure_ascii=False))
+
+    def write_error(self, status_code: int, **kwargs) -> None:
+        self.finish(json.dumps({"error": self._reason}))
+
+
+class APIHandler(JSONHandler):
+    def initialize(self, limiter: Limiter) -> None:
+        self.limiter = limiter
+
+    async def post(self, name: str) -> None:
+        validator = ENDPOINTS.get(name)
+        if validator is None:
+            self.write_json(404, {"error": f"unknown endpoint '{name}'"})
+            return
+
+        try:
+            body = json.loads(self.request.body or b"{}")
+            if not isinstance(body, dict):
+                raise ValidationError("request body must be a JSON object")
+            call = validator(body)
+        except ValueError as e:
+            metrics.increment("tasktamer_api_requests_total", endpoint=name, status="400")
+            self.write_json(400, {"error": str(e)})
+            return
+
+        try:
+            with metrics.trace(f"api.{name}"):
+                result = await self.limiter.run(call)
+        except jobs.QueueFull as e:
+            metrics.increment("tasktamer_api_requests_total", endpoint=name, status="503")
+            self.set_header("Retry-After", "1")
+            self.write_json(503, {"error": f"server busy: {e}"})
+            return
+        except jobs.JobTimeout as e:
+            metrics.increment("tasktamer_api_requests_total", endpoint=name, status="504")
+            self.write_json(504, {"error": str(e)})
+            return
+        except Exception as e:
+            logger.error(f"Error handling /api/{name}: {str(e)}")
+            metrics.increment("tasktamer_api_requests_total", endpoint=name, status="500")
+            self.write_json(500, {"error": "internal error"})
+            return
+
+        metrics.increment("tasktamer_api_requests_total", endpoint=name, status="200")
+        self.write_json(200, result)
+
+
+class HealthHandler(JSONHandler):
+    def initialize(self, limiter: Limiter) -> None:
+        self.limiter = limiter
+
+    def get(self) -> None:
+        self.write_json(200, {"status": "ok", "waiting": self.limiter.pending})
+
+
+class MetricsHandler(tornado.web.RequestHandler):
+    def get(self) -> None:
+        self.set_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.finish(metrics.prometheus())
+
+
+def warm_up() -> None:
+    """Load models and build indexes once so the first requests do not pay for it."""
+    from backend.knowledge_base import get_knowledge_base
+
+    # /api/ask is answered in this process
+    get_knowledge_base()
+    if jobs.get_job_manager() is not None:
+        # Starting the pool is enough: each worker loads the models in its initializer
+        return
+
+    from backend.task_breakdown import preload
+    from backend.sentence_ranking import rank_sentences
+    from backend.quiz_selection import get_tagger
+
+    preload()
+    get_tagger()
+    # Imports scikit-learn ahead of the first summary
+    rank_sentences(["Warm up the sentence ranker.", "It imports its dependencies lazily."], "textrank")
+
+
+def make_app(concurrency: int = CONCURRENCY, max_pending: int = MAX_PENDING) -> tornado.web.Application:
+    limiter = Limiter(concurrency, max_pending)
+    return tornado.web.Application([
+        (r"/api/([a-z_]+)", APIHandler, {"limiter": limiter}),
+        (r"/health", HealthHandler, {"limiter": limiter}),
+        (r"/metrics", MetricsHandler),
+    ])
+
+
+def main(argv: Optional[list] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=PORT)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--concurrency", type=int, default=CONCURRENCY)
+    parser.add_argument("--max-pending", type=int, default=MAX_PENDING)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    warm_up()
+    app = make_app(args.concurrency, args.max_pending)
+    app.listen(args.port, address=args.host, max_body_size=MAX_BODY_BYTES)
+    logger.info(f"TaskTamer API listening on http://{args.host}:{args.port}")
+    IOLoop.current().start()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,27 +1,73 @@
 import requests
-from bs4 import BeautifulSoup
 import re
+import codecs
+import logging
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import BinaryIO, Iterable, Iterator, List, Tuple
 from urllib.parse import urlparse
+from backend.fetcher import ResponseTooLarge, fetch, iter_text
+from backend.content_cache import get_cache
+from backend.extraction import extract_text, iter_paragraphs
+from backend.sentence_ranking import METHODS, rank_sentences, top_sentences
+from backend.document import SENTENCE_BOUNDARY, analyze, content_hash
+from backend import metrics
+from backend.memoize import memoize
 
-def fetch_webpage_content(url: str) -> str:
+logger = logging.getLogger(__name__)
+
+# Inputs longer than this (in characters) are summarized with the streaming path
+STREAMING_THRESHOLD = 1_000_000
+# Sentences summarized together per window in the streaming path
+WINDOW_SENTENCES = 400
+# A "sentence" without punctuation is cut after this many characters
+MAX_SENTENCE_CHARS = 5000
+CHUNK_SIZE = 64 * 1024
+# Concurrent fetches when summarizing a reading list (per-host limits still apply)
+MAX_URL_WORKERS = 8
+
+# Bump when summarization output changes so memoized summaries are recomputed
+SUMMARIZER_VERSION = "textrank-2"
+
+def _cached(action: str, operation, *args):
+    """Run a content cache operation; if the database fails, log it and carry on uncached."""
+    try:
+        return operation(*args)
+    except sqlite3.Error as e:
+        logger.error(f"Error {action} content cache: {str(e)}")
+        return None
+
+def fetch_webpage_content(url: str, raise_too_large: bool = False) -> str:
+    cache = _cached("opening", get_cache)
+    cached = _cached("reading", cache.get, url) if cache else None
+    if cached and cached.is_fresh():
+        metrics.increment("tasktamer_content_cache_total", result="fresh")
+        return cached.text
+    
     try:
-        response = requests.get(url, headers={'User-Agent': 'Mozilla/5.0'})
-        response.raise_for_status()
-        soup = BeautifulSoup(response.text, "html.parser")
+        with metrics.span("summarize.fetch"):
+            response = fetch(url, headers=cached.validators() if cached else None)
         
-        for tag in soup(['script', 'style', 'header', 'footer', 'nav']):
-            tag.decompose()
-            
-        paragraphs = soup.find_all("p")
-        text = "\n".join([p.get_text().strip() for p in paragraphs if p.get_text().strip()])
+        # Page unchanged since we cached it
+        if response.status_code == 304 and cached:
+            _cached("refreshing", cache.refresh, url, response.headers)
+            metrics.increment("tasktamer_content_cache_total", result="revalidated")
+            return cached.text
         
-        if not text:
-            main_content = soup.find('main') or soup.find('article') or soup.find('body')
-            if main_content:
-                text = main_content.get_text(separator="\n", strip=True)
+        metrics.increment("tasktamer_content_cache_total", result="miss")
+        with metrics.span("summarize.extract"):
+            text = extract_text(response.text)
+        if text and cache:
+            _cached("writing", cache.put, url, text, response.headers)
             
         return text if text else "No readable content found."
     except requests.RequestException as e:
+        # Pages too large to read into memory are left to callers that can stream them
+        if raise_too_large and isinstance(e, ResponseTooLarge):
+            raise
+        # Serve stale content rather than nothing if the site is unreachable
+        if cached:
+            return cached.text
         return f"Error fetching webpage: {e}"
 
 def extract_youtube_id(url: str) -> str:
@@ -29,53 +75,249 @@ def extract_youtube_id(url: str) -> str:
     match = re.search(youtube_regex, url)
     return match.group(1) if match else None
 
-def process_url(url: str) -> str:
+def process_url(url: str, raise_too_large: bool = False) -> str:
     parsed_url = urlparse(url)
     domain = parsed_url.netloc.lower()
     
     if 'youtube.com' in domain or 'youtu.be' in domain:
         return "YouTube video detected. For full functionality with captions, please install additional dependencies."
     else:
-        return fetch_webpage_content(url)
+        return fetch_webpage_content(url, raise_too_large=raise_too_large)
+
+def _positional_summary(sentences: List[str], num_sentences: int) -> List[str]:
+    """Pick sentences by position; used when scoring is unavailable."""
+    if len(sentences) <= num_sentences:
+        return sentences
+    if num_sentences == 1:
+        # The first sentence usually states the main topic
+        return sentences[:1]
+    
+    # Evenly spaced from the first sentence (main topic) to the last (conclusion)
+    step = (len(sentences) - 1) / (num_sentences - 1)
+    important_sentences = [sentences[round(i * step)] for i in range(num_sentences)]
+    
+    # Deduplicate sentences
+    return list(dict.fromkeys(important_sentences))
 
-def summarize_content(content: str = None, url: str = None) -> str:
+def _check_options(num_sentences: int, method: str) -> None:
+    if num_sentences < 1:
+        raise ValueError(f"num_sentences must be at least 1, got {num_sentences}")
+    if method not in METHODS:
+        raise ValueError(f"Unknown ranking method '{method}'. Choose from: {', '.join(METHODS)}")
+
+def _select_sentences(sentences: List[str], num_sentences: int, method: str) -> List[str]:
+    if len(sentences) <= num_sentences:
+        return sentences
+    
+    with metrics.span("summarize.rank", method=method):
+        scores = rank_sentences(sentences, method)
+    if scores is None:
+        return _positional_summary(sentences, num_sentences)
+    
+    return top_sentences(sentences, scores, num_sentences)
+
+@metrics.traced("summarize_content")
+def summarize_content(content: str = None, url: str = None, num_sentences: int = 5, method: str = "textrank",
+                      refresh: bool = False) -> str:
+    """
+    Extractive summary of text or a web page.
+    
+    Pages are resolved through the content cache (with its revalidation) before
+    the memo is consulted, and summaries are memoized on the text itself, so an
+    edited page gets a new summary. Pages over fetcher.MAX_BODY_BYTES are
+    summarized as they are read back from disk, and neither cached nor memoized.
+    
+    Args:
+        content: Text to summarize
+        url: URL to fetch and summarize instead of content
+        num_sentences: Target summary length in sentences
+        method: Sentence ranking method, "textrank" or "tfidf"
+        refresh: Recompute instead of returning a memoized summary
+        
+    Returns:
+        The most central sentences, in document order
+    
+    Raises:
+        ValueError: If num_sentences is below 1 or method is not a known ranking method
+    """
+    _check_options(num_sentences, method)
     if url:
-        content = process_url(url)
+        try:
+            content = process_url(url, raise_too_large=True)
+        except ResponseTooLarge:
+            return _summarize_large_page(url, num_sentences, method)
     
     if not content or content.startswith("Error"):
         return "No content provided for summarization."
     
-    sentences = re.split(r'(?<=[.!?])\s+', content)
+    return _summarize_text(content, num_sentences, method, refresh=refresh)
+
+def _summarize_large_page(url: str, num_sentences: int, method: str) -> str:
+    try:
+        with metrics.span("summarize.stream_url"):
+            return summarize_stream(iter_url_chunks(url), num_sentences=num_sentences, method=method)
+    except requests.RequestException as e:
+        logger.error(f"Error streaming webpage: {str(e)}")
+        return "No content provided for summarization."
+
+def _summary_key(content: str, num_sentences: int, method: str) -> list:
+    return [content_hash(content), num_sentences, method]
+
+@memoize("summarize_content", version=SUMMARIZER_VERSION, key=_summary_key,
+         should_cache=lambda summary: not summary.startswith("No content"))
+def _summarize_text(content: str, num_sentences: int, method: str) -> str:
+    # Very large inputs go through the windowed map-reduce path to bound memory
+    if len(content) > STREAMING_THRESHOLD:
+        return summarize_stream(iter_text_chunks(content), num_sentences=num_sentences, method=method)
     
-    if len(sentences) <= 5:
+    # Shared with generate_quiz, so quizzing the same text does not split it again
+    with metrics.span("summarize.split"):
+        sentences = analyze(content).sentences()
+    
+    if len(sentences) <= num_sentences:
         return content
     
-    important_sentences = []
+    return " ".join(_select_sentences(sentences, num_sentences, method))
+
+def iter_text_chunks(text: str, chunk_size: int = CHUNK_SIZE) -> Iterator[str]:
+    """Yield an in-memory string in fixed-size pieces."""
+    for start in range(0, len(text), chunk_size):
+        yield text[start:start + chunk_size]
+
+def iter_file_chunks(file: BinaryIO, chunk_size: int = CHUNK_SIZE, encoding: str = "utf-8") -> Iterator[str]:
+    """Yield decoded text from a binary file object (e.g. a Streamlit upload) chunk by chunk."""
+    decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+    while True:
+        data = file.read(chunk_size)
+        if not data:
+            break
+        text = decoder.decode(data)
+        if text:
+            yield text
+    tail = decoder.decode(b"", final=True)
+    if tail:
+        yield tail
+
+def iter_url_chunks(url: str) -> Iterator[str]:
+    """Stream a URL's readable text; HTML pages are extracted paragraph by paragraph from the spooled body."""
+    chunks = iter_text(url)
+    first = next(chunks, "")
     
-    # Add first sentence (usually contains main topic)
-    if sentences:
-        important_sentences.append(sentences[0])
+    def replay() -> Iterator[str]:
+        yield first
+        yield from chunks
     
-    # Add a sentence from first third
-    first_third_idx = len(sentences) // 3
-    if first_third_idx > 0 and first_third_idx < len(sentences):
-        important_sentences.append(sentences[first_third_idx])
+    if first.lstrip().startswith("<") or "<html" in first[:2048].lower():
+        for paragraph in iter_paragraphs(replay()):
+            yield paragraph + "\n"
+    else:
+        yield from replay()
+
+def iter_sentences(chunks: Iterable[str]) -> Iterator[str]:
+    """
+    Segment text into sentences incrementally as chunks arrive.
+    Only the unfinished trailing sentence is buffered between chunks.
+    """
+    buffer = ""
+    for chunk in chunks:
+        buffer += chunk
+        last_end = 0
+        for match in SENTENCE_BOUNDARY.finditer(buffer):
+            sentence = buffer[last_end:match.start()].strip()
+            if sentence:
+                yield sentence
+            last_end = match.end()
+        buffer = buffer[last_end:]
+        
+        # Text without sentence punctuation must not grow the buffer without bound
+        while len(buffer) > MAX_SENTENCE_CHARS:
+            cut = buffer.rfind(" ", 0, MAX_SENTENCE_CHARS)
+            if cut <= 0:
+                cut = MAX_SENTENCE_CHARS
+            sentence = buffer[:cut].strip()
+            if sentence:
+                yield sentence
+            buffer = buffer[cut:]
     
-    # Add a sentence from the middle
-    middle_idx = len(sentences) // 2
-    if middle_idx > 0 and middle_idx < len(sentences) and middle_idx != first_third_idx:
-        important_sentences.append(sentences[middle_idx])
+    if buffer.strip():
+        yield buffer.strip()
+
+def summarize_stream(chunks: Iterable[str], num_sentences: int = 5, window_size: int = WINDOW_SENTENCES,
+                     method: str = "textrank") -> str:
+    """
+    Summarize text arriving as an iterator of chunks with bounded memory.
     
-    # Add a sentence from the last third
-    last_third_idx = (len(sentences) * 2) // 3
-    if last_third_idx > 0 and last_third_idx < len(sentences) and last_third_idx != middle_idx:
-        important_sentences.append(sentences[last_third_idx])
+    Sentences are summarized in windows of window_size (map), and window summaries
+    are merged level by level whenever a level fills up (reduce), so at most
+    window_size sentences per level are held regardless of input size.
     
-    # Add last sentence (usually contains conclusion)
-    if len(sentences) > 1:
-        important_sentences.append(sentences[-1])
+    Args:
+        chunks: Iterable of text chunks (text area, file upload, HTTP stream, ...)
+        num_sentences: Target summary length in sentences
+        window_size: Number of sentences summarized together at each level
+        method: Sentence ranking method, "textrank" or "tfidf"
+        
+    Returns:
+        The summary text
     
-    # Deduplicate sentences
-    important_sentences = list(dict.fromkeys(important_sentences))
+    Raises:
+        ValueError: If num_sentences is below 1 or method is not a known ranking method
+    """
+    _check_options(num_sentences, method)
+    # Each reduction must shrink its input or the merge would never terminate
+    window_size = max(window_size, num_sentences * 2)
+    levels: List[List[str]] = []
+    
+    def push(level: int, sentences: List[str]) -> None:
+        while True:
+            if len(levels) <= level:
+                levels.append([])
+            levels[level].extend(sentences)
+            if len(levels[level]) < window_size:
+                return
+            sentences = _select_sentences(levels[level], num_sentences, method)
+            levels[level] = []
+            level += 1
+    
+    window: List[str] = []
+    for sentence in iter_sentences(chunks):
+        window.append(sentence)
+        if len(window) >= window_size:
+            push(0, _select_sentences(window, num_sentences, method))
+            window = []
+    
+    # Higher levels summarize earlier text, so merge from the top down to keep document order
+    remaining = [sentence for level in reversed(levels) for sentence in level] + window
+    if not remaining:
+        return "No content provided for summarization."
+    
+    return " ".join(_select_sentences(remaining, num_sentences, method))
+
+def summarize_urls(urls: Iterable[str], max_workers: int = MAX_URL_WORKERS, num_sentences: int = 5) -> Iterator[Tuple[str, str]]:
+    """
+    Fetch and summarize many URLs concurrently.
+    
+    Args:
+        urls: URLs to summarize; duplicates are summarized once
+        max_workers: Size of the thread pool doing fetch + extract + summarize
+        num_sentences: Target summary length per page
+        
+    Yields:
+        (url, summary) pairs in completion order, so total time approaches the
+        slowest single page rather than the sum of all of them
+    """
+    unique_urls = list(dict.fromkeys(url.strip() for url in urls if url and url.strip()))
+    if not unique_urls:
+        return
     
-    return " ".join(important_sentences)
\ No newline at end of file
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(unique_urls)))) as executor:
+        futures = {
+            executor.submit(summarize_content, url=url, num_sentences=num_sentences): url
+            for url in unique_urls
+        }
+        for future in as_completed(futures):
+            url = futures[future]
+            try:
+                yield url, future.result()
+            except Exception as e:
+                yield url, f"Error summarizing {url}: {e}"
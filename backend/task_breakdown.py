@@ -1,42 +1,258 @@
 import re
-from typing import List, Dict, Any, Optional
+import copy
+from typing import List, Dict, Any, Iterator, Optional
 import random
 import logging
+import threading
+from backend.model_registry import add_listener, get_pipeline, loaded_backend, transformers_available, INFERENCE_BACKEND
+from backend.batching import BatchCoalescer, MAX_BATCH_SIZE, wait_all
+from backend import metrics
+from backend.memoize import invalidate, memoize
+from backend.keyword_matcher import KeywordMatcher
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Check if advanced models are available
-try:
-    from transformers import pipeline
-    ADVANCED_MODELS_AVAILABLE = True
-    logger.info("Advanced models are available")
-except ImportError:
-    ADVANCED_MODELS_AVAILABLE = False
-    logger.info("Advanced models not available, using base functionality")
+# transformers (and torch) are only imported on the first generative call,
+# so importing this module stays cheap for pages that never generate text.
 
+# Text generation model shared by break_down_task and TaskBreakdown
+GENERATION_TASK = "text-generation"
+GENERATION_MODEL = "gpt2"
+
+# Largest number of prompts TaskBreakdown sends through the model in one forward pass
+DEFAULT_MAX_BATCH_SIZE = MAX_BATCH_SIZE
+
+# Seconds the streaming consumer waits for the next generated token
+STREAM_TIMEOUT = 60.0
+# Seconds a caller waits for its batched generations before giving up
+GENERATION_TIMEOUT = 120.0
+
+# AI breakdowns with fewer usable steps than this fall back to templates
+MIN_AI_STEPS = 3
+
+STEP_NUMBER = re.compile(r'\d+\.')
+
+ADHD_TIP_PROMPT = "Generate a brief ADHD-friendly productivity tip to help with focus. Tip:"
+
+
+# A call's prompts share max_new_tokens rounded up to a multiple of this, so
+# calls from concurrent sessions with similar prompt lengths share a batch too
+TOKEN_BUDGET_STEP = 8
+
+_batch_generator = None
+_batch_generator_source = None
+_batch_generator_lock = threading.Lock()
+
+
+def _load_generator():
+    """
+    Pipeline the coalescer runs batches on: the shared model with its own copy of
+    the tokenizer, padding on the left with EOS (GPT-2 has no padding token).
+    The registry's pipeline, also used for streaming, is left unchanged.
+    """
+    global _batch_generator, _batch_generator_source
+    generator = get_pipeline(GENERATION_TASK, GENERATION_MODEL)
+    with _batch_generator_lock:
+        if _batch_generator_source is not generator:
+            tokenizer = copy.deepcopy(generator.tokenizer)
+            if tokenizer.pad_token_id is None:
+                tokenizer.pad_token_id = generator.model.config.eos_token_id
+            tokenizer.padding_side = "left"
+            _batch_generator = type(generator)(model=generator.model, tokenizer=tokenizer)
+            _batch_generator_source = generator
+        return _batch_generator
+
+def _new_token_budget(tokenizer, prompt: str, max_length: int) -> int:
+    """
+    Tokens generated for a prompt under an unbatched max_length call.
+
+    max_length counts the prompt and, in a batch, its left padding too, so batched
+    calls pass this as max_new_tokens instead.
+    """
+    return max(1, max_length - len(tokenizer(prompt)["input_ids"]))
+
+def _truncate(tokenizer, prompt: str, text: str, budget: int) -> str:
+    """Cut a generation back to `budget` new tokens after its prompt."""
+    if not text.startswith(prompt):
+        return text
+    new_ids = tokenizer(text[len(prompt):], add_special_tokens=False)["input_ids"]
+    if len(new_ids) <= budget:
+        return text
+    return prompt + tokenizer.decode(new_ids[:budget])
+
+def _generate(prompts: List[str], max_length: int, max_batch_size: Optional[int] = None) -> List[str]:
+    """
+    Complete prompts through the shared coalescer, each cut to the new-token budget
+    an unbatched generator(prompt, max_length=max_length) call would have had.
+
+    All prompts are submitted with the largest of their budgets, rounded up to a
+    multiple of TOKEN_BUDGET_STEP, so they form one generation group (one pipeline
+    call up to max_batch_size prompts) instead of one per distinct prompt length.
+    """
+    tokenizer = get_pipeline(GENERATION_TASK, GENERATION_MODEL).tokenizer
+    budgets = [_new_token_budget(tokenizer, prompt, max_length) for prompt in prompts]
+    shared = -(-max(budgets) // TOKEN_BUDGET_STEP) * TOKEN_BUDGET_STEP
+    futures = [GENERATION_BATCHER.submit(prompt, max_batch_size=max_batch_size, max_new_tokens=shared)
+               for prompt in prompts]
+    try:
+        outputs = wait_all(futures, timeout=GENERATION_TIMEOUT)
+    except Exception:
+        # Prompts still queued are dropped instead of costing the next batch
+        for future in futures:
+            future.cancel()
+        raise
+    return [_truncate(tokenizer, prompt, text, budget) for prompt, text, budget in zip(prompts, outputs, budgets)]
+
+# Non-streaming generation from every session goes through one coalescer, so
+# concurrent users share forward passes instead of queueing behind each other
+GENERATION_BATCHER = BatchCoalescer(_load_generator)
+
+# Step templates used when AI generation is unavailable or unusable.
+# Categories are listed in priority order; ties in keyword score go to the earlier one.
+TASK_TEMPLATES = {
+    "research": [
+        "Define your research topic and goals",
+        "Gather relevant sources and materials",
+        "Take notes from your sources",
+        "Organize your information",
+        "Create an outline",
+        "Write a first draft",
+        "Revise and edit your work",
+    ],
+    "presentation": [
+        "Define your presentation topic and audience",
+        "Research key information",
+        "Create an outline",
+        "Design slides or visual aids",
+        "Practice your delivery",
+        "Get feedback and revise",
+        "Finalize your presentation",
+    ],
+    "project": [
+        "Define project scope and objectives",
+        "Create a timeline with milestones",
+        "Identify required resources",
+        "Assign responsibilities",
+        "Track progress and adjust as needed",
+        "Review and quality check",
+        "Finalize and deliver",
+    ],
+    "budget": [
+        "Gather all financial information",
+        "Identify income sources",
+        "List all expenses",
+        "Categorize expenses",
+        "Set financial goals",
+        "Create a spending plan",
+        "Track and adjust regularly",
+    ],
+    "learning": [
+        "Define what you want to learn",
+        "Gather learning resources",
+        "Break content into smaller chunks",
+        "Create a study schedule",
+        "Use active learning techniques",
+        "Test your knowledge",
+        "Review and reinforce regularly",
+    ],
+    "writing": [
+        "Choose and narrow your topic",
+        "Create a thesis statement",
+        "Research supporting evidence",
+        "Create an outline",
+        "Write your introduction",
+        "Develop body paragraphs with evidence",
+        "Write a conclusion",
+        "Edit and proofread",
+    ],
+    "event": [
+        "Define event goals and target audience",
+        "Set date, time, and venue",
+        "Create a budget",
+        "Arrange speakers or entertainment",
+        "Plan logistics (food, equipment, etc.)",
+        "Create and distribute invitations",
+        "Prepare day-of materials",
+        "Follow up after the event",
+    ],
+    "default": [
+        "Define your goal and desired outcome",
+        "Break down the main components",
+        "Create a timeline",
+        "Gather necessary resources",
+        "Work through each component",
+        "Review progress regularly",
+        "Complete final review",
+    ],
+}
+
+# Checked in order: the first category with a matching keyword picks the template
+TEMPLATE_KEYWORDS = {
+    "research": ["research", "paper"],
+    "presentation": ["presentation", "slide"],
+    "project": ["project", "manage"],
+    "budget": ["budget", "finance"],
+    "learning": ["learning", "study"],
+    "writing": ["write", "essay"],
+    "event": ["event", "conference"],
+}
+
+# Single-pass multi-keyword matcher over the template keywords
+TEMPLATE_MATCHER = KeywordMatcher(TEMPLATE_KEYWORDS)
+
+def _model_version() -> str:
+    """
+    Identity of the model behind generated results, part of every memoization key.
+    Uses the backend that actually loaded, which differs from INFERENCE_BACKEND
+    after a fallback; memoize re-reads it after the call that loaded the model.
+    """
+    if not transformers_available():
+        return "templates"
+    backend = loaded_backend(GENERATION_TASK, GENERATION_MODEL) or INFERENCE_BACKEND
+    return f"{GENERATION_TASK}:{GENERATION_MODEL}:{backend}"
+
+def _is_generated(steps: List[str]) -> bool:
+    """Template fallbacks are cheap and would hide the model's output once it works, so only AI steps are memoized."""
+    return bool(steps) and steps not in TASK_TEMPLATES.values()
+
+def _on_model_change(event: str, key) -> None:
+    # A reloaded or evicted generator may differ from the one that produced memoized breakdowns
+    global _batch_generator, _batch_generator_source
+    if key[0] == GENERATION_TASK and key[1] == GENERATION_MODEL:
+        invalidate("break_down_task")
+        # The batching pipeline would otherwise keep an evicted model in memory
+        with _batch_generator_lock:
+            _batch_generator = _batch_generator_source = None
+
+add_listener(_on_model_change)
+
+@metrics.traced("break_down_task")
+# Keyed on the description alone, so positional, keyword and streamed calls share entries
+@memoize("break_down_task", version=_model_version, should_cache=_is_generated,
+         key=lambda task_description: task_description)
 def break_down_task(task_description: str) -> List[str]:
     """
     AI-powered function to break down a task into steps.
     This maintains the original API for backward compatibility.
     
+    AI breakdowns are memoized; pass refresh=True (handled by memoize) to
+    sample a new one instead.
+    
     Args:
         task_description: The task to break down
         
     Returns:
         List of step descriptions
     """
-    task_lower = task_description.lower()
-    
     # First check if we can use AI to generate steps
-    if ADVANCED_MODELS_AVAILABLE:
+    if transformers_available():
         try:
             # Try to use a text generation model for more personalized steps
-            generator = pipeline("text-generation", model="gpt2")
-            
             prompt = f"Break down the task of '{task_description}' into steps:\n1."
-            output = generator(prompt, max_length=200, num_return_sequences=1)[0]['generated_text']
+            with metrics.span("break_down_task.generate"):
+                output = _generate([prompt], max_length=200)[0]
             
             # Extract just the generated steps
             if "steps:" in output.lower() and "1." in output:
@@ -65,88 +281,138 @@ def break_down_task(task_description: str) -> List[str]:
             logger.error(f"Error using AI for task breakdown: {str(e)}")
     
     # Fall back to template-based approach (original implementation)
-    if "research" in task_lower or "paper" in task_lower:
-        return [
-            "Define your research topic and goals",
-            "Gather relevant sources and materials",
-            "Take notes from your sources",
-            "Organize your information",
-            "Create an outline",
-            "Write a first draft",
-            "Revise and edit your work"
-        ]
-    elif "presentation" in task_lower or "slide" in task_lower:
-        return [
-            "Define your presentation topic and audience",
-            "Research key information",
-            "Create an outline",
-            "Design slides or visual aids",
-            "Practice your delivery",
-            "Get feedback and revise",
-            "Finalize your presentation"
-        ]
-    elif "project" in task_lower or "manage" in task_lower:
-        return [
-            "Define project scope and objectives",
-            "Create a timeline with milestones",
-            "Identify required resources",
-            "Assign responsibilities",
-            "Track progress and adjust as needed",
-            "Review and quality check",
-            "Finalize and deliver"
-        ]
-    elif "budget" in task_lower or "finance" in task_lower:
-        return [
-            "Gather all financial information",
-            "Identify income sources",
-            "List all expenses",
-            "Categorize expenses",
-            "Set financial goals",
-            "Create a spending plan",
-            "Track and adjust regularly"
-        ]
-    elif "learning" in task_lower or "study" in task_lower:
-        return [
-            "Define what you want to learn",
-            "Gather learning resources",
-            "Break content into smaller chunks",
-            "Create a study schedule",
-            "Use active learning techniques",
-            "Test your knowledge",
-            "Review and reinforce regularly"
-        ]
-    elif "write" in task_lower or "essay" in task_lower:
-        return [
-            "Choose and narrow your topic",
-            "Create a thesis statement",
-            "Research supporting evidence",
-            "Create an outline",
-            "Write your introduction",
-            "Develop body paragraphs with evidence",
-            "Write a conclusion",
-            "Edit and proofread"
-        ]
-    elif "event" in task_lower or "conference" in task_lower:
-        return [
-            "Define event goals and target audience",
-            "Set date, time, and venue",
-            "Create a budget",
-            "Arrange speakers or entertainment",
-            "Plan logistics (food, equipment, etc.)",
-            "Create and distribute invitations",
-            "Prepare day-of materials",
-            "Follow up after the event"
-        ]
-    else:
-        return [
-            "Define your goal and desired outcome",
-            "Break down the main components",
-            "Create a timeline",
-            "Gather necessary resources",
-            "Work through each component",
-            "Review progress regularly",
-            "Complete final review"
-        ]
+    metrics.increment("tasktamer_template_fallback_total")
+    with metrics.span("break_down_task.templates"):
+        return _template_steps(task_description)
+
+def _template_steps(task_description: str) -> List[str]:
+    # Table order decides, as in the original if/elif chain: "a research paper
+    # for the project" is a research task, however many project keywords it has
+    category = TEMPLATE_MATCHER.first(task_description)
+    return list(TASK_TEMPLATES[category or "default"])
+
+def stream_generation(prompt: str, max_length: int) -> Iterator[str]:
+    """
+    Yield generated text pieces as the model produces them.
+    Generation runs in a background thread feeding a TextIteratorStreamer,
+    so the first piece arrives after the first forward pass.
+    """
+    from transformers import TextIteratorStreamer
+    
+    generator = get_pipeline(GENERATION_TASK, GENERATION_MODEL)
+    streamer = TextIteratorStreamer(generator.tokenizer, skip_prompt=True, skip_special_tokens=True,
+                                    timeout=STREAM_TIMEOUT)
+    errors = []
+    
+    def run() -> None:
+        try:
+            generator(prompt, max_length=max_length, num_return_sequences=1, streamer=streamer)
+        except Exception as e:
+            errors.append(e)
+            # Unblock the consumer, which would otherwise wait for STREAM_TIMEOUT
+            streamer.end()
+    
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    yield from streamer
+    if errors:
+        raise errors[0]
+
+def _clean_step(step: str) -> Optional[str]:
+    step = step.strip()
+    if 3 < len(step) < 100 and not step.isdigit():
+        return step
+    return None
+
+def iter_break_down_task(task_description: str, max_steps: int = 7, refresh: bool = False) -> Iterator[str]:
+    """
+    Streaming variant of break_down_task that yields steps as soon as they are written.
+    
+    AI steps are held back until MIN_AI_STEPS usable ones exist, the same bar
+    break_down_task applies, so a poor generation can still fall back to templates
+    before anything has been shown.
+    
+    Shares break_down_task's memo: a memoized breakdown is returned without
+    generating, and a completed AI breakdown is memoized for later calls.
+    
+    Args:
+        task_description: The task to break down
+        max_steps: Maximum number of steps to yield
+        refresh: Generate a new breakdown instead of returning the memoized one
+        
+    Yields:
+        Step descriptions
+    """
+    if not transformers_available():
+        yield from break_down_task(task_description, refresh=refresh)[:max_steps]
+        return
+    
+    if not refresh:
+        cached = break_down_task.lookup(task_description)
+        if cached:
+            yield from cached[:max_steps]
+            return
+    
+    pending: List[str] = []
+    steps: List[str] = []
+    try:
+        # The prompt ends with "1.", so the text before the first number is step 1
+        prompt = f"Break down the task of '{task_description}' into steps:\n1."
+        text = ""
+        completed = 0
+        for piece in stream_generation(prompt, max_length=200):
+            text += piece
+            parts = STEP_NUMBER.split(text)
+            # Every part except the last is finished once the next number appears
+            for part in parts[completed:-1]:
+                step = _clean_step(part)
+                if step:
+                    pending.append(step)
+            completed = max(completed, len(parts) - 1)
+            
+            if steps or len(pending) >= MIN_AI_STEPS:
+                while pending and len(steps) < max_steps:
+                    steps.append(pending.pop(0))
+                    yield steps[-1]
+            if len(steps) >= max_steps:
+                break_down_task.store(steps, task_description)
+                return
+        
+        step = _clean_step(STEP_NUMBER.split(text)[-1]) if text else None
+        if step:
+            pending.append(step)
+        if steps or len(pending) >= MIN_AI_STEPS:
+            for step in pending[:max_steps - len(steps)]:
+                steps.append(step)
+                yield step
+            break_down_task.store(steps, task_description)
+            return
+        
+        logger.info("AI generation didn't produce usable steps, falling back to templates")
+    except Exception as e:
+        logger.error(f"Error streaming AI task breakdown: {str(e)}")
+        if steps:
+            return
+    
+    yield from _template_steps(task_description)[:max_steps]
+
+def preload() -> bool:
+    """
+    Import transformers and load the text generation model ahead of time.
+    Servers can call this at boot instead of paying the cost on the first request.
+    
+    Returns:
+        True if the model is loaded and ready
+    """
+    if not transformers_available():
+        return False
+    
+    try:
+        _load_generator()
+        return True
+    except Exception as e:
+        logger.error(f"Error preloading text generation model: {str(e)}")
+        return False
 
 class TaskBreakdown:
     """
@@ -154,21 +420,23 @@ class TaskBreakdown:
     Works with the existing UI without modifications.
     """
     
-    def __init__(self, detail_level: str = "standard"):
+    def __init__(self, detail_level: str = "standard", max_batch_size: int = DEFAULT_MAX_BATCH_SIZE):
         """
         Initialize the TaskBreakdown system.
         
         Args:
             detail_level: Level of detail for task breakdown (basic, standard, comprehensive)
+            max_batch_size: Maximum number of prompts sent through the model in one forward pass
         """
         self.detail_level = detail_level
+        self.max_batch_size = max(1, max_batch_size)
         self.generator = None
         
         # Initialize advanced model if available
-        if ADVANCED_MODELS_AVAILABLE:
+        if transformers_available():
             try:
                 # Try to load a text generation model
-                self.generator = pipeline("text-generation", model="gpt2")
+                self.generator = _load_generator()
                 logger.info("Initialized text generation model for task breakdown")
             except Exception as e:
                 logger.error(f"Error loading text generation model: {str(e)}")
@@ -182,6 +450,7 @@ class TaskBreakdown:
         else:  # standard
             return 7
     
+    @metrics.traced("break_task")
     def break_task(self, task_description: str, detail_level: Optional[str] = None) -> Dict[str, Any]:
         """
         Break down a task with enhanced AI insights when available.
@@ -208,29 +477,57 @@ class TaskBreakdown:
         step_count = self.get_step_count()
         
         # 1. Get basic step breakdown
-        basic_steps = break_down_task(task_description)
+        with metrics.span("break_task.basic_steps"):
+            basic_steps = break_down_task(task_description)
+        
+        # 2. Run all independent short prompts (step refinements, ADHD tips, reward)
+        #    through the model as one batch instead of one generation per prompt
+        short_prompts = (
+            [self._step_prompt(task_description, step) for step in basic_steps]
+            + [ADHD_TIP_PROMPT] * step_count
+            + [self._reward_prompt(task_description)]
+        )
+        with metrics.span("break_task.generate_steps_tips_reward"):
+            short_results = self._generate_batch(short_prompts, max_length=50)
+        step_results = short_results[:len(basic_steps)]
+        tip_results = short_results[len(basic_steps):len(basic_steps) + step_count]
+        reward_result = short_results[-1]
         
-        # 2. Try to enhance steps with AI if available
-        enhanced_steps = self._enhance_steps_with_ai(task_description, basic_steps, step_count)
+        with metrics.span("break_task.refine_steps"):
+            enhanced_steps = self._enhance_steps_with_ai(basic_steps, step_results)
         
-        # 3. Create overview
-        overview = self._create_task_overview(task_description)
+        # 3. Second batch: overview plus extra steps when the refined list is too short
+        long_prompts = [self._overview_prompt(task_description)]
+        needs_more_steps = self.generator is not None and len(enhanced_steps) < step_count
+        if needs_more_steps:
+            long_prompts.append(self._additional_steps_prompt(task_description, enhanced_steps))
+        with metrics.span("break_task.generate_overview"):
+            long_results = self._generate_batch(long_prompts, max_length=150)
+        
+        if needs_more_steps:
+            with metrics.span("break_task.additional_steps"):
+                enhanced_steps = self._add_missing_steps(task_description, enhanced_steps, step_count, long_results[1])
+        with metrics.span("break_task.overview"):
+            overview = self._create_task_overview(task_description, long_results[0])
         
         # 4. Format steps for UI compatibility
         formatted_steps = []
         for i, step_text in enumerate(enhanced_steps[:step_count]):
             # Create each step with the required fields for the UI
+            with metrics.span("break_task.adhd_tip"):
+                tip = self._generate_adhd_tip(tip_results[i])
             step = {
                 "number": i + 1,
                 "description": step_text,
                 "time": random.randint(10, 30),  # Estimate time (5-30 minutes in the UI's scale)
                 "priority": self._assign_priority(i, step_count),
-                "adhd_tip": self._generate_adhd_tip()
+                "adhd_tip": tip
             }
             formatted_steps.append(step)
         
         # 5. Add reward suggestion
-        reward = self._generate_reward_suggestion(task_description)
+        with metrics.span("break_task.reward"):
+            reward = self._generate_reward_suggestion(reward_result)
         
         return {
             "task": task_description,
@@ -239,77 +536,88 @@ class TaskBreakdown:
             "reward_suggestion": reward
         }
     
-    def _enhance_steps_with_ai(self, task_description: str, basic_steps: List[str], step_count: int) -> List[str]:
-        """Try to enhance steps with AI when available."""
+    def _generate_batch(self, prompts: List[str], max_length: int) -> List[Optional[str]]:
+        """
+        Generate text for several prompts through the shared batch coalescer, where
+        they are padded into batches together with prompts from concurrent callers.
+        
+        Args:
+            prompts: Prompts to complete
+            max_length: Length limit (prompt included) of the equivalent unbatched call
+            
+        Returns:
+            Generated text per prompt, or None for every prompt if generation is unavailable or fails
+        """
+        if not self.generator or not prompts:
+            return [None] * len(prompts)
+        
+        try:
+            return _generate(prompts, max_length, max_batch_size=self.max_batch_size)
+        except Exception as e:
+            logger.error(f"Error running batched generation: {str(e)}")
+            return [None] * len(prompts)
+    
+    def _step_prompt(self, task_description: str, step: str) -> str:
+        return f"Task: {task_description}\nMake this step more specific: {step}\nBetter step:"
+    
+    def _additional_steps_prompt(self, task_description: str, steps: List[str]) -> str:
+        existing_steps_text = "\n".join([f"{i+1}. {s}" for i, s in enumerate(steps)])
+        return f"Task: {task_description}\nExisting steps:\n{existing_steps_text}\n\nAdditional steps:\n{len(steps)+1}."
+    
+    def _overview_prompt(self, task_description: str) -> str:
+        return f"Write a brief, encouraging overview for breaking down this task: {task_description}. Keep it under 3 sentences."
+    
+    def _reward_prompt(self, task_description: str) -> str:
+        return f"Suggest a small, specific reward for completing this task: {task_description}"
+    
+    def _enhance_steps_with_ai(self, basic_steps: List[str], results: List[Optional[str]]) -> List[str]:
+        """Replace each basic step with its AI-refined version when the generation is usable."""
         if not self.generator:
             return basic_steps
         
-        try:
-            enhanced_steps = []
+        enhanced_steps = []
+        for step, result in zip(basic_steps, results):
+            # Extract the enhanced step
+            if result and "Better step:" in result:
+                enhanced_step = result.split("Better step:")[1].strip()
+                # Only use if it's reasonable
+                if enhanced_step and 5 < len(enhanced_step) < 100:
+                    enhanced_steps.append(enhanced_step)
+                    continue
+            enhanced_steps.append(step)
+        
+        return enhanced_steps
+    
+    def _add_missing_steps(self, task_description: str, steps: List[str], step_count: int, result: Optional[str]) -> List[str]:
+        """Extend the step list from the additional-steps generation, padding with generic steps."""
+        enhanced_steps = list(steps)
+        marker = f"{len(enhanced_steps)+1}."
+        
+        # Try to extract additional steps
+        if result and marker in result:
+            additional_text = result.split(marker)[1]
+            additional_steps = re.findall(r'\d+\.\s*(.*?)(?=\d+\.|$)', additional_text + "999.")
             
-            # Try to generate sub-steps or details for each basic step
-            for step in basic_steps:
-                # First, try to make the step more specific to the task
-                prompt = f"Task: {task_description}\nMake this step more specific: {step}\nBetter step:"
-                
-                result = self.generator(prompt, max_length=50, num_return_sequences=1)[0]['generated_text']
-                
-                # Extract the enhanced step
-                if "Better step:" in result:
-                    enhanced_step = result.split("Better step:")[1].strip()
-                    # Only use if it's reasonable
-                    if enhanced_step and 5 < len(enhanced_step) < 100:
-                        enhanced_steps.append(enhanced_step)
-                    else:
-                        enhanced_steps.append(step)
-                else:
+            for step in additional_steps:
+                step = step.strip()
+                if step and 5 < len(step) < 100:
                     enhanced_steps.append(step)
-            
-            # If we need more steps, try to generate them
-            if len(enhanced_steps) < step_count:
-                existing_steps_text = "\n".join([f"{i+1}. {s}" for i, s in enumerate(enhanced_steps)])
-                
-                prompt = f"Task: {task_description}\nExisting steps:\n{existing_steps_text}\n\nAdditional steps:\n{len(enhanced_steps)+1}."
-                
-                result = self.generator(prompt, max_length=150, num_return_sequences=1)[0]['generated_text']
-                
-                # Try to extract additional steps
-                if f"{len(enhanced_steps)+1}." in result:
-                    additional_text = result.split(f"{len(enhanced_steps)+1}.")[1]
-                    additional_steps = re.findall(r'\d+\.\s*(.*?)(?=\d+\.|$)', additional_text + "999.")
-                    
-                    for step in additional_steps:
-                        step = step.strip()
-                        if step and 5 < len(step) < 100:
-                            enhanced_steps.append(step)
-                            if len(enhanced_steps) >= step_count:
-                                break
-            
-            # If we still don't have enough steps, add generic ones
-            while len(enhanced_steps) < step_count:
-                enhanced_steps.append(f"Continue progress on {task_description}")
-            
-            return enhanced_steps
+                    if len(enhanced_steps) >= step_count:
+                        break
         
-        except Exception as e:
-            logger.error(f"Error enhancing steps with AI: {str(e)}")
-            return basic_steps
+        # If we still don't have enough steps, add generic ones
+        while len(enhanced_steps) < step_count:
+            enhanced_steps.append(f"Continue progress on {task_description}")
+        
+        return enhanced_steps
     
-    def _create_task_overview(self, task_description: str) -> str:
+    def _create_task_overview(self, task_description: str, result: Optional[str] = None) -> str:
         """Create an overview for the task."""
-        if self.generator:
-            try:
-                prompt = f"Write a brief, encouraging overview for breaking down this task: {task_description}. Keep it under 3 sentences."
-                
-                result = self.generator(prompt, max_length=150, num_return_sequences=1)[0]['generated_text']
-                
-                # Try to extract just the overview
-                if "sentences." in result:
-                    overview = result.split("sentences.")[1].strip()
-                    if overview and len(overview) > 30:
-                        return overview
-            except Exception as e:
-                logger.error(f"Error generating overview: {str(e)}")
+        # Try to extract just the overview
+        if result and "sentences." in result:
+            overview = result.split("sentences.")[1].strip()
+            if overview and len(overview) > 30:
+                return overview
         
         # Fallback to template overview
         return f"Breaking down '{task_description}' into manageable steps will help you make steady progress without feeling overwhelmed. Each step builds on the previous one to help you complete the task efficiently."
@@ -325,7 +633,7 @@ class TaskBreakdown:
         else:
             return "Low"  # Later steps are low priority
     
-    def _generate_adhd_tip(self) -> str:
+    def _generate_adhd_tip(self, result: Optional[str] = None) -> str:
         """Generate an ADHD-friendly tip for a task step."""
         tips = [
             "Use a colorful pen to make this step more engaging!",
@@ -345,23 +653,15 @@ class TaskBreakdown:
             "Try the '5-4-3-2-1' grounding technique if you feel scattered (notice 5 things you see, 4 things you touch, etc.)",
         ]
         
-        # Try to generate a custom tip if generator is available
-        if self.generator:
-            try:
-                prompt = "Generate a brief ADHD-friendly productivity tip to help with focus. Tip:"
-                
-                result = self.generator(prompt, max_length=50, num_return_sequences=1)[0]['generated_text']
-                
-                if "Tip:" in result:
-                    tip = result.split("Tip:")[1].strip()
-                    if tip and 10 < len(tip) < 100:
-                        return tip
-            except Exception:
-                pass  # Silently fall back to template tips
+        # Use the generated tip if there is a usable one
+        if result and "Tip:" in result:
+            tip = result.split("Tip:")[1].strip()
+            if tip and 10 < len(tip) < 100:
+                return tip
         
         return random.choice(tips)
     
-    def _generate_reward_suggestion(self, task_description: str) -> str:
+    def _generate_reward_suggestion(self, result: Optional[str] = None) -> str:
         """Generate a reward suggestion for completing the task."""
         rewards = [
             "Watch a short funny video after completing this section!",
@@ -381,19 +681,11 @@ class TaskBreakdown:
             "Add a sticker or checkmark to your progress tracker!"
         ]
         
-        # Try to generate a custom reward if generator is available
-        if self.generator:
-            try:
-                prompt = f"Suggest a small, specific reward for completing this task: {task_description}"
-                
-                result = self.generator(prompt, max_length=50, num_return_sequences=1)[0]['generated_text']
-                
-                if ":" in result:
-                    reward = result.split(":")[1].strip()
-                    if reward and 10 < len(reward) < 150:
-                        return reward
-            except Exception:
-                pass  # Silently fall back to template rewards
+        # Use the generated reward if there is a usable one
+        if result and ":" in result:
+            reward = result.split(":")[1].strip()
+            if reward and 10 < len(reward) < 150:
+                return reward
         
         return random.choice(rewards)
 
@@ -0,0 +1,142 @@
+"""
+Deterministic local corpora for the benchmarks.
+
+Pages are generated from a fixed seed so results are comparable between
+runs and machines without network access or checked-in fixtures.
+"""
+import random
+from typing import List, Tuple
+
+WORDS = (
+    "student learning memory attention focus research method result theory practice "
+    "evidence analysis system process project budget schedule lecture chapter essay "
+    "review summary question answer concept model example experiment data network "
+    "history culture language science biology physics economics planning strategy "
+    "habit routine feedback progress motivation reward deadline priority outline draft"
+).split()
+
+NAV_LINKS = ["Home", "About", "Blog", "Courses", "Contact", "Login", "Sign up", "Pricing"]
+
+
+def sentence(rng: random.Random, min_words: int = 8, max_words: int = 22) -> str:
+    words = [rng.choice(WORDS) for _ in range(rng.randint(min_words, max_words))]
+    if len(words) > 10:
+        words.insert(rng.randint(3, len(words) - 3), ",")
+    text = " ".join(words).replace(" ,", ",")
+    return text[0].upper() + text[1:] + rng.choice([".", ".", ".", "?", "!"])
+
+
+def paragraph(rng: random.Random, sentences: int = 5) -> str:
+    return " ".join(sentence(rng) for _ in range(sentences))
+
+
+def text_document(words: int, seed: int = 0) -> str:
+    """Plain text of roughly the given number of words, split into paragraphs."""
+    rng = random.Random(seed)
+    paragraphs = []
+    count = 0
+    while count < words:
+        para = paragraph(rng, rng.randint(3, 7))
+        paragraphs.append(para)
+        count += len(para.split())
+    return "\n\n".join(paragraphs)
+
+
+FUNCTION_WORDS = "the a of and to in is that for on with as by this are from was it".split()
+SYLLABLES = "ba co de fi gu ka le mo ni pa ro sa te vi lu mer tan cor pol sin dra ven".split()
+
+
+def study_document(words: int, seed: int = 0, vocabulary: int = 5000) -> str:
+    """
+    Textbook-like text with a Zipf-distributed vocabulary of `vocabulary` made-up
+    terms mixed with function words, so term salience and answer deduplication
+    behave as on real documents (text_document draws from only a few dozen words).
+    """
+    rng = random.Random(seed)
+    terms = list(dict.fromkeys(
+        "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))) for _ in range(vocabulary * 2)
+    ))[:vocabulary]
+    cumulative = []
+    total = 0.0
+    for rank in range(1, len(terms) + 1):
+        total += 1.0 / rank
+        cumulative.append(total)
+
+    paragraphs = []
+    count = 0
+    while count < words:
+        sentences = []
+        for _ in range(rng.randint(3, 7)):
+            length = rng.randint(8, 22)
+            drawn = rng.choices(terms, cum_weights=cumulative, k=length)
+            tokens = [term if rng.random() < 0.6 else rng.choice(FUNCTION_WORDS) for term in drawn]
+            text = " ".join(tokens)
+            sentences.append(text[0].upper() + text[1:] + rng.choice([".", ".", ".", "?", "!"]))
+            count += length
+        paragraphs.append(" ".join(sentences))
+    return "\n\n".join(paragraphs)
+
+
+def html_page(paragraphs: int, seed: int = 0) -> Tuple[str, List[str]]:
+    """
+    A realistic-looking article page with navigation, sidebar, comments,
+    inline scripts and styles around the article body.
+
+    Returns:
+        (html, article_paragraphs) where article_paragraphs is the gold main content
+    """
+    rng = random.Random(seed)
+    article = [paragraph(rng, rng.randint(3, 6)) for _ in range(paragraphs)]
+
+    script = "var tracking = {" + ", ".join(f"k{i}: '{'x' * 40}'" for i in range(200)) + "};"
+    style = " ".join(f".c{i} {{ margin: {i}px; padding: {i}px; }}" for i in range(200))
+    nav = "".join(f'<li><a href="/{link.lower()}">{link}</a></li>' for link in NAV_LINKS)
+    sidebar = "".join(
+        f'<p><a href="/post/{i}">{sentence(rng, 4, 8)}</a></p>' for i in range(10)
+    )
+    comments = "".join(
+        f'<div class="comment"><p>{sentence(rng, 5, 12)}</p></div>' for _ in range(max(3, paragraphs // 4))
+    )
+    body = "".join(f"<p>{p}</p>" for p in article)
+
+    html = f"""<!DOCTYPE html>
+<html><head><title>Article {seed}</title><style>{style}</style><script>{script}</script></head>
+<body>
+<header><div class="logo">TaskTamer Test Site</div><nav><ul>{nav}</ul></nav></header>
+<div class="layout">
+  <aside class="sidebar"><h3>Related</h3>{sidebar}</aside>
+  <div class="post-content"><article><h1>Article {seed}</h1>{body}</article></div>
+  <div class="comments">{comments}</div>
+</div>
+<footer><p>Copyright TaskTamer test site. All rights reserved.</p><script>{script}</script></footer>
+</body></html>"""
+    return html, article
+
+
+def html_corpus(sizes=(5, 20, 80, 320), seed: int = 0) -> List[Tuple[str, str, List[str]]]:
+    """List of (name, html, gold_paragraphs) for pages of increasing size."""
+    return [(f"page_{size}p", *html_page(size, seed + i)) for i, size in enumerate(sizes)]
+
+
+def task_descriptions() -> List[str]:
+    return [
+        "Write a research paper on AI ethics",
+        "Create a personal budget plan for the next year",
+        "Organize a virtual conference for 100+ attendees",
+        "Design a marketing campaign for a new product",
+        "Plan a website redesign project",
+        "Study for my biology final exam",
+        "Prepare a presentation about climate change",
+    ]
+
+
+def chat_questions() -> List[str]:
+    return [
+        "How do I break a big task into steps?",
+        "Can TaskTamer summarize a web page?",
+        "How does the quiz work?",
+        "Who made this app?",
+        "Any tips for staying focused?",
+        "I keep procrastinating, what should I do?",
+        "What is the weather like today?",
+    ]
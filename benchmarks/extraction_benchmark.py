@@ -0,0 +1,92 @@
+"""
+Compare HTML extraction backends on throughput and output quality.
+
+Quality is token-level precision/recall/F1 against the known article text of
+the generated corpus pages. Extra pages can be added with --corpus DIR
+(*.html files); those are timed but have no gold text to score against.
+
+Usage:
+    python benchmarks/extraction_benchmark.py [--repeat 5] [--corpus DIR] [--json out.json]
+"""
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.extraction import EXTRACTORS  # noqa: E402
+from benchmarks.corpus import html_corpus  # noqa: E402
+
+
+def token_f1(extracted: str, gold: str) -> dict:
+    got = Counter(extracted.split())
+    want = Counter(gold.split())
+    overlap = sum((got & want).values())
+    precision = overlap / max(1, sum(got.values()))
+    recall = overlap / max(1, sum(want.values()))
+    f1 = 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+    return {"precision": round(precision, 3), "recall": round(recall, 3), "f1": round(f1, 3)}
+
+
+def available_extractors():
+    names = []
+    for name, extractor in EXTRACTORS.items():
+        try:
+            extractor("<html><body><p>probe</p></body></html>")
+            names.append(name)
+        except ImportError:
+            print(f"skipping {name}: dependency not installed", file=sys.stderr)
+    return names
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--corpus", help="Directory with additional *.html pages")
+    parser.add_argument("--json", help="Write results to this file")
+    args = parser.parse_args()
+
+    pages = [(name, html, "\n".join(gold)) for name, html, gold in html_corpus()]
+    if args.corpus:
+        for path in sorted(glob.glob(os.path.join(args.corpus, "*.html"))):
+            with open(path, encoding="utf-8", errors="replace") as f:
+                pages.append((os.path.basename(path), f.read(), None))
+
+    results = []
+    for name in available_extractors():
+        extractor = EXTRACTORS[name]
+        for page_name, html, gold in pages:
+            start = time.perf_counter()
+            for _ in range(args.repeat):
+                text = extractor(html)
+            seconds = (time.perf_counter() - start) / args.repeat
+            row = {
+                "extractor": name,
+                "page": page_name,
+                "kb": round(len(html) / 1024, 1),
+                "ms": round(seconds * 1000, 2),
+                "mb_per_s": round(len(html) / 1024 / 1024 / seconds, 2),
+            }
+            if gold is not None:
+                row.update(token_f1(text, gold))
+            results.append(row)
+
+    header = f"{'extractor':<10} {'page':<16} {'KB':>8} {'ms':>9} {'MB/s':>7} {'prec':>6} {'recall':>6} {'f1':>6}"
+    print(header)
+    print("-" * len(header))
+    for row in results:
+        print(f"{row['extractor']:<10} {row['page']:<16} {row['kb']:>8} {row['ms']:>9} {row['mb_per_s']:>7} "
+              f"{row.get('precision', '-'):>6} {row.get('recall', '-'):>6} {row.get('f1', '-'):>6}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
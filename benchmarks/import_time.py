@@ -0,0 +1,73 @@
+"""
+Measure how long it takes to import the backend in a fresh interpreter.
+
+Fails (exit code 1) if the import exceeds the time budget or if heavy
+model libraries were imported eagerly.
+
+Usage:
+    python benchmarks/import_time.py [--budget-ms 500] [--runs 5]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MODULES = [
+    "backend.task_breakdown",
+    "backend.summarization",
+    "backend.question_generation",
+    "backend.chat_assistant",
+]
+
+# Libraries that must only be imported on the first generative call
+HEAVY_MODULES = ["transformers", "torch"]
+
+PROBE = """
+import importlib, json, sys, time
+start = time.perf_counter()
+for name in {modules!r}:
+    importlib.import_module(name)
+elapsed = time.perf_counter() - start
+print(json.dumps({{"seconds": elapsed, "heavy": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+def measure_once() -> dict:
+    code = PROBE.format(modules=MODULES, heavy=HEAVY_MODULES)
+    output = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--budget-ms", type=float, default=500.0, help="Maximum median import time in milliseconds")
+    parser.add_argument("--runs", type=int, default=5, help="Number of fresh interpreters to measure")
+    args = parser.parse_args()
+
+    results = [measure_once() for _ in range(args.runs)]
+    median_ms = statistics.median(r["seconds"] for r in results) * 1000
+    heavy = sorted({m for r in results for m in r["heavy"]})
+
+    print(json.dumps({"median_ms": round(median_ms, 1), "budget_ms": args.budget_ms, "heavy_imported": heavy}))
+
+    if heavy:
+        print(f"FAIL: heavy modules imported eagerly: {', '.join(heavy)}", file=sys.stderr)
+        return 1
+    if median_ms > args.budget_ms:
+        print(f"FAIL: import took {median_ms:.1f}ms (budget {args.budget_ms:.0f}ms)", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
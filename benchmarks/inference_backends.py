@@ -0,0 +1,164 @@
+"""
+Compare text-generation inference backends (pytorch, int8, onnx) for the
+task breakdown model on load time, tokens/sec and resident memory, and check
+that their greedy outputs agree with the fp32 PyTorch reference.
+
+Each backend runs in its own interpreter so resident memory is not shared
+between them. Parity is the fraction of leading generated tokens that match
+the reference, averaged over prompts; the run fails if any backend falls
+below --min-agreement.
+
+Usage:
+    python benchmarks/inference_backends.py [--backends pytorch,int8,onnx] [--new-tokens 40] [--json out.json]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks.corpus import task_descriptions  # noqa: E402
+
+
+def rss_mb() -> float:
+    """Current resident set size of this process in MB."""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    import resource
+
+    # Peak rather than current RSS where /proc is unavailable (ru_maxrss is bytes on macOS)
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+
+def prompts():
+    return [f"Break down the task of '{task}' into steps:\n1." for task in task_descriptions()]
+
+
+def run_backend(backend: str, new_tokens: int, repeat: int) -> dict:
+    """Worker mode: load one backend, generate greedily and report measurements."""
+    from backend.model_registry import get_pipeline, stats
+    from backend.task_breakdown import GENERATION_TASK, GENERATION_MODEL
+
+    baseline_mb = rss_mb()
+    start = time.perf_counter()
+    generator = get_pipeline(GENERATION_TASK, GENERATION_MODEL, backend=backend)
+    load_seconds = time.perf_counter() - start
+    loaded_backend = stats()["models"][0]["loaded_backend"]
+
+    inputs = prompts()
+    # Warm-up so one-off graph/kernel initialisation is not timed
+    generator(inputs[0], max_new_tokens=4, do_sample=False)
+
+    outputs = []
+    tokens = 0
+    start = time.perf_counter()
+    for _ in range(repeat):
+        outputs = []
+        for prompt in inputs:
+            text = generator(prompt, max_new_tokens=new_tokens, do_sample=False,
+                             return_full_text=False)[0]["generated_text"]
+            ids = generator.tokenizer(text)["input_ids"]
+            tokens += len(ids)
+            outputs.append(ids)
+    seconds = time.perf_counter() - start
+
+    return {
+        "backend": backend,
+        "loaded_backend": loaded_backend,
+        "load_s": round(load_seconds, 2),
+        "tokens_per_s": round(tokens / seconds, 1),
+        "rss_mb": round(rss_mb(), 1),
+        "model_mb": round(rss_mb() - baseline_mb, 1),
+        "outputs": outputs,
+    }
+
+
+def agreement(reference: list, candidate: list) -> float:
+    """Mean fraction of leading tokens each output shares with the reference."""
+    scores = []
+    for ref, got in zip(reference, candidate):
+        matched = 0
+        for a, b in zip(ref, got):
+            if a != b:
+                break
+            matched += 1
+        scores.append(matched / max(1, len(ref)))
+    return sum(scores) / max(1, len(scores))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backends", default="pytorch,int8,onnx")
+    parser.add_argument("--new-tokens", type=int, default=40)
+    parser.add_argument("--repeat", type=int, default=2)
+    parser.add_argument("--min-agreement", type=float, default=0.8)
+    parser.add_argument("--json", help="Write results to this file")
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(run_backend(args.worker, args.new_tokens, args.repeat)))
+        return 0
+
+    backends = [name.strip() for name in args.backends.split(",") if name.strip()]
+    # The fp32 PyTorch pipeline is the reference every other backend is checked against
+    if "pytorch" not in backends:
+        backends.insert(0, "pytorch")
+
+    results = []
+    for backend in backends:
+        proc = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--worker", backend,
+             "--new-tokens", str(args.new_tokens), "--repeat", str(args.repeat)],
+            capture_output=True, text=True, cwd=ROOT,
+        )
+        if proc.returncode != 0:
+            print(f"skipping {backend}: {proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else 'failed'}",
+                  file=sys.stderr)
+            continue
+        results.append(json.loads(proc.stdout.strip().splitlines()[-1]))
+
+    reference = next((row for row in results if row["backend"] == "pytorch"), None)
+    if reference is None:
+        print("pytorch reference backend could not run (is transformers installed?)", file=sys.stderr)
+        return 1
+
+    failed = False
+    for row in results:
+        row["agreement"] = round(agreement(reference["outputs"], row["outputs"]), 3)
+        row["speedup"] = round(row["tokens_per_s"] / reference["tokens_per_s"], 2)
+        if row["loaded_backend"] != row["backend"]:
+            print(f"{row['backend']}: fell back to {row['loaded_backend']}", file=sys.stderr)
+        if row["agreement"] < args.min_agreement:
+            failed = True
+    for row in results:
+        del row["outputs"]
+
+    header = f"{'backend':<9} {'load s':>7} {'tok/s':>8} {'speedup':>8} {'RSS MB':>8} {'model MB':>9} {'parity':>7}"
+    print(header)
+    print("-" * len(header))
+    for row in results:
+        print(f"{row['backend']:<9} {row['load_s']:>7} {row['tokens_per_s']:>8} {row['speedup']:>8} "
+              f"{row['rss_mb']:>8} {row['model_mb']:>9} {row['agreement']:>7}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+    if failed:
+        print(f"parity below {args.min_agreement} for at least one backend", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,163 @@
+"""
+Load-test the JSON API (backend/server.py) and report requests/sec and latency.
+
+Starts a local server unless --url points at a running one, then keeps
+--concurrency requests in flight for --duration seconds, cycling through the
+endpoints with payloads from the benchmark corpus. By default every request
+is unique so memoized results do not inflate throughput; --repeat-payloads
+measures the warm-cache case instead.
+
+Usage:
+    python benchmarks/load_test.py [--concurrency 16] [--duration 20] [--endpoints ask,summarize]
+    python benchmarks/load_test.py --url http://127.0.0.1:8000 --json results.json
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from collections import Counter, defaultdict
+
+from tornado.httpclient import AsyncHTTPClient, HTTPClientError
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks.corpus import chat_questions, task_descriptions, text_document  # noqa: E402
+
+
+def payloads(endpoint: str):
+    """Endless iterator of request bodies for an endpoint."""
+    if endpoint in ("break_down_task", "break_task"):
+        return ({"task": task} for task in itertools.cycle(task_descriptions()))
+    if endpoint == "ask":
+        return ({"question": question} for question in itertools.cycle(chat_questions()))
+    texts = [text_document(words, seed=seed) for seed, words in enumerate((300, 1000, 3000))]
+    if endpoint == "quiz":
+        return ({"content": text, "num_questions": 5} for text in itertools.cycle(texts))
+    return ({"content": text} for text in itertools.cycle(texts))
+
+
+def make_unique(body: dict, counter: int) -> dict:
+    """Change the text slightly so no two requests share a memoization key."""
+    body = dict(body)
+    field = next(key for key in ("content", "task", "question") if key in body)
+    body[field] = f"{body[field]} ({counter})"
+    return body
+
+
+async def run_load(base_url: str, endpoints, concurrency: int, duration: float, unique: bool) -> dict:
+    client = AsyncHTTPClient(max_clients=concurrency)
+    sources = {endpoint: payloads(endpoint) for endpoint in endpoints}
+    schedule = itertools.cycle(endpoints)
+    counter = itertools.count()
+    latencies = defaultdict(list)
+    statuses = defaultdict(Counter)
+    deadline = time.perf_counter() + duration
+
+    async def worker():
+        while time.perf_counter() < deadline:
+            endpoint = next(schedule)
+            body = next(sources[endpoint])
+            if unique:
+                body = make_unique(body, next(counter))
+            start = time.perf_counter()
+            try:
+                response = await client.fetch(f"{base_url}/api/{endpoint}", method="POST", body=json.dumps(body),
+                                              headers={"Content-Type": "application/json"}, request_timeout=120)
+                status = response.code
+            except HTTPClientError as e:
+                status = e.code
+            except OSError:
+                status = 0
+            latencies[endpoint].append(time.perf_counter() - start)
+            statuses[endpoint][status] += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    client.close()
+
+    def summary(values):
+        values = sorted(values)
+        pick = lambda q: round(values[min(len(values) - 1, int(q * len(values)))] * 1000, 1)  # noqa: E731
+        return {"requests": len(values), "p50_ms": pick(0.5), "p90_ms": pick(0.9), "p99_ms": pick(0.99),
+                "mean_ms": round(statistics.fmean(values) * 1000, 1)}
+
+    all_latencies = [value for values in latencies.values() for value in values]
+    return {
+        "concurrency": concurrency,
+        "seconds": round(elapsed, 2),
+        "requests_per_s": round(len(all_latencies) / elapsed, 1),
+        "overall": summary(all_latencies) if all_latencies else {},
+        "endpoints": {
+            endpoint: {**summary(values), "statuses": dict(statuses[endpoint])}
+            for endpoint, values in latencies.items()
+        },
+    }
+
+
+def start_server(port: int, concurrency: int) -> subprocess.Popen:
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "backend.server", "--port", str(port), "--concurrency", str(concurrency)],
+        cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    # Wait for warm-up to finish and the port to accept connections
+    import urllib.request
+    for _ in range(300):
+        try:
+            urllib.request.urlopen(f"http://127.0.0.1:{port}/health", timeout=1)
+            return proc
+        except OSError:
+            if proc.poll() is not None:
+                raise RuntimeError("API server exited during startup")
+            time.sleep(0.2)
+    proc.terminate()
+    raise RuntimeError("API server did not become ready")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="Base URL of a running server (default: start one locally)")
+    parser.add_argument("--port", type=int, default=8765, help="Port for the locally started server")
+    parser.add_argument("--server-concurrency", type=int, default=os.cpu_count() or 4)
+    parser.add_argument("--concurrency", type=int, default=16, help="Requests kept in flight")
+    parser.add_argument("--duration", type=float, default=20.0)
+    parser.add_argument("--endpoints", default="break_down_task,break_task,summarize,quiz,ask")
+    parser.add_argument("--repeat-payloads", action="store_true", help="Reuse identical payloads (warm caches)")
+    parser.add_argument("--json", help="Write results to this file")
+    args = parser.parse_args()
+
+    endpoints = [name.strip() for name in args.endpoints.split(",") if name.strip()]
+    server = None
+    base_url = args.url
+    if not base_url:
+        server = start_server(args.port, args.server_concurrency)
+        base_url = f"http://127.0.0.1:{args.port}"
+
+    try:
+        results = asyncio.run(run_load(base_url.rstrip("/"), endpoints, args.concurrency, args.duration,
+                                       unique=not args.repeat_payloads))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    print(f"{results['requests_per_s']} requests/s over {results['seconds']}s at concurrency {args.concurrency}")
+    print(f"{'endpoint':<16} {'requests':>9} {'p50 ms':>9} {'p90 ms':>9} {'p99 ms':>9}  statuses")
+    for endpoint, row in results["endpoints"].items():
+        print(f"{endpoint:<16} {row['requests']:>9} {row['p50_ms']:>9} {row['p90_ms']:>9} {row['p99_ms']:>9}  "
+              f"{row['statuses']}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
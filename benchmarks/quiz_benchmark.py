@@ -0,0 +1,113 @@
+"""
+Benchmark large-quiz generation (generate_quiz) on long documents.
+
+For each document size (halving down from --words) the document cache is
+cleared and a --questions quiz is generated from scratch, reporting total
+time, time per 1,000 words, time to the first question from the lazy
+iter_quiz (again from a cleared cache), and how well questions
+cover the document: the share of its sections that got a question, and
+whether any sentence or answer was used twice.
+
+Usage:
+    python benchmarks/quiz_benchmark.py [--words 100000] [--questions 200] [--json results.json]
+
+Exits with 1 if a quiz repeats a sentence or answer, or if the per-word cost at
+--words exceeds --max-growth times the cost at the smallest size (generation
+is meant to stay linear in document length).
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks.corpus import study_document  # noqa: E402
+
+
+def run_size(words: int, questions: int, seed: int) -> dict:
+    from backend.document import analyze, clear_cache
+    from backend.question_generation import generate_quiz, iter_quiz
+    from backend.quiz_selection import rank_blanks, spread_blanks
+
+    text = study_document(words, seed=seed)
+    clear_cache()
+
+    start = time.perf_counter()
+    generated = generate_quiz(content=text, num_questions=questions, refresh=True)
+    total_s = time.perf_counter() - start
+
+    clear_cache()
+    start = time.perf_counter()
+    next(iter_quiz(content=text, num_questions=questions), None)
+    first_s = time.perf_counter() - start
+
+    # Coverage from the same (now cached) ranking the quiz was built from
+    document = analyze(text)
+    ranked = rank_blanks(document) or []
+    sections = max(1, min(questions, len(ranked)))
+    covered = {blank.sentence * sections // len(document) for blank in spread_blanks(document, ranked, questions)}
+
+    answers = [question["answer"].lower() for question in generated]
+    texts = [question["question"] for question in generated]
+    return {
+        "words": words,
+        "sentences": len(document),
+        "questions": len(generated),
+        "total_ms": round(total_s * 1000, 1),
+        "first_question_ms": round(first_s * 1000, 1),
+        "ms_per_1k_words": round(total_s * 1000 / (words / 1000), 3),
+        "section_coverage": round(len(covered) / sections, 3),
+        "duplicate_answers": len(answers) - len(set(answers)),
+        "duplicate_sentences": len(texts) - len(set(texts)),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--words", type=int, default=100_000, help="Largest document size")
+    parser.add_argument("--sizes", type=int, default=4, help="Number of sizes, halving from --words")
+    parser.add_argument("--questions", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--max-growth", type=float, default=2.0,
+                        help="Allowed growth of the per-word cost from the smallest to the largest size")
+    parser.add_argument("--json", help="Write results to this file")
+    args = parser.parse_args()
+
+    from backend.quiz_selection import get_tagger, term_salience
+
+    # Imports and the tagger load are one-off costs, not per-document ones
+    term_salience(["Warm up the salience scorer imports."])
+    get_tagger()
+
+    sizes = sorted(max(1000, args.words >> shift) for shift in range(args.sizes))
+    results = [run_size(words, args.questions, args.seed) for words in sizes]
+
+    print(f"{'words':>8} {'sentences':>10} {'questions':>10} {'total ms':>9} {'first ms':>9} "
+          f"{'ms/1k words':>12} {'coverage':>9} {'dup ans':>8} {'dup sent':>9}")
+    for row in results:
+        print(f"{row['words']:>8} {row['sentences']:>10} {row['questions']:>10} "
+              f"{row['total_ms']:>9} {row['first_question_ms']:>9} {row['ms_per_1k_words']:>12} "
+              f"{row['section_coverage']:>9} {row['duplicate_answers']:>8} {row['duplicate_sentences']:>9}")
+
+    growth = results[-1]["ms_per_1k_words"] / max(results[0]["ms_per_1k_words"], 1e-9)
+    print(f"per-word cost growth from {results[0]['words']} to {results[-1]['words']} words: {growth:.2f}x")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"results": results, "growth": round(growth, 3)}, f, indent=2)
+
+    failed = False
+    if any(row["duplicate_answers"] or row["duplicate_sentences"] for row in results):
+        print("FAIL: a quiz repeated a sentence or an answer")
+        failed = True
+    if growth > args.max_growth:
+        print(f"FAIL: per-word cost grew more than {args.max_growth}x")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,229 @@
+"""
+Benchmark every backend entry point on fixed local corpora.
+
+Covers break_down_task, TaskBreakdown.break_task, summarize_content (text and
+URL), generate_quiz, ask_question and fetch_webpage_content. Web pages are
+served by a local HTTP stub so runs do not depend on the network. Memoized
+functions are called through their `.uncached` implementation or with
+refresh=True, and every fetch uses a fresh URL so the content cache never
+answers it. The analyzed-document cache, which also holds each Document's quiz
+blank ranking, is cleared before every summarize and quiz call, so each call
+splits, tokenizes and ranks its text from scratch.
+
+Each case reports latency percentiles, throughput and peak Python memory
+(tracemalloc, measured on a separate call so it does not skew timings).
+Results can be saved as JSON and compared against an earlier run:
+
+    python benchmarks/run_benchmarks.py --json before.json
+    python benchmarks/run_benchmarks.py --compare before.json [--threshold 0.2]
+
+--compare exits with 1 if any case's p50 latency regressed by more than the threshold
+(and by more than --min-delta-ms in absolute terms).
+"""
+import argparse
+import fnmatch
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# Keep benchmark fetches out of the user's content cache
+os.environ.setdefault("TASKTAMER_CACHE_DIR", tempfile.mkdtemp(prefix="tasktamer-bench-"))
+
+from benchmarks.corpus import chat_questions, html_corpus, task_descriptions, text_document  # noqa: E402
+
+TEXT_SIZES = (500, 5_000, 50_000)
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    pages: Dict[str, bytes] = {}
+
+    def do_GET(self):
+        body = self.pages.get(self.path.split("?")[0])
+        if body is None:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_stub(pages: Dict[str, str]) -> Tuple[ThreadingHTTPServer, str]:
+    """Serve {path: html} on a free localhost port; returns the server and its base URL."""
+    _StubHandler.pages = {path: html.encode("utf-8") for path, html in pages.items()}
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def build_cases(base_url: str, pages: List[str]) -> List[Tuple[str, Callable[[int], object]]]:
+    """List of (name, fn) where fn(i) runs one call of iteration i."""
+    from backend.task_breakdown import TaskBreakdown, break_down_task
+    from backend.summarization import fetch_webpage_content, summarize_content
+    from backend.question_generation import generate_quiz
+    from backend.chat_assistant import ask_question
+    from backend.document import clear_cache
+
+    def fresh(fn: Callable[..., object], **kwargs) -> object:
+        # refresh=True skips the memo; clearing the Document cache stops the call
+        # reusing the sentence split, tokens and blank ranking of the warm-up
+        clear_cache()
+        return fn(refresh=True, **kwargs)
+
+    tasks = task_descriptions()
+    questions = chat_questions()
+    texts = {words: text_document(words, seed=words) for words in TEXT_SIZES}
+    breakdown = TaskBreakdown()
+
+    cases = [("break_down_task", lambda i: break_down_task.uncached(tasks[i % len(tasks)]))]
+    for level in ("basic", "standard", "comprehensive"):
+        cases.append((f"break_task[{level}]",
+                      lambda i, level=level: breakdown.break_task(tasks[i % len(tasks)], level)))
+    for words, text in texts.items():
+        cases.append((f"summarize_content[text_{words}w]", lambda i, text=text: fresh(summarize_content, content=text)))
+    for page in pages:
+        # A fresh query string per call keeps the content cache from answering
+        url = f"{base_url}/{page}"
+        cases.append((f"summarize_content[url_{page}]",
+                      lambda i, url=url: fresh(summarize_content, url=f"{url}?run={time.time_ns()}")))
+        cases.append((f"fetch_webpage_content[{page}]",
+                      lambda i, url=url: fetch_webpage_content(f"{url}?run={time.time_ns()}")))
+    for words, text in texts.items():
+        cases.append((f"generate_quiz[text_{words}w]",
+                      lambda i, text=text: fresh(generate_quiz, content=text, num_questions=5)))
+    cases.append(("ask_question", lambda i: ask_question(questions[i % len(questions)])))
+    return cases
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    index = min(len(sorted_values) - 1, max(0, round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def measure(fn: Callable[[int], object], iterations: int, min_seconds: float) -> Dict[str, float]:
+    fn(0)  # warm-up: imports, lazy indexes, connection pools
+
+    latencies = []
+    start = time.perf_counter()
+    i = 0
+    while i < iterations or time.perf_counter() - start < min_seconds:
+        call_start = time.perf_counter()
+        fn(i)
+        latencies.append(time.perf_counter() - call_start)
+        i += 1
+    total = time.perf_counter() - start
+
+    tracemalloc.start()
+    fn(i)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    latencies.sort()
+    return {
+        "runs": len(latencies),
+        "mean_ms": round(statistics.fmean(latencies) * 1000, 3),
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 3),
+        "p90_ms": round(percentile(latencies, 0.90) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 3),
+        "ops_per_s": round(len(latencies) / total, 2),
+        "peak_kb": round(peak / 1024, 1),
+    }
+
+
+def environment() -> Dict[str, str]:
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                cwd=ROOT).stdout.strip()
+    except OSError:
+        commit = ""
+    return {
+        "commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+    }
+
+
+def compare(baseline: Dict, current: Dict, threshold: float, min_delta_ms: float) -> bool:
+    """Print p50 changes per case; returns True if any case regressed beyond the threshold."""
+    before = {row["case"]: row for row in baseline["results"]}
+    regressed = False
+    print(f"\n{'case':<42} {'before p50':>11} {'after p50':>11} {'change':>8}")
+    for row in current["results"]:
+        old = before.get(row["case"])
+        if old is None:
+            print(f"{row['case']:<42} {'-':>11} {row['p50_ms']:>11} {'new':>8}")
+            continue
+        change = (row["p50_ms"] - old["p50_ms"]) / old["p50_ms"] if old["p50_ms"] else 0.0
+        flag = ""
+        # Sub-millisecond cases are noisy; ignore relative swings smaller than min_delta_ms
+        if change > threshold and row["p50_ms"] - old["p50_ms"] > min_delta_ms:
+            regressed = True
+            flag = "  REGRESSION"
+        print(f"{row['case']:<42} {old['p50_ms']:>11} {row['p50_ms']:>11} {change:>+8.1%}{flag}")
+    return regressed
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=20, help="Minimum timed calls per case")
+    parser.add_argument("--min-seconds", type=float, default=0.5, help="Minimum timed duration per case")
+    parser.add_argument("--only", help="Glob selecting cases, e.g. 'summarize_content*'")
+    parser.add_argument("--pages", help="Directory of saved *.html pages to serve in addition to the generated ones")
+    parser.add_argument("--json", help="Write results to this file")
+    parser.add_argument("--compare", help="Baseline JSON from an earlier run")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Allowed p50 slowdown before failing")
+    parser.add_argument("--min-delta-ms", type=float, default=0.1, help="Ignore p50 slowdowns smaller than this")
+    args = parser.parse_args()
+
+    pages = {f"/{name}.html": html for name, html, _ in html_corpus(sizes=(5, 80))}
+    if args.pages:
+        for name in sorted(os.listdir(args.pages)):
+            if name.endswith(".html"):
+                with open(os.path.join(args.pages, name), encoding="utf-8", errors="replace") as f:
+                    pages[f"/{name}"] = f.read()
+    server, base_url = start_stub(pages)
+
+    results = []
+    try:
+        for name, fn in build_cases(base_url, [path.lstrip("/") for path in pages]):
+            if args.only and not fnmatch.fnmatch(name, args.only):
+                continue
+            row = {"case": name, **measure(fn, args.iterations, args.min_seconds)}
+            results.append(row)
+            print(f"{name:<42} p50 {row['p50_ms']:>9} ms  p99 {row['p99_ms']:>9} ms  "
+                  f"{row['ops_per_s']:>9} ops/s  peak {row['peak_kb']:>9} KB", flush=True)
+    finally:
+        server.shutdown()
+
+    report = {"environment": environment(), "results": results}
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if compare(baseline, report, args.threshold, args.min_delta_ms):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
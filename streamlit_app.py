@@ -4,10 +4,14 @@ from bs4 import BeautifulSoup
 import re
 import json
 import random
-from backend.task_breakdown import break_down_task
-from backend.summarization import summarize_content
-from backend.question_generation import generate_quiz
+import itertools
+import os
+import tempfile
+from contextlib import contextmanager
+from backend.task_breakdown import iter_break_down_task
 from backend.chat_assistant import ask_question
+from backend.question_generation import MAX_QUESTIONS as MAX_QUIZ_QUESTIONS
+from backend import jobs, metrics
 import about_page
 
 st.set_page_config(
@@ -183,6 +187,31 @@ def success_box(text):
 def warning_box(text):
     st.markdown(f'<div class="warning-box">{text}</div>', unsafe_allow_html=True)
 
+# Set TASKTAMER_DEBUG=1 to show the timing breakdown of the last request in the sidebar
+DEBUG_PANEL = os.environ.get("TASKTAMER_DEBUG", "0") == "1"
+
+@contextmanager
+def traced_request(name):
+    """Trace one user action and keep its timing breakdown for the debug panel."""
+    request_trace = None
+    try:
+        with metrics.trace(f"ui.{name}") as request_trace:
+            yield
+    finally:
+        if request_trace is not None:
+            st.session_state.last_trace = request_trace.to_dict()
+
+def run_job(name, **kwargs):
+    """Run a backend call through the worker pool; returns None (after warning) if the pool is busy."""
+    try:
+        with traced_request(name):
+            return jobs.run(name, **kwargs)
+    except jobs.QueueFull:
+        warning_box("🐙 Otto is busy with other requests right now. Please try again in a moment.")
+    except jobs.JobTimeout:
+        warning_box("🐙 This took Otto too long. Please try again with shorter content.")
+    return None
+
 def task_item(text, idx=None):
     prefix = f"{idx}. " if idx is not None else ""
     st.markdown(f'<div class="task-item">{prefix}{text}</div>', unsafe_allow_html=True)
@@ -347,53 +376,71 @@ def render_task_page():
             st.write("• 📣 Design a marketing campaign for a new product")
             st.write("• 🖥️ Plan a website redesign project")
         
-        submit_button = st.form_submit_button("Break Down Task")
+        col1, col2 = st.columns([1, 1])
+        with col1:
+            submit_button = st.form_submit_button("Break Down Task")
+        with col2:
+            # A repeated task is served from the memo; this asks for a new breakdown
+            regenerate_button = st.form_submit_button("🔄 Regenerate")
     
-    if submit_button:
+    if submit_button or regenerate_button:
         if not task_description:
             warning_box("Please enter a task description")
             return
             
-        with st.spinner("🐙 Otto is breaking down your task..."):
-            steps = break_down_task(task_description)
+        with traced_request("break_down_task"):
+            with st.spinner("🐙 Otto is breaking down your task..."):
+                if jobs.get_job_manager() is None:
+                    # Inline mode runs everything in this process anyway, so render steps
+                    # as the model writes them instead of after the whole breakdown
+                    step_stream = iter_break_down_task(task_description, refresh=regenerate_button)
+                else:
+                    # With a worker pool, GPT-2 stays out of the UI process; a pool job
+                    # returns its result once, so the steps arrive together
+                    steps = run_job("break_down_task", task_description=task_description, refresh=regenerate_button)
+                    if steps is None:
+                        return
+                    step_stream = iter(steps)
+                first_step = next(step_stream, None)
             
-        if steps:
-            section_header("Here's your task breakdown:")
+            steps = []
+            if first_step:
+                section_header("Here's your task breakdown:")
             
-            for i, step in enumerate(steps, 1):
-                
                 emoji_map = {
                     "define": "🎯", "create": "✨", "gather": "📚", "research": "🔍",
                     "identify": "👁️", "plan": "📋", "design": "🎨", "write": "✍️",
                     "organize": "🗂️", "review": "🔄", "test": "✅", "finalize": "🏁",
                     "track": "📊", "set": "⚙️", "list": "📝", "break": "🧩"
                 }
+            
+                for i, step in enumerate(itertools.chain([first_step], step_stream), 1):
+                    steps.append(step)
                 
-                
-                first_word = step.split()[0].lower()
-                emoji = emoji_map.get(first_word, "✨")
+                    first_word = step.split()[0].lower()
+                    emoji = emoji_map.get(first_word, "✨")
                 
                 
-                enhanced_step = f"{emoji} {step}"
-                task_item(enhanced_step, i)
+                    enhanced_step = f"{emoji} {step}"
+                    task_item(enhanced_step, i)
                 
-            success_box("🐙 Otto has broken down your task successfully! Remember to tackle one step at a time.")
+                success_box("🐙 Otto has broken down your task successfully! Remember to tackle one step at a time.")
                 
-            st.download_button(
-                label="📥 Download Task Breakdown",
-                data="\n".join([f"{i+1}. {step}" for i, step in enumerate(steps)]),
-                file_name="task_breakdown.txt",
-                mime="text/plain"
-            )
-        else:
-            warning_box("Could not generate steps. Please try rewording your task.")
+                st.download_button(
+                    label="📥 Download Task Breakdown",
+                    data="\n".join([f"{i+1}. {step}" for i, step in enumerate(steps)]),
+                    file_name="task_breakdown.txt",
+                    mime="text/plain"
+                )
+            else:
+                warning_box("Could not generate steps. Please try rewording your task.")
 
 def render_summary_page():
     main_header("📝 Content Summarizer")
     
     st.write("Otto will help you extract the key insights from any text - like an octopus finding pearls in the ocean!")
     
-    tab1, tab2 = st.tabs(["Text Input", "URL"])
+    tab1, tab2, tab3, tab4 = st.tabs(["Text Input", "URL", "File Upload", "Reading List"])
     
     with tab1:
         text_content = st.text_area(
@@ -408,8 +455,10 @@ def render_summary_page():
                 return
                 
             with st.spinner("Otto is analyzing your text with all eight tentacles..."):
-                summary = summarize_content(content=text_content)
+                summary = run_job("summarize_content", content=text_content)
                 
+            if summary is None:
+                return
             if summary:
                 section_header("Your Summary")
                 st.write(f"📝 {summary}")
@@ -441,8 +490,10 @@ def render_summary_page():
                 return
                 
             with st.spinner("Otto is swimming through the web to fetch and analyze content..."):
-                summary = summarize_content(url=url)
+                summary = run_job("summarize_content", url=url)
                 
+            if summary is None:
+                return
             if summary and not summary.startswith("Error"):
                 section_header("Your Summary")
                 st.write(f"🌐 {summary}")
@@ -457,6 +508,110 @@ def render_summary_page():
                 success_box("🐙 Web content summarized! Otto has extracted the key information from the depths of the internet!")
             else:
                 warning_box(f"Could not generate summary: {summary}")
+    
+    with tab3:
+        uploaded_file = st.file_uploader(
+            "Upload a text file:",
+            type=["txt", "md"],
+            help="Large files such as whole books are summarized in chunks"
+        )
+        
+        if st.button("🐙 Summarize File"):
+            if not uploaded_file:
+                warning_box("Please upload a file")
+                return
+                
+            with st.spinner("Otto is reading your file one tentacle-full at a time..."):
+                summary = summarize_upload(uploaded_file)
+            if summary is None:
+                return
+                
+            if summary and not summary.startswith("No content"):
+                section_header("Your Summary")
+                st.write(f"📄 {summary}")
+                
+                st.download_button(
+                    label="📥 Download Summary",
+                    data=summary,
+                    file_name="summary.txt",
+                    mime="text/plain"
+                )
+                
+                success_box("🐙 File summarized! Otto has distilled the whole thing down to the key points!")
+            else:
+                warning_box("Could not generate summary. Please try with a different file.")
+    
+    with tab4:
+        url_list = st.text_area(
+            "Enter one URL per line:",
+            height=200,
+            help="Otto fetches the pages in parallel and shows each summary as soon as it is ready"
+        )
+        
+        if st.button("🐙 Summarize Reading List"):
+            urls = [line.strip() for line in url_list.splitlines() if line.strip()]
+            if not urls:
+                warning_box("Please enter at least one URL")
+                return
+                
+            invalid_urls = [url for url in urls if not is_valid_url(url)]
+            if invalid_urls:
+                warning_box(f"These don't look like valid URLs: {', '.join(invalid_urls)}")
+                return
+                
+            section_header("Your Reading List Summaries")
+            progress = st.progress(0.0, text="Otto is stretching a tentacle towards every link...")
+            results = []
+            
+            unique_urls = list(dict.fromkeys(urls))
+            with traced_request("summarize_urls"):
+                for index, summary, error in jobs.run_each("summarize_content", [{"url": url} for url in unique_urls]):
+                    url = unique_urls[index]
+                    if error is not None:
+                        summary = f"Error summarizing {url}: {error}"
+                    results.append((url, summary))
+                    progress.progress(len(results) / len(unique_urls),
+                                      text=f"Summarized {len(results)} of {len(unique_urls)} pages")
+                    
+                    with st.expander(f"🌐 {url}", expanded=True):
+                        if summary.startswith("Error") or summary.startswith("No content"):
+                            warning_box(f"Could not generate summary: {summary}")
+                        else:
+                            st.write(summary)
+            
+            st.download_button(
+                label="📥 Download All Summaries",
+                data="\n\n".join(f"{url}\n{summary}" for url, summary in results),
+                file_name="reading_list_summaries.txt",
+                mime="text/plain"
+            )
+            
+            success_box("🐙 Reading list complete! Otto read everything at once - one of the perks of having eight arms!")
+
+# Seconds a whole uploaded file (e.g. a book) may take to summarize
+FILE_SUMMARY_TIMEOUT = 600.0
+
+def summarize_upload(uploaded_file):
+    """
+    Summarize an uploaded file through the worker pool. The upload is spooled to a
+    temporary file so workers read it from disk instead of receiving it pickled.
+    """
+    with tempfile.NamedTemporaryFile(suffix=".txt", delete=False) as spool:
+        for chunk in iter(lambda: uploaded_file.read(1024 * 1024), b""):
+            spool.write(chunk)
+    try:
+        return run_job("summarize_file", path=spool.name, timeout=FILE_SUMMARY_TIMEOUT)
+    finally:
+        os.unlink(spool.name)
+
+def quiz_buttons(prefix):
+    """Generate and Regenerate buttons; Generate reuses a memoized quiz for the same input, Regenerate builds a new one."""
+    col1, col2 = st.columns([1, 1])
+    with col1:
+        generate = st.button("🐙 Generate Quiz", key=f"{prefix}_quiz_btn")
+    with col2:
+        regenerate = st.button("🔄 Regenerate Quiz", key=f"{prefix}_quiz_regen_btn")
+    return generate, regenerate
 
 def render_quiz_page():
     main_header("🧠 Quiz Generator")
@@ -472,16 +627,19 @@ def render_quiz_page():
             help="Paste the text you want to create a quiz from"
         )
         
-        num_questions = st.slider("Number of questions", 1, 5, 3)
+        num_questions = st.slider("Number of questions", 1, MAX_QUIZ_QUESTIONS, 3)
         
-        if st.button("🐙 Generate Quiz", key="text_quiz_btn"):
+        generate, regenerate = quiz_buttons("text")
+        if generate or regenerate:
             if not text_content:
                 warning_box("Please enter some text to generate a quiz from")
                 return
                 
             with st.spinner("Otto is crafting questions with all eight brainy tentacles..."):
-                quiz = generate_quiz(content=text_content, num_questions=num_questions)
+                quiz = run_job("generate_quiz", content=text_content, num_questions=num_questions, refresh=regenerate)
                 
+            if quiz is None:
+                return
             display_quiz(quiz)
     
     with tab2:
@@ -490,9 +648,10 @@ def render_quiz_page():
             help="Works with most websites"
         )
         
-        num_questions = st.slider("Number of questions", 1, 5, 3, key="url_num_q")
+        num_questions = st.slider("Number of questions", 1, MAX_QUIZ_QUESTIONS, 3, key="url_num_q")
         
-        if st.button("🐙 Generate Quiz", key="url_quiz_btn"):
+        generate, regenerate = quiz_buttons("url")
+        if generate or regenerate:
             if not url:
                 warning_box("Please enter a URL")
                 return
@@ -502,8 +661,10 @@ def render_quiz_page():
                 return
                 
             with st.spinner("Otto is diving into the website to create quiz questions..."):
-                quiz = generate_quiz(url=url, num_questions=num_questions)
+                quiz = run_job("generate_quiz", url=url, num_questions=num_questions, refresh=regenerate)
                 
+            if quiz is None:
+                return
             display_quiz(quiz)
 
 def display_quiz(quiz_data):
@@ -623,8 +784,8 @@ def render_chat_page():
         # Add user message to chat history
         st.session_state.chat_history.append({"role": "user", "content": question})
         
-        # Get the answer
-        with st.spinner("Otto is thinking with all eight tentacles..."):
+        # Get the answer (a knowledge-base lookup, so it arrives in one piece)
+        with st.spinner("Otto is thinking with all eight tentacles..."), traced_request("ask_question"):
             answer = ask_question(question)
            
             if not answer.startswith("🐙"):
@@ -692,6 +853,24 @@ def render_chat_page():
     """)
 
 
+def render_debug_panel():
+    with st.sidebar.expander("🔧 Timing breakdown", expanded=True):
+        last_trace = st.session_state.get("last_trace")
+        if not last_trace:
+            st.caption("Run a feature to see where the time goes.")
+        else:
+            st.write(f"**{last_trace['name']}** took {last_trace['duration_ms']:.1f} ms")
+            st.table([
+                {
+                    "stage": "· " * span["depth"] + span["name"],
+                    "start ms": span["start_ms"],
+                    "ms": span.get("duration_ms"),
+                }
+                for span in last_trace["spans"]
+            ])
+        if st.checkbox("Show Prometheus metrics", key="debug_show_metrics"):
+            st.code(metrics.prometheus(), language="text")
+
 def initialize_session_state():
     if "navigation" not in st.session_state:
         st.session_state.navigation = "Home"
@@ -777,6 +956,10 @@ def main():
     else:
         # Fallback to home page
         render_home_page()
+    
+    # Rendered after the page so it shows the action that just ran
+    if DEBUG_PANEL:
+        render_debug_panel()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,7 @@
+"""Command-line entry point: python tasktamer.py {breakdown,summarize,quiz,ask} ..."""
+import sys
+
+from backend.cli import main
+
+if __name__ == "__main__":
+    sys.exit(main())
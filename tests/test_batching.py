@@ -0,0 +1,110 @@
+import pytest
+
+from backend.batching import BatchCoalescer
+
+
+def echo(prompts, **kwargs):
+    return [[{"generated_text": prompt.upper()}] for prompt in prompts]
+
+
+@pytest.fixture
+def make_batcher():
+    batchers = []
+
+    def make(generator, max_wait_ms=0, **options):
+        batcher = BatchCoalescer(lambda: generator, max_wait_ms=max_wait_ms, **options)
+        batchers.append(batcher)
+        return batcher
+
+    yield make
+    for batcher in batchers:
+        batcher.close()
+
+
+def test_results_come_back_in_prompt_order(make_batcher):
+    batcher = make_batcher(echo, max_wait_ms=50)
+    assert batcher.generate(["a", "b", "c"], timeout=5) == ["A", "B", "C"]
+    assert batcher.stats()["prompts"] == 3
+
+
+def test_generator_exception_reaches_every_caller(make_batcher):
+    def broken(prompts, **kwargs):
+        raise ValueError("model failed")
+
+    batcher = make_batcher(broken, max_wait_ms=50)
+    futures = [batcher.submit(prompt) for prompt in ("a", "b")]
+    for future in futures:
+        with pytest.raises(ValueError, match="model failed"):
+            future.result(timeout=5)
+
+
+def test_load_failure_reaches_caller():
+    def load():
+        raise OSError("no weights")
+
+    batcher = BatchCoalescer(load, max_wait_ms=0)
+    try:
+        with pytest.raises(OSError, match="no weights"):
+            batcher.generate(["a"], timeout=5)
+    finally:
+        batcher.close()
+
+
+def test_short_output_fails_the_batch_instead_of_hanging(make_batcher):
+    batcher = make_batcher(lambda prompts, **kwargs: echo(prompts[:-1]), max_wait_ms=50)
+    futures = [batcher.submit(prompt) for prompt in ("a", "b")]
+    for future in futures:
+        with pytest.raises(RuntimeError, match="1 outputs for 2 prompts"):
+            future.result(timeout=5)
+
+
+def test_malformed_output_does_not_stop_the_dispatcher(make_batcher):
+    outputs = iter([[{}], [[{"generated_text": "ok"}]]])
+    batcher = make_batcher(lambda prompts, **kwargs: next(outputs))
+    with pytest.raises(KeyError):
+        batcher.generate(["a"], timeout=5)
+    assert batcher.generate(["b"], timeout=5) == ["ok"]
+
+
+def test_groups_split_by_generation_parameters(make_batcher):
+    calls = []
+
+    def recording(prompts, **kwargs):
+        calls.append((list(prompts), kwargs["max_new_tokens"]))
+        return echo(prompts)
+
+    batcher = make_batcher(recording, max_wait_ms=50)
+    futures = [batcher.submit("a", max_new_tokens=8), batcher.submit("b", max_new_tokens=16),
+               batcher.submit("c", max_new_tokens=8)]
+    assert [future.result(timeout=5) for future in futures] == ["A", "B", "C"]
+    assert sorted(calls) == [(["a", "c"], 8), (["b"], 16)]
+
+
+class WordTokenizer:
+    def __call__(self, text, add_special_tokens=True):
+        return {"input_ids": text.split()}
+
+    def decode(self, ids):
+        return " " + " ".join(ids)
+
+
+def test_breakdown_prompts_share_one_group_and_keep_their_own_budgets(monkeypatch, make_batcher):
+    from backend import task_breakdown
+
+    calls = []
+
+    def recording(prompts, **kwargs):
+        calls.append((len(prompts), kwargs["max_new_tokens"]))
+        return [[{"generated_text": prompt + " w" * kwargs["max_new_tokens"]}] for prompt in prompts]
+
+    class FakePipeline:
+        tokenizer = WordTokenizer()
+
+    monkeypatch.setattr(task_breakdown, "get_pipeline", lambda task, model: FakePipeline)
+    monkeypatch.setattr(task_breakdown, "GENERATION_BATCHER", make_batcher(recording, max_wait_ms=50))
+    prompts = ["one", "one two three", "one two three four five six seven eight nine ten"]
+
+    outputs = task_breakdown._generate(prompts, max_length=20)
+    # Budgets of 19, 17 and 10 new tokens share max_new_tokens=24 in one pipeline call
+    assert calls == [(3, 24)]
+    assert [len(output.split()) for output in outputs] == [20, 20, 20]
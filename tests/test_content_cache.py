@@ -0,0 +1,22 @@
+from backend.content_cache import ContentCache, normalize_url
+
+
+def test_equivalent_urls_normalize_to_one_key():
+    assert normalize_url("HTTP://Example.com:80?utm_source=x&b=2&a=1#top") == "http://example.com/?a=1&b=2"
+    assert normalize_url("https://example.com:8443/page") == "https://example.com:8443/page"
+
+
+def test_malformed_port_falls_back_to_the_raw_url():
+    assert normalize_url(" http://x:99999/ ") == "http://x:99999/"
+    assert normalize_url("http://x:port/") == "http://x:port/"
+
+
+def test_entries_are_separate_per_extractor(tmp_path):
+    path = str(tmp_path / "content.sqlite3")
+    lxml_cache = ContentCache(path, extractor="lxml")
+    lxml_cache.put("http://example.com/a", "lxml text", {})
+    lxml_cache.put("http://x:99999/", "odd port", {})
+
+    assert lxml_cache.get("http://EXAMPLE.com/a?utm_medium=y").text == "lxml text"
+    assert lxml_cache.get("http://x:99999/").text == "odd port"
+    assert ContentCache(path, extractor="streaming").get("http://example.com/a") is None
@@ -0,0 +1,18 @@
+from backend import jobs
+
+
+def test_run_each_inline_yields_every_call_with_its_index(monkeypatch):
+    monkeypatch.setattr(jobs, "get_job_manager", lambda: None)
+
+    def fake_execute(name, args, kwargs):
+        if kwargs["value"] < 0:
+            raise ValueError("negative")
+        return kwargs["value"] * 2
+
+    monkeypatch.setattr(jobs, "_execute", fake_execute)
+    results = {index: (result, error) for index, result, error
+               in jobs.run_each("summarize_content", [{"value": 1}, {"value": -1}, {"value": 3}])}
+
+    assert results[0] == (2, None)
+    assert results[2] == (6, None)
+    assert results[1][0] is None and isinstance(results[1][1], ValueError)
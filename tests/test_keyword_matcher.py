@@ -0,0 +1,68 @@
+import random
+
+from backend.keyword_matcher import KeywordMatcher
+
+
+def naive_find(keywords, text):
+    text = text.lower()
+    return sorted((keyword, start + len(keyword) - 1)
+                  for keyword in set(keywords)
+                  for start in range(len(text)) if text.startswith(keyword, start))
+
+
+def test_failure_links_report_overlapping_and_suffix_keywords():
+    matcher = KeywordMatcher({"pronouns": ["he", "she", "his", "hers"]})
+    # "she" ends in "he", and "hers" is reached by failing over from "she" to "he"
+    assert matcher.find("ushers") == [("she", 3), ("he", 3), ("hers", 5)]
+
+
+def test_failure_link_to_a_shorter_prefix():
+    matcher = KeywordMatcher({"a": ["abcd", "bc", "bcx"]})
+    # After "abc" fails on "x" the automaton continues from "bc" and finds "bcx"
+    assert sorted(matcher.find("abcx")) == [("bc", 2), ("bcx", 3)]
+
+
+def test_find_matches_naive_substring_search():
+    rng = random.Random(7)
+    for _ in range(200):
+        keywords = ["".join(rng.choice("ab") for _ in range(rng.randint(1, 4))) for _ in range(rng.randint(1, 6))]
+        text = "".join(rng.choice("abAB") for _ in range(rng.randint(0, 30)))
+        matcher = KeywordMatcher({"only": keywords})
+        assert sorted(matcher.find(text)) == naive_find(keywords, text)
+
+
+def test_scores_are_weighted_and_count_each_keyword_once_by_default():
+    matcher = KeywordMatcher({"study": {"exam": 2.0, "read": 1.0}, "chores": ["clean", "read"]})
+    assert matcher.scores("Read, read and read for the exam") == {"study": 3.0, "chores": 1.0}
+    assert matcher.scores("read read", unique=False) == {"study": 2.0, "chores": 2.0}
+
+
+def test_best_breaks_ties_by_category_order():
+    matcher = KeywordMatcher({"writing": ["draft"], "research": ["draft"]})
+    assert matcher.best("draft the report") == "writing"
+    assert matcher.best("nothing relevant") is None
+
+
+def test_first_follows_category_order_not_score():
+    matcher = KeywordMatcher({"research": ["research", "paper"], "project": ["project", "manage"]})
+    assert matcher.first("manage the project paper") == "research"
+    assert matcher.best("manage the project paper") == "project"
+    assert matcher.first("nothing relevant") is None
+
+
+def test_template_routing_matches_the_original_elif_chain():
+    from backend.task_breakdown import TASK_TEMPLATES, TEMPLATE_KEYWORDS, _template_steps
+
+    def elif_chain(task):
+        task = task.lower()
+        for category, keywords in TEMPLATE_KEYWORDS.items():
+            if any(keyword in task for keyword in keywords):
+                return category
+        return "default"
+
+    tasks = ["Write a research paper on project management", "Manage the conference budget and finance report",
+             "Study slides for the presentation", "Plan a birthday event", "Write my essay", "Clean the garage"]
+    for task in tasks:
+        assert _template_steps(task) == TASK_TEMPLATES[elif_chain(task)]
+    # More project keywords than research ones, but research is listed first
+    assert _template_steps("Manage a project paper for the project") == TASK_TEMPLATES["research"]
@@ -0,0 +1,65 @@
+import pytest
+
+from backend.chat_assistant import FALLBACK_ANSWER, answer_question
+from backend.knowledge_base import FAQ_ENTRIES, KEYWORD_BOOST, KnowledgeBase
+
+ENTRIES = [
+    {"id": "garden", "keywords": ["garden", "water*"], "questions": "How do I water my garden?",
+     "answer": "Water the garden beds early in the morning."},
+    {"id": "kitchen", "keywords": ["cook", "use"], "questions": "How do I cook pasta?",
+     "answer": "Boil the pasta in salted water and use a timer."},
+    {"id": "exams", "keywords": ["multiple choice", "exam"], "questions": "How do I revise for exams?",
+     "answer": "Revise with practice papers and flash cards."},
+]
+
+
+@pytest.fixture
+def knowledge_base():
+    return KnowledgeBase(ENTRIES)
+
+
+def ids(results):
+    return [entry["id"] for entry, _ in results]
+
+
+def test_ranks_entries_by_bm25_score(knowledge_base):
+    results = knowledge_base.search("pasta timer")
+    assert ids(results) == ["kitchen"]
+    # "water" appears in two entries; the garden entry uses it more and is shorter
+    assert ids(knowledge_base.search("water"))[0] == "garden"
+    scores = [score for _, score in knowledge_base.search("garden water pasta")]
+    assert scores == sorted(scores, reverse=True)
+
+
+def test_keyword_boost_matches_whole_words_phrases_and_stems(knowledge_base):
+    # "watering" is not a BM25 term of any entry, so only the "water*" stem can match it
+    assert ids(knowledge_base.search("watering")) == ["garden"]
+    assert ids(knowledge_base.search("Multiple-choice!")) == ["exams"]
+    assert ids(knowledge_base.search("exams")) == ["exams"]
+    # Keywords inside other words do not count
+    assert knowledge_base.search("because of my homework") == []
+    assert knowledge_base.search("cooking") == []
+
+
+def test_keyword_boost_is_added_to_the_bm25_score(knowledge_base, monkeypatch):
+    from backend import knowledge_base as module
+
+    boosted = knowledge_base.search("use")[0]
+    monkeypatch.setattr(module, "KEYWORD_BOOST", 0.0)
+    plain = knowledge_base.search("use")[0]
+    assert boosted[0]["id"] == plain[0]["id"] == "kitchen"
+    assert boosted[1] == pytest.approx(plain[1] + KEYWORD_BOOST)
+
+
+def test_no_match_falls_back(knowledge_base):
+    assert knowledge_base.search("zebra quantum") == []
+    assert knowledge_base.answer("zebra quantum") == (None, 0.0)
+    assert answer_question("zebra quantum") == (FALLBACK_ANSWER, 0.0)
+
+
+def test_faq_routing():
+    knowledge_base = KnowledgeBase(FAQ_ENTRIES)
+    assert knowledge_base.answer("I keep procrastinating on my homework")[0]["id"] == "procrastination"
+    assert knowledge_base.answer("How do I summarize an article?")[0]["id"] == "summarization"
+    assert knowledge_base.answer("tips for staying focused")[0]["id"] == "focus_tips"
+    assert "how_to_use" not in ids(knowledge_base.search("because of my homework", limit=10))
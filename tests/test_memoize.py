@@ -0,0 +1,175 @@
+import pytest
+
+from backend import memoize as memo_module
+from backend.memoize import Memoizer, make_key, memoize
+
+
+@pytest.fixture(autouse=True)
+def fresh_memoizer(monkeypatch):
+    memoizer = Memoizer(disk=False)
+    monkeypatch.setattr(memo_module, "memoizer", memoizer)
+    return memoizer
+
+
+def counting(namespace, **options):
+    calls = []
+
+    @memoize(namespace, **options)
+    def func(value, scale=1):
+        calls.append(value)
+        return {"value": value * scale}
+    return func, calls
+
+
+def test_key_depends_on_version_and_normalized_arguments():
+    assert make_key("ns", "1", ("text",), {}) != make_key("ns", "2", ("text",), {})
+    assert make_key("ns", "1", ("text\r\n",), {}) == make_key("ns", "1", ("text",), {})
+    assert make_key("ns", "1", ("a",), {}) != make_key("other", "1", ("a",), {})
+
+
+def test_repeated_call_is_served_from_memory():
+    func, calls = counting("repeat")
+    assert func(2) == func(2) == {"value": 2}
+    assert calls == [2]
+
+
+def test_results_are_copies():
+    func, _ = counting("copies")
+    func(1)["value"] = 99
+    assert func(1) == {"value": 1}
+
+
+def test_version_change_recomputes():
+    version = {"current": "a"}
+    func, calls = counting("versioned", version=lambda: version["current"])
+    func(1)
+    version["current"] = "b"
+    func(1)
+    func(1)
+    assert calls == [1, 1]
+
+
+def test_result_is_stored_under_version_in_effect_after_the_call():
+    state = {"loaded": "requested"}
+
+    @memoize("late_version", version=lambda: state["loaded"])
+    def func(value):
+        # Simulates a model load falling back to another backend during the call
+        state["loaded"] = "fallback"
+        return value
+
+    func(1)
+    assert memo_module.memoizer.get("late_version", make_key("late_version", "fallback", (1,), {})) == 1
+    assert memo_module.memoizer.get("late_version", make_key("late_version", "requested", (1,), {})) is memo_module._MISSING
+
+
+def test_refresh_recomputes_and_replaces():
+    func, calls = counting("refresh")
+    func(3)
+    func(3, refresh=True)
+    func(3)
+    assert calls == [3, 3]
+
+
+def test_rejected_results_are_not_stored():
+    func, calls = counting("rejected", should_cache=lambda result: result["value"] > 0)
+    func(0)
+    func(0)
+    assert calls == [0, 0]
+
+
+def test_custom_key_function():
+    func, calls = counting("keyed", key=lambda value, scale=1: value % 10)
+    func(1)
+    func(11)
+    assert calls == [1]
+
+
+def test_invalidate_drops_results():
+    func, calls = counting("invalidated")
+    func(1)
+    memo_module.invalidate("invalidated")
+    func(1)
+    assert calls == [1, 1]
+
+
+def test_invalidating_one_namespace_keeps_the_others():
+    kept, kept_calls = counting("kept")
+    dropped, dropped_calls = counting("dropped")
+    kept(1)
+    dropped(1)
+    memo_module.invalidate("dropped")
+    kept(1)
+    dropped(1)
+    assert kept_calls == [1]
+    assert dropped_calls == [1, 1]
+
+
+def test_break_down_task_skips_template_fallback_and_invalidates_on_eviction(monkeypatch):
+    from backend import task_breakdown
+    from backend.model_registry import ModelRegistry
+
+    assert not task_breakdown._is_generated(list(task_breakdown.TASK_TEMPLATES["research"]))
+    assert task_breakdown._is_generated(["Outline the argument", "Draft it", "Edit it"])
+
+    invalidated = []
+    monkeypatch.setattr(task_breakdown, "invalidate", lambda namespace=None: invalidated.append(namespace))
+    registry = ModelRegistry()
+    monkeypatch.setattr(registry, "_load", lambda *args: (object(), "pytorch"))
+    registry.add_listener(task_breakdown._on_model_change)
+
+    registry.get(task_breakdown.GENERATION_TASK, task_breakdown.GENERATION_MODEL)
+    assert invalidated == []
+    assert registry.loaded_backend(task_breakdown.GENERATION_TASK, task_breakdown.GENERATION_MODEL) == "pytorch"
+    registry.evict()
+    assert invalidated == ["break_down_task"]
+    registry.get(task_breakdown.GENERATION_TASK, task_breakdown.GENERATION_MODEL)
+    assert invalidated == ["break_down_task", "break_down_task"]
+
+
+def test_lookup_and_store_share_the_wrapped_function_entries():
+    func, calls = counting("shared")
+    assert func.lookup(4) is None
+    func.store({"value": 40}, 4)
+    assert func.lookup(4) == {"value": 40}
+    assert func(4) == {"value": 40}
+    assert calls == []
+
+
+def test_streamed_breakdown_is_memoized_and_reused(monkeypatch):
+    from backend import task_breakdown
+
+    generations = []
+
+    def fake_stream(prompt, max_length):
+        generations.append(prompt)
+        yield from [" Outline the chapters", "\n2. Draft each chapter", "\n3. Edit the draft", "\n4. Publish it"]
+
+    monkeypatch.setattr(task_breakdown, "transformers_available", lambda: True)
+    monkeypatch.setattr(task_breakdown, "stream_generation", fake_stream)
+
+    first = list(task_breakdown.iter_break_down_task("write a book"))
+    assert first == ["Outline the chapters", "Draft each chapter", "Edit the draft", "Publish it"]
+    assert list(task_breakdown.iter_break_down_task("write a book")) == first
+    assert task_breakdown.break_down_task("write a book") == first
+    assert len(generations) == 1
+
+    list(task_breakdown.iter_break_down_task("write a book", refresh=True))
+    assert len(generations) == 2
+
+
+def test_disk_tier_deletes_stale_rows_and_prunes_to_its_size_limit(tmp_path, monkeypatch):
+    disk = memo_module._DiskTier(str(tmp_path / "memo.sqlite3"), max_entries=3, prune_every=1)
+
+    def rows():
+        return disk._connect().execute("SELECT key FROM memo ORDER BY key").fetchall()
+
+    disk.put("stale", "ns", 1, ttl=60)
+    monkeypatch.setattr(memo_module.time, "time", lambda: 10 ** 12)
+    assert disk.get("stale") is memo_module._MISSING
+    assert rows() == []
+
+    for index in range(5):
+        disk.put(f"k{index}", "ns", index, ttl=index + 1)
+    # The longest-lived entries are kept
+    assert rows() == [("k2",), ("k3",), ("k4",)]
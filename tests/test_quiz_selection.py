@@ -0,0 +1,117 @@
+import pytest
+
+from backend.document import Document
+from backend.quiz_selection import Blank, spread_blanks
+
+
+def blank(document, sentence, word, score):
+    words = document.words(sentence)
+    return Blank(sentence, words.index(word), word, "NOUN", score)
+
+
+def test_each_answer_and_sentence_text_is_used_once():
+    document = Document(
+        "Cells store energy in mitochondria today. "
+        "Plants store ENERGY in chloroplasts today. "
+        "Cells store energy in mitochondria today. "
+        "Roots absorb water from soil today."
+    )
+    blanks = [
+        blank(document, 0, "energy", 3.0),
+        blank(document, 1, "ENERGY", 3.0),
+        blank(document, 2, "mitochondria", 5.0),
+        blank(document, 3, "water", 1.0),
+    ]
+    chosen = list(spread_blanks(document, blanks, 10))
+
+    answers = [item.word.lower() for item in chosen]
+    texts = [document.sentence(item.sentence).strip() for item in chosen]
+    assert len(answers) == len(set(answers))
+    assert len(texts) == len(set(texts))
+    # Sentence 1's only answer and sentence 2's text were both used by sentence 0
+    assert [item.sentence for item in chosen] == [0, 3]
+
+
+def test_sentence_falls_back_to_its_next_blank_when_its_best_answer_is_taken():
+    document = Document(
+        "Photosynthesis converts light into sugar daily. "
+        "Leaves capture light using chlorophyll pigments daily."
+    )
+    blanks = [
+        blank(document, 0, "light", 4.0),
+        blank(document, 1, "light", 3.0),
+        blank(document, 1, "chlorophyll", 2.0),
+    ]
+    chosen = list(spread_blanks(document, blanks, 2))
+    assert [(item.sentence, item.word) for item in chosen] == [(0, "light"), (1, "chlorophyll")]
+
+
+def test_one_question_per_section_before_any_section_gets_a_second():
+    sentences = [f"Topic{index} sentence mentions keyword{index} and more words here." for index in range(20)]
+    document = Document(" ".join(sentences))
+    # The first half of the document scores far higher than the second
+    blanks = [blank(document, index, f"keyword{index}", 100.0 - index if index < 10 else 1.0) for index in range(20)]
+
+    chosen = list(spread_blanks(document, blanks, 4))
+    assert len(chosen) == 4
+    assert sorted(item.sentence * 4 // len(document) for item in chosen) == [0, 1, 2, 3]
+
+
+@pytest.mark.parametrize("count", [0, -1])
+def test_non_positive_count_yields_nothing(count):
+    document = Document("Cells store energy in mitochondria today.")
+    assert list(spread_blanks(document, [blank(document, 0, "energy", 1.0)], count)) == []
+
+
+def test_generate_quiz_has_no_duplicates_and_keeps_reading_order(monkeypatch):
+    pytest.importorskip("sklearn")
+    from backend import memoize as memo_module
+    from backend.memoize import Memoizer
+    from backend.question_generation import generate_quiz
+
+    monkeypatch.setattr(memo_module, "memoizer", Memoizer(disk=False))
+    topics = ["glucose", "nitrogen", "membrane", "enzyme", "protein", "ribosome", "nucleus", "vacuole"]
+    text = " ".join(f"The {topic} matters because every {topic} supports the {other} inside living cells."
+                    for topic in topics for other in topics if other != topic)
+
+    quiz = generate_quiz(content=text, num_questions=20)
+    assert quiz
+    answers = [question["answer"].lower() for question in quiz]
+    texts = [question["question"] for question in quiz]
+    assert len(answers) == len(set(answers))
+    assert len(texts) == len(set(texts))
+
+    sentences = [question["question"].replace("Fill in the blank: ", "").replace("_____", question["answer"])
+                 for question in quiz]
+    positions = [text.index(sentence) for sentence in sentences]
+    assert positions == sorted(positions)
+
+
+def test_iter_quiz_is_lazy_and_matches_generate_quiz(monkeypatch):
+    pytest.importorskip("sklearn")
+    from backend import memoize as memo_module
+    from backend import question_generation
+    from backend.memoize import Memoizer
+
+    monkeypatch.setattr(memo_module, "memoizer", Memoizer(disk=False))
+    lookups = []
+    real_batch = question_generation.generate_incorrect_options_batch
+
+    def counting_batch(words, pos=None):
+        lookups.append(len(words))
+        return real_batch(words, pos)
+
+    monkeypatch.setattr(question_generation, "generate_incorrect_options_batch", counting_batch)
+    topics = ["glucose", "nitrogen", "membrane", "enzyme", "protein", "ribosome", "nucleus", "vacuole"]
+    text = " ".join(f"The {topic} matters because every {topic} supports the {other} inside living cells."
+                    for topic in topics for other in topics if other != topic)
+
+    quiz = question_generation.iter_quiz(content=text, num_questions=8, batch_size=3)
+    first = next(quiz)
+    # Only the first batch has been built so far
+    assert lookups == [3]
+    streamed = [first] + list(quiz)
+    assert lookups == [3, 3, 2]
+
+    built = question_generation.generate_quiz(content=text, num_questions=8)
+    assert sorted(question["answer"] for question in streamed) == sorted(question["answer"] for question in built)
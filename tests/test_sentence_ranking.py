@@ -0,0 +1,12 @@
+from backend.sentence_ranking import top_sentences
+
+
+def test_top_sentences_keeps_document_order_and_skips_duplicates():
+    sentences = ["First point.", "Key idea.", "Key idea.", "Minor aside.", "Closing claim."]
+    scores = [0.5, 0.9, 0.9, 0.1, 0.7]
+    assert top_sentences(sentences, scores, 3) == ["First point.", "Key idea.", "Closing claim."]
+
+
+def test_top_sentences_with_no_sentences_requested():
+    assert top_sentences(["Only one."], [1.0], 0) == []
+    assert top_sentences(["Only one."], [1.0], -2) == []
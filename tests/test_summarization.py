@@ -0,0 +1,34 @@
+import pytest
+
+from backend import summarization
+
+
+@pytest.fixture(autouse=True)
+def isolated_memo(monkeypatch):
+    from backend import memoize as memo_module
+    from backend.memoize import Memoizer
+
+    monkeypatch.setattr(memo_module, "memoizer", Memoizer(disk=False))
+
+
+@pytest.mark.parametrize("options", [{"num_sentences": 0}, {"num_sentences": -3}, {"method": "lsa"}])
+def test_invalid_options_are_rejected_before_anything_is_memoized(options):
+    with pytest.raises(ValueError):
+        summarization.summarize_content(content="One short sentence.", **options)
+    with pytest.raises(ValueError):
+        summarization.summarize_stream(iter(["One short sentence."]), **options)
+    assert summarization._summarize_text.lookup("One short sentence.", options.get("num_sentences", 5),
+                                                 options.get("method", "textrank")) is None
+
+
+@pytest.mark.parametrize("num_sentences", [1, 2, 3, 7])
+def test_positional_fallback_returns_the_requested_number_of_sentences(monkeypatch, num_sentences):
+    monkeypatch.setattr(summarization, "rank_sentences", lambda sentences, method: None)
+    sentences = [f"Sentence number {index} talks about topic {index}." for index in range(20)]
+
+    summary = summarization._select_sentences(sentences, num_sentences, "textrank")
+    assert len(summary) == num_sentences
+    assert summary[0] == sentences[0]
+    assert summary == sorted(summary, key=sentences.index)
+    if num_sentences > 1:
+        assert summary[-1] == sentences[-1]